@@ -1,22 +1,25 @@
 # ===== ARCHUB - არქიტექტურული პორტფოლიო ვებ-აპლიკაცია =====
 # ეს არის მთავარი Flask აპლიკაციის ფაილი
 # შეიცავს: API endpoints, routes, file upload ფუნქციები, authentication
-from sqlalchemy import func
+from sqlalchemy import and_, func, insert, or_, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
 
-from flask import Flask, render_template, jsonify, request, redirect, url_for
+from flask import Flask, render_template, jsonify, request, redirect, url_for, session
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
 from flask_cors import CORS
-from flask_wtf.csrf import CSRFProtect
+from flask_wtf.csrf import CSRFProtect, generate_csrf
+from werkzeug.middleware.proxy_fix import ProxyFix
 from werkzeug.utils import secure_filename
+from markupsafe import Markup
 import os
-import uuid
+import zlib
+from bisect import bisect_right
 from datetime import datetime
 from email_validator import validate_email, EmailNotValidError
 from config import config
-from PIL import Image
 import bleach
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
@@ -25,6 +28,10 @@ from flask_limiter.util import get_remote_address
 # Flask აპლიკაციის შექმნა
 app = Flask(__name__)
 
+# JSON პასუხები სწრაფი სერიალიზატორით (orjson, თუ დაყენებულია)
+from serializers import FastJSONProvider, dumps_bytes
+app.json = FastJSONProvider(app)
+
 # CORS-ის ინიციალიზაცია (Cross-Origin Resource Sharing)
 # CORS ინიციალიზდება კონფიგურაციის ჩატვირთვის შემდეგ; აქ ვრთავთ მხოლოდ CSRF-ს
 csrf = CSRFProtect(app)
@@ -39,7 +46,12 @@ if config_name == 'production':
 else:
     CORS(app, supports_credentials=True)
 
-# Rate limiting
+# nginx-ის უკან: კლიენტის IP და სქემა X-Forwarded-For/-Proto ჰედერებიდან (TRUSTED_PROXIES)
+if app.config['TRUSTED_PROXIES']:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['TRUSTED_PROXIES'], x_proto=app.config['TRUSTED_PROXIES'])
+
+# Rate limiting - მრიცხველები საერთოა ყველა worker-ისთვის (RATELIMIT_STORAGE_URI)
+import ratelimit  # sqlite:// საცავის რეგისტრაცია limits-ში
 limiter = Limiter(key_func=get_remote_address, app=app)
 
 # ატვირთული ფაილების საქაღალდის შექმნა (თუ არ არსებობს)
@@ -60,6 +72,9 @@ def favicon():
 # SQLAlchemy ბაზის ინიციალიზაცია
 from extensions import db
 db.init_app(app)
+# SQLite ბაზაზე: WAL და სხვა PRAGMA-ები ყოველ კავშირზე (SQLITE_HIGH_CONCURRENCY)
+from sqlitemode import sqlite_mode
+sqlite_mode.init_app(app)
 migrate = Migrate(app, db)
 
 # LoginManager-ის ინიციალიზაცია (მომხმარებლის ავტორიზაციისთვის)
@@ -77,13 +92,49 @@ def unauthorized():
         return jsonify({'success': False, 'error': 'Unauthorized'}), 401
 
 # მოდელების იმპორტი models.py ფაილიდან
-from models import Project, Photo, User, CarouselImage, project_likes, ContactSubmission
+from models import Project, Photo, User, CarouselImage, ImageJob, project_likes, ContactSubmission
+
+# კატალოგისა და კარუსელის snapshot ქეში (GET /api/projects, GET /api/carousel)
+from catalog import catalog_cache, carousel_cache, serialize_projects
+catalog_cache.init_app(app)
+carousel_cache.init_app(app)
+
+# დარენდერებული გვერდების ქეში და Jinja bytecode ქეში
+from pagecache import fragment_cache, init_bytecode_cache, users_version
+users_version.init_app(app)
+fragment_cache.init_app(app)
+init_bytecode_cache(app)
+
+# მოწონებების ჩაწერა (და არჩევითი write-behind ბუფერი)
+from images import delete_variants, image_srcset
+from jobs import image_jobs, job_to_dict
+from storage import content_lock, is_content_url, reference_count
+from assets import HASHED_ASSET_PATTERN, AssetManifest
+asset_manifest = AssetManifest(app)
+image_jobs.init_app(app)
+from uploads import UploadError, chunked_uploads
+chunked_uploads.init_app(app)
+from likes import apply_project_like, like_buffer, liked_ids_cache, liked_ids_version, user_liked_ids
+like_buffer.init_app(app)
+liked_ids_cache.init_app(app)
+liked_ids_version.init_app(app)
 
 # ===== FLASK-LOGIN კონფიგურაცია =====
-# მომხმარებლის ჩატვირთვის ფუნქცია Flask-Login-ისთვის
+# მომხმარებლის ჩატვირთვის ფუნქცია Flask-Login-ისთვის (worker-ის ქეშით - identity.py)
+from identity import identity_cache
+identity_cache.init_app(app)
+
+# read-only endpoint-ები replica-დან (REPLICA_DATABASE_URL), ჩაწერა - მთავარ ბაზაში
+from replicas import REPLICA_BIND, replica_router
+replica_router.init_app(app)
+
+# პაროლების ჰეშირება ცალკე პროცესებში (register/login)
+from passwords import PasswordHasherBusy, password_hasher
+password_hasher.init_app(app)
+
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    return identity_cache.get(int(user_id))
 
 # ===== ფაილის ატვირთვის დამხმარე ფუნქციები =====
 def allowed_file(filename):
@@ -91,52 +142,51 @@ def allowed_file(filename):
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in app.config['ALLOWED_EXTENSIONS']
 
-def generate_unique_filename(original_filename):
-    """უნიკალური ფაილის სახელის გენერაცია კონფლიქტების თავიდან ასაცილებლად"""
-    # ფაილის გაფართოების მიღება
-    file_extension = original_filename.rsplit('.', 1)[1].lower() if '.' in original_filename else ''
-    
-    # უნიკალური ფაილის სახელის გენერაცია დროის ნიშნით და UUID-ით
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    unique_id = str(uuid.uuid4())[:8]
-    
-    if file_extension:
-        return f"{timestamp}_{unique_id}.{file_extension}"
-    else:
-        return f"{timestamp}_{unique_id}"
-
-def save_uploaded_file(file, folder=''):
-    """Save uploaded file and return the URL path (with image verification)"""
-    if file and allowed_file(file.filename):
-        unique_filename = generate_unique_filename(file.filename)
-
-        # Ensure folder exists
-        folder_path = os.path.join(app.config['UPLOAD_FOLDER'], folder)
-        os.makedirs(folder_path, exist_ok=True)
-
-        # Verify image content using Pillow
-        try:
-            file.stream.seek(0)
-            with Image.open(file.stream) as img:
-                img.verify()
-        except Exception:
-            return None
-        finally:
-            try:
-                file.stream.seek(0)
-            except Exception:
-                pass
+def stage_uploaded_file(file):
+    """ატვირთული ფაილის დროებით შენახვა ფონური დამუშავებისთვის
 
-        # Save file
-        file_path = os.path.join(folder_path, unique_filename)
-        file.save(file_path)
-
-        # Return URL path (relative to static folder)
-        return f"static/uploads/{folder}/{unique_filename}"
+    request-ში მოწმდება მხოლოდ გაფართოება და ითვლება SHA-256 (ფაილის სახელი
+    საცავში, storage.py); Pillow-ით შემოწმება და ვარიანტები კეთდება ImageJob-ში
+    (jobs.py). აბრუნებს payload-ის ჩანაწერს ან None-ს.
+    """
+    if file and file.filename and allowed_file(file.filename):
+        return image_jobs.stage(file)
     return None
 
+def stage_uploaded_files(files):
+    """რამდენიმე ფაილის დროებით შენახვა - უარყოფილი ფაილებიც რჩება სიაში შეცდომით"""
+    entries = []
+    for file in files:
+        if file and file.filename != '':
+            entry = stage_uploaded_file(file)
+            entries.append(entry or image_jobs.reject(file, 'File type not allowed'))
+    return entries
+
+def job_accepted(job, message, **extra):
+    """202 პასუხი დავალების მონაცემებით - სტატუსი მოწმდება /api/jobs/<id>-ზე"""
+    response = jsonify({
+        'success': True,
+        'message': message,
+        'job': job_to_dict(job),
+        **extra
+    })
+    response.status_code = 202
+    response.headers['Location'] = url_for('get_image_job', job_id=job.id)
+    return response
+
+def discard_processed_files(files):
+    """დამუშავებული, მაგრამ გამოუყენებელი ფაილების წაშლა (დავალების შეცდომისას)"""
+    for entry in files:
+        if entry['url']:
+            delete_uploaded_file(entry['url'])
+
 def delete_uploaded_file(file_url):
-    """Delete uploaded file from filesystem safely, preserving subfolders"""
+    """Delete uploaded file from filesystem safely, preserving subfolders
+
+    ერთ ფაილს შეიძლება რამდენიმე ჩანაწერი მიმართავდეს (იგივე შიგთავსი) - ფაილი
+    იშლება მხოლოდ ბოლო მიმართვის წაშლის შემდეგ, ამიტომ ეს ფუნქცია commit-ის
+    შემდეგ უნდა გამოიძახოს.
+    """
     try:
         if not file_url:
             return False
@@ -159,18 +209,179 @@ def delete_uploaded_file(file_url):
             print(f"SECURITY WARNING: Attempted to delete file outside of upload folder: {file_url}")
             return False
 
-        if os.path.exists(file_path_abs):
-            os.remove(file_path_abs)
-            return True
+        with content_lock():
+            if reference_count(normalized):
+                return False
+
+            # შემცირებული ასლებიც იშლება (<folder>/<width>/)
+            delete_variants(normalized)
+
+            if os.path.exists(file_path_abs):
+                os.remove(file_path_abs)
+                return True
     except Exception as e:
         print(f"Error deleting file {file_url}: {e}")
     return False
 
+# ===== HTTP ქეშირების დამხმარე ფუნქციები =====
+def session_user_id():
+    """მიმდინარე მომხმარებლის ID სესიიდან - ბაზის მოთხოვნის გარეშე"""
+    user_id = session.get('_user_id')
+    if user_id is None and app.config.get('REMEMBER_COOKIE_NAME', 'remember_token') in request.cookies:
+        # remember cookie-ით შესვლა: მომხმარებელი ჯერ უნდა ჩაიტვირთოს
+        user_id = current_user.get_id() if current_user.is_authenticated else None
+    return user_id
+
+def set_cache_headers(response, etag, private=False):
+    """ETag და Cache-Control ჰედერების დაყენება - კლიენტი ყოველთვის ამოწმებს (no-cache)"""
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache' if private else 'no-cache'
+    return response
+
+def not_modified(etag, private=False):
+    """304 პასუხი ტანის გარეშე, როცა If-None-Match ემთხვევა ETag-ს"""
+    if not request.if_none_match.contains_weak(etag):
+        return None
+    response = app.response_class(status=304)
+    return set_cache_headers(response, etag, private)
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+@app.after_request
+def cache_immutable_files(response):
+    """საცავის ფაილები და აგებული asset-ები (static/dist) შიგთავსის ჰეშით არის დასახელებული
+    და არასდროს იცვლება - ბრაუზერი მათ წელიწადით ინახავს"""
+    if response.status_code in (200, 304) and (
+            is_content_url(request.path) or HASHED_ASSET_PATTERN.match(request.path)):
+        response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    return response
+
+def projects_etag(version, user_id, page_key=''):
+    """კატალოგის ETag - is_liked ველები მომხმარებელზეა დამოკიდებული"""
+    # ყოველი მოწონება ზრდის კატალოგის ვერსიას, ამიტომ (ვერსია, მომხმარებელი) საკმარისია
+    etag = f'p{version}-u{user_id}' if user_id else f'p{version}'
+    if like_buffer.enabled:
+        # write-behind რეჟიმში მოწონებები ჯერ ჟურნალში იცვლება
+        etag += f'-j{like_buffer.revision()}'
+    if page_key:
+        etag += f'-q{zlib.crc32(page_key.encode()):08x}'
+    return etag
+
+# ===== პროექტების პაგინაცია =====
+PROJECT_FIELDS = ('id', 'area', 'main_image_url', 'main_image_srcset', 'photos', 'photos_srcset', 'is_liked', 'likes_count')
+
+def parse_projects_page_args():
+    """?limit=&after_id=&fields= პარამეტრების წაკითხვა; არასწორ მნიშვნელობაზე ValueError"""
+    limit = request.args.get('limit')
+    if limit is not None:
+        if not limit.isdigit() or int(limit) < 1:
+            raise ValueError('limit must be a positive integer')
+        limit = min(int(limit), app.config['PROJECTS_MAX_PAGE_SIZE'])
+
+    after_id = request.args.get('after_id')
+    if after_id is not None:
+        if not after_id.isdigit():
+            raise ValueError('after_id must be a non-negative integer')
+        after_id = int(after_id)
+
+    fields = None
+    if request.args.get('fields'):
+        fields = [name.strip() for name in request.args['fields'].split(',') if name.strip()]
+        unknown = [name for name in fields if name not in PROJECT_FIELDS]
+        if unknown:
+            raise ValueError(f'Unknown fields: {", ".join(unknown)}')
+        # id ყოველთვის საჭიროა კურსორისთვის
+        fields = ['id'] + [name for name in PROJECT_FIELDS if name in fields and name != 'id']
+
+    page_key = f'{limit}:{after_id}:{",".join(fields or ())}' if (limit or after_id is not None or fields) else ''
+    return limit, after_id, fields, page_key
+
+def projects_page_json(snapshot, start, end, fields=None):
+    """პროექტების გვერდის JSON ბაიტები ({success, projects, count, next_cursor}) - /api/projects და home()"""
+    next_cursor = snapshot.ids[end - 1] if end < len(snapshot.ids) else None
+
+    # ანონიმური მოთხოვნა: პასუხი იწყობა snapshot-ის მზა JSON ბაიტებიდან
+    if not current_user.is_authenticated and not fields and not like_buffer.enabled:
+        return b'{"success":true,"projects":%s,"count":%d,"next_cursor":%s}' % (
+            snapshot.raw_items(start, end),
+            end - start,
+            b'null' if next_cursor is None else str(next_cursor).encode()
+        )
+
+    projects_data = snapshot.data[start:end]
+
+    # მომხმარებლის მოწონებები snapshot-ის თავზე ემატება
+    if current_user.is_authenticated:
+        liked_ids = liked_ids_cache.get(current_user.id)
+        projects_data = [
+            dict(project, is_liked=True) if project['id'] in liked_ids else project
+            for project in projects_data
+        ]
+
+    # write-behind: ჯერ არ გადატანილი მოწონებები (გაერთიანებული ხედი)
+    if like_buffer.enabled:
+        projects_data = like_buffer.overlay(projects_data, current_user.id if current_user.is_authenticated else None)
+
+    # ველების პროექცია (?fields=id,main_image_url)
+    if fields:
+        projects_data = [{name: project[name] for name in fields} for project in projects_data]
+
+    return dumps_bytes({
+        'success': True,
+        'projects': projects_data,
+        'count': len(projects_data),
+        'next_cursor': next_cursor
+    }, default=app.json.default)
+
+def carousel_json(snapshot):
+    """აქტიური კარუსელის JSON ბაიტები snapshot-იდან ({success, images, count})"""
+    count = len(snapshot.items)
+    return b'{"success":true,"images":%s,"count":%d}' % (snapshot.raw_items(0, count), count)
+
+def auth_status():
+    """ავტორიზაციის სტატუსი - /api/status და home()"""
+    if current_user.is_authenticated:
+        return {
+            'logged_in': True,
+            'user': {
+                'username': current_user.username,
+                'is_admin': current_user.is_admin
+            }
+        }
+    return {'logged_in': False}
+
+def inline_json(data):
+    """JSON ბაიტები <script type="application/json">-ში ჩასასმელად - '</script>' ბლოკს ვერ დახურავს"""
+    escaped = data.replace(b'<', b'\\u003c').replace(b'>', b'\\u003e').replace(b'&', b'\\u0026')
+    return Markup(escaped.decode('utf-8'))
+
+# ანონიმური მთავარი გვერდი ქეშიდან: CSRF ტოკენის ადგილას ეს სტრიქონი ინახება
+CSRF_TOKEN_PLACEHOLDER = '__csrf_token_placeholder__'
+
 # ===== მთავარი ROUTES (გვერდები) =====
 # მთავარი გვერდი - პორტფოლიო
 @app.route('/')
 def home():
-    return render_template('index.html')
+    if session_user_id() is None:
+        # ანონიმური გვერდი ყველასთვის ერთნაირია - მხოლოდ CSRF ტოკენი ჩაისმება თითო მოთხოვნაზე
+        versions = {'catalog': catalog_cache.current_version(), 'carousel': carousel_cache.current_version()}
+        if like_buffer.enabled:
+            versions['likes'] = like_buffer.revision()
+        key = fragment_cache.key('index.html', versions, 'anonymous', vary=(request.host_url,))
+        page = fragment_cache.get_or_render(key, lambda: render_home(csrf_token=lambda: CSRF_TOKEN_PLACEHOLDER))
+        return page.replace(CSRF_TOKEN_PLACEHOLDER, generate_csrf())
+    return render_home()
+
+def render_home(**context):
+    # პირველი ეკრანის მონაცემები გვერდშივე (inline JSON) - script.js მათ API-დან აღარ ითხოვს
+    catalog = catalog_cache.get()
+    end = min(app.config['PROJECTS_BOOTSTRAP_SIZE'], len(catalog.ids))
+    bootstrap = b'{"auth":%s,"carousel":%s,"projects":%s}' % (
+        dumps_bytes(auth_status()),
+        carousel_json(carousel_cache.get()),
+        projects_page_json(catalog, 0, end)
+    )
+    return render_template('index.html', bootstrap_json=inline_json(bootstrap), **context)
 
 # მომხმარებლის პროფილის გვერდი (ავტორიზაცია საჭირო)
 @app.route('/my-page')
@@ -192,8 +403,8 @@ def admin():
 def admin_users():
     if not current_user.is_admin:
         return "Forbidden", 403
-    all_users = User.query.all()
-    return render_template('admin_users.html', users=all_users)
+    # მომხმარებლები გვერდებად იტვირთება /api/admin/users-დან
+    return render_template('admin_users.html')
 
 # კონკრეტული მომხმარებლის ნახვა ადმინ პანელში
 @app.route('/admin/user/<int:user_id>')
@@ -201,8 +412,10 @@ def admin_users():
 def admin_view_user(user_id):
     if not current_user.is_admin:
         return "Forbidden", 403
-    target_user = User.query.get_or_404(user_id)
-    return render_template('admin_user_view.html', user=target_user)
+    return fragment_cache.get_or_render(
+        fragment_cache.key('admin_user_view.html', {'users': users_version.current_version()}, vary=(user_id,)),
+        lambda: render_template('admin_user_view.html', user=User.query.get_or_404(user_id))
+    )
 
 
 # ===== API ROUTES (API endpoints) =====
@@ -210,52 +423,34 @@ def admin_view_user(user_id):
 @app.route('/api/projects')
 def get_projects():
     try:
-        # N+1 პრობლემის გადაჭრა: Subquery მოწონებების დასათვლელად
-        likes_count_subquery = db.session.query(
-            project_likes.c.project_id,
-            func.count(project_likes.c.user_id).label('likes_count')
-        ).group_by(project_likes.c.project_id).subquery()
-
-        # მთავარი მოთხოვნა პროექტების და მოწონებების რაოდენობის მისაღებად
-        query = db.session.query(
-            Project,
-            likes_count_subquery.c.likes_count
-        ).outerjoin(
-            likes_count_subquery, Project.id == likes_count_subquery.c.project_id
-        ).options(selectinload(Project.photos))
-
-        projects_with_counts = query.all()
-
-        # Preload liked project ids for current user to avoid per-row membership checks
-        liked_ids = set()
-        if current_user.is_authenticated:
-            rows = db.session.query(project_likes.c.project_id).filter(project_likes.c.user_id == current_user.id).all()
-            liked_ids = {pid for (pid,) in rows}
-        
-        # Create JSON response
-        projects_data = []
-        for project, likes_count in projects_with_counts:
-            # Get all photo URLs for this project
-            photo_urls = [photo.url for photo in project.photos]
-
-            # Check if current user has liked this project
-            is_liked = project.id in liked_ids if current_user.is_authenticated else False
-
-            project_data = {
-                'id': project.id,
-                'area': project.area,
-                'main_image_url': project.main_image_url,
-                'photos': photo_urls,
-                'is_liked': is_liked,
-                'likes_count': likes_count or 0
-            }
-            projects_data.append(project_data)
-        
-        return jsonify({
-            'success': True,
-            'projects': projects_data,
-            'count': len(projects_data)
-        })
+        try:
+            limit, after_id, fields, page_key = parse_projects_page_args()
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+
+        # If-None-Match: ვერსია ფაილიდან იკითხება, ბაზა არ გამოიყენება
+        user_id = session_user_id()
+        response = not_modified(projects_etag(catalog_cache.current_version(), user_id, page_key), private=bool(user_id))
+        if response is not None:
+            response.vary.add('Cookie')
+            return response
+
+        # კატალოგი მეხსიერებიდან (გაზიარებული mmap ფაილი) - ბაზას ვეკითხებით მხოლოდ ვერსიის შეცვლისას
+        snapshot = catalog_cache.get()
+
+        # Keyset პაგინაცია: snapshot დალაგებულია id-ით, ამიტომ after_id-ს ბინარული ძებნით ვპოულობთ
+        total = len(snapshot.ids)
+        start = bisect_right(snapshot.ids, after_id) if after_id is not None else 0
+        end = min(start + limit, total) if limit else total
+
+        body = projects_page_json(snapshot, start, end, fields)
+        response = app.response_class(body, mimetype='application/json')
+        # პასუხი განსხვავდება მომხმარებლის მიხედვით (is_liked) - Vary: Cookie
+        response.vary.add('Cookie')
+        return set_cache_headers(response, projects_etag(snapshot.version, user_id, page_key), private=bool(user_id))
     
     except Exception as e:
         return jsonify({
@@ -300,55 +495,20 @@ def create_project():
                 'error': 'Main image file is required'
             }), 400
         
-        # Save main image
-        main_image_url = save_uploaded_file(main_image, 'main')
-        if not main_image_url:
+        # Stage main image (verified in the background job)
+        main_entry = stage_uploaded_file(main_image)
+        if not main_entry:
             return jsonify({
                 'success': False,
                 'error': 'Invalid main image file format'
             }), 400
         
-        # Create new project
-        project = Project(
-            area=area,
-            main_image_url=main_image_url
-        )
-        
-        db.session.add(project)
-        db.session.flush()  # Get the project ID
-        
-        # Handle gallery photos
-        gallery_photos = request.files.getlist('gallery_photos')
-        saved_photos = []
-        
-        for photo_file in gallery_photos:
-            if photo_file and photo_file.filename != '':
-                photo_url = save_uploaded_file(photo_file, 'gallery')
-                if photo_url:
-                    photo = Photo(
-                        url=photo_url,
-                        project_id=project.id
-                    )
-                    db.session.add(photo)
-                    saved_photos.append(photo_url)
-        
-        # Commit all changes
-        db.session.commit()
+        # Stage gallery photos (rejected files are reported per file in the job result)
+        gallery_entries = stage_uploaded_files(request.files.getlist('gallery_photos'))
         
-        # Get all photos for this project (including main image)
-        all_photos = [main_image_url] + saved_photos
-        
-        # Return created project data
-        return jsonify({
-            'success': True,
-            'project': {
-                'id': project.id,
-                'area': project.area,
-                'main_image_url': project.main_image_url,
-                'photos': all_photos
-            },
-            'message': 'Project created successfully'
-        }), 201
+        # პროექტი შეიქმნება დავალების დასრულებისას (finish_project_upload)
+        job = image_jobs.submit('project', [main_entry] + gallery_entries, area=area)
+        return job_accepted(job, 'Project upload accepted')
         
     except Exception as e:
         db.session.rollback()
@@ -357,6 +517,45 @@ def create_project():
             'error': str(e)
         }), 500
 
+@image_jobs.handler('project')
+def finish_project_upload(payload, files):
+    """ახალი პროექტის შექმნა დამუშავებული ფოტოებით - მთავარი ფოტო სავალდებულოა"""
+    main_file, gallery_files = files[0], files[1:]
+    if not main_file['url']:
+        discard_processed_files(gallery_files)
+        raise ValueError('Invalid main image file format')
+    
+    try:
+        project = Project(
+            area=payload['area'],
+            main_image_url=main_file['url']
+        )
+        db.session.add(project)
+        db.session.flush()  # Get the project ID
+        
+        # ყველა ფოტო ერთი INSERT-ით
+        saved_photos = [entry['url'] for entry in gallery_files if entry['url']]
+        if saved_photos:
+            db.session.execute(insert(Photo), [{'url': url, 'project_id': project.id} for url in saved_photos])
+        
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        discard_processed_files(files)
+        raise
+    catalog_cache.bump()
+    
+    return {
+        'message': 'Project created successfully',
+        'files': files,
+        'project': {
+            'id': project.id,
+            'area': project.area,
+            'main_image_url': project.main_image_url,
+            'photos': [main_file['url']] + saved_photos
+        }
+    }
+
 # API route to create empty project
 @app.route('/api/projects/empty', methods=['POST'])
 @login_required
@@ -377,6 +576,7 @@ def create_empty_project():
         
         db.session.add(project)
         db.session.commit()
+        catalog_cache.bump()
         
         # Return created project data
         return jsonify({
@@ -419,28 +619,21 @@ def delete_project(project_id):
         
         # Get all photos for this project
         photos = project.photos
-        
-        # Delete uploaded files from filesystem
-        deleted_files = []
-        failed_deletions = []
-        
-        # Delete main image file
-        if project.main_image_url:
-            if delete_uploaded_file(project.main_image_url):
-                deleted_files.append(project.main_image_url)
-            else:
-                failed_deletions.append(project.main_image_url)
-        
-        # Delete gallery photo files
-        for photo in photos:
-            if delete_uploaded_file(photo.url):
-                deleted_files.append(photo.url)
-            else:
-                failed_deletions.append(photo.url)
+        file_urls = [project.main_image_url] + [photo.url for photo in photos]
         
         # Delete from database (photos will be deleted automatically due to cascade)
         db.session.delete(project)
         db.session.commit()
+        catalog_cache.bump()
+        
+        # Delete uploaded files from filesystem (after commit - shared files stay while referenced)
+        deleted_files = []
+        failed_deletions = []
+        for file_url in dict.fromkeys(url for url in file_urls if url):
+            if delete_uploaded_file(file_url):
+                deleted_files.append(file_url)
+            elif not reference_count(file_url):
+                failed_deletions.append(file_url)
         
         # Prepare response
         response_data = {
@@ -503,6 +696,7 @@ def update_project(project_id):
         
         # Save changes to database
         db.session.commit()
+        catalog_cache.bump()
         
         # Get all photos for this project
         photo_urls = [photo.url for photo in project.photos]
@@ -561,37 +755,19 @@ def add_project_photos(project_id):
                 'error': 'No photos provided'
             }), 400
         
-        saved_photos = []
-        
-        # Save each photo
-        for photo_file in photos:
-            if photo_file and photo_file.filename != '':
-                photo_url = save_uploaded_file(photo_file, 'gallery')
-                if photo_url:
-                    photo = Photo(
-                        url=photo_url,
-                        project_id=project.id
-                    )
-                    db.session.add(photo)
-                    saved_photos.append(photo_url)
-        
-        # Commit all changes
-        db.session.commit()
+        # Stage each photo (verified in parallel in the background job)
+        entries = stage_uploaded_files(photos)
+        accepted = sum(1 for entry in entries if entry['staged'])
+        if not accepted:
+            return jsonify({
+                'success': False,
+                'error': 'Invalid photo file format',
+                'files': [{'filename': entry['original_name'], 'error': entry['error']} for entry in entries]
+            }), 400
         
-        # Get all photos for this project
-        all_photos = [photo.url for photo in project.photos]
-        
-        return jsonify({
-            'success': True,
-            'message': f'{len(saved_photos)} photos added successfully',
-            'added_photos': saved_photos,
-            'project': {
-                'id': project.id,
-                'area': project.area,
-                'main_image_url': project.main_image_url,
-                'photos': all_photos
-            }
-        }), 200
+        # ფოტოები გამოჩნდება დავალების დასრულებისას (finish_project_photos_upload)
+        job = image_jobs.submit('project_photos', entries, project_id=project.id)
+        return job_accepted(job, f'{accepted} photos accepted for processing')
         
     except Exception as e:
         db.session.rollback()
@@ -600,6 +776,39 @@ def add_project_photos(project_id):
             'error': str(e)
         }), 500
 
+@image_jobs.handler('project_photos')
+def finish_project_photos_upload(payload, files):
+    """დამუშავებული გალერეის ფოტოების დამატება პროექტზე"""
+    project = Project.query.options(selectinload(Project.photos)).get(payload['project_id'])
+    if not project:
+        # პროექტი წაიშალა, სანამ ფოტოები მუშავდებოდა
+        discard_processed_files(files)
+        raise ValueError(f"Project with ID {payload['project_id']} not found")
+    
+    # ყველა ფოტო ერთი INSERT-ით; შედეგში თითო ფაილის სტატუსი (url ან error)
+    saved_photos = [entry['url'] for entry in files if entry['url']]
+    try:
+        if saved_photos:
+            db.session.execute(insert(Photo), [{'url': url, 'project_id': project.id} for url in saved_photos])
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        discard_processed_files(files)
+        raise
+    catalog_cache.bump()
+    
+    return {
+        'message': f'{len(saved_photos)} photos added successfully',
+        'added_photos': saved_photos,
+        'files': files,
+        'project': {
+            'id': project.id,
+            'area': project.area,
+            'main_image_url': project.main_image_url,
+            'photos': [photo.url for photo in project.photos]
+        }
+    }
+
 # API route to update main image of a project
 @app.route('/api/projects/<int:project_id>/main-image', methods=['PUT'])
 @login_required
@@ -635,37 +844,17 @@ def update_project_main_image(project_id):
                 'error': 'Main image file is required'
             }), 400
         
-        # Delete old main image file if exists
-        if project.main_image_url:
-            delete_uploaded_file(project.main_image_url)
-        
-        # Save new main image
-        new_main_image_url = save_uploaded_file(main_image, 'main')
-        if not new_main_image_url:
+        # Stage new main image (verified in the background job)
+        main_entry = stage_uploaded_file(main_image)
+        if not main_entry:
             return jsonify({
                 'success': False,
                 'error': 'Invalid main image file format'
             }), 400
         
-        # Update project's main image URL
-        project.main_image_url = new_main_image_url
-        
-        # Commit changes
-        db.session.commit()
-        
-        # Get all photos for this project
-        all_photos = [photo.url for photo in project.photos]
-        
-        return jsonify({
-            'success': True,
-            'message': 'Main image updated successfully',
-            'project': {
-                'id': project.id,
-                'area': project.area,
-                'main_image_url': project.main_image_url,
-                'photos': all_photos
-            }
-        }), 200
+        # ძველი ფოტო შეიცვლება დავალების დასრულებისას (finish_main_image_upload)
+        job = image_jobs.submit('project_main', [main_entry], project_id=project.id)
+        return job_accepted(job, 'Main image accepted for processing')
         
     except Exception as e:
         db.session.rollback()
@@ -674,6 +863,43 @@ def update_project_main_image(project_id):
             'error': str(e)
         }), 500
 
+@image_jobs.handler('project_main')
+def finish_main_image_upload(payload, files):
+    """პროექტის მთავარი ფოტოს ჩანაცვლება - ძველი ფაილი იშლება commit-ის შემდეგ"""
+    main_file = files[0]
+    if not main_file['url']:
+        raise ValueError(main_file['error'] or 'Invalid main image file format')
+    
+    project = Project.query.options(selectinload(Project.photos)).get(payload['project_id'])
+    if not project:
+        discard_processed_files(files)
+        raise ValueError(f"Project with ID {payload['project_id']} not found")
+    
+    old_main_image_url = project.main_image_url
+    try:
+        project.main_image_url = main_file['url']
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        discard_processed_files(files)
+        raise
+    catalog_cache.bump()
+    
+    # Delete old main image file if exists
+    if old_main_image_url:
+        delete_uploaded_file(old_main_image_url)
+    
+    return {
+        'message': 'Main image updated successfully',
+        'files': files,
+        'project': {
+            'id': project.id,
+            'area': project.area,
+            'main_image_url': project.main_image_url,
+            'photos': [photo.url for photo in project.photos]
+        }
+    }
+
 # API route to delete main image of a project
 @app.route('/api/projects/<int:project_id>/main-image', methods=['DELETE'])
 @login_required
@@ -701,15 +927,16 @@ def delete_project_main_image(project_id):
                 'error': 'Project does not have a main image'
             }), 400
         
-        # Delete main image file from filesystem
-        file_deleted = delete_uploaded_file(project.main_image_url)
-        
         # Set main image URL to empty (or you could set it to None)
         old_main_image_url = project.main_image_url
         project.main_image_url = ''
         
         # Commit changes
         db.session.commit()
+        catalog_cache.bump()
+        
+        # Delete main image file from filesystem
+        file_deleted = delete_uploaded_file(old_main_image_url)
         
         # Get all photos for this project
         all_photos = [photo.url for photo in project.photos]
@@ -772,12 +999,13 @@ def delete_project_photo_by_url(project_id):
                 'error': f'Photo with URL {photo_url} not found in project {project_id}'
             }), 404
         
-        # Delete the photo file from filesystem
-        file_deleted = delete_uploaded_file(photo.url)
-        
         # Delete from database
         db.session.delete(photo)
         db.session.commit()
+        catalog_cache.bump()
+        
+        # Delete the photo file from filesystem
+        file_deleted = delete_uploaded_file(photo.url)
         
         # Get remaining photos for this project
         remaining_photos = [p.url for p in project.photos]
@@ -807,6 +1035,16 @@ def delete_project_photo_by_url(project_id):
 
 # User authentication API endpoints
 
+def password_hasher_busy_response():
+    """503, როცა პაროლების ჰეშირების რიგი სავსეა - კლიენტი მოგვიანებით ცდის"""
+    response = jsonify({
+        'success': False,
+        'error': 'სერვერი დატვირთულია, გთხოვთ სცადოთ რამდენიმე წამში'
+    })
+    response.status_code = 503
+    response.headers['Retry-After'] = '1'
+    return response
+
 @app.route('/api/register', methods=['POST'])
 @limiter.limit('5 per minute')
 def register():
@@ -824,8 +1062,12 @@ def register():
     if User.query.filter_by(username=username).first():
         return jsonify({'success': False, 'error': 'მომხმარებელი ამ სახელით უკვე არსებობს'}), 409
 
-    new_user = User(username=username, email=email)
-    new_user.set_password(password)
+    try:
+        password_hash = password_hasher.hash(password)
+    except PasswordHasherBusy:
+        return password_hasher_busy_response()
+
+    new_user = User(username=username, email=email, password_hash=password_hash)
     db.session.add(new_user)
     db.session.commit()
 
@@ -857,7 +1099,12 @@ def login():
 
         user = User.query.filter_by(email=email).first()
 
-        if user and user.check_password(password):
+        valid, new_hash = password_hasher.verify(user.password_hash, password) if user else (False, None)
+        if valid:
+            if new_hash:
+                # ჰეში ძველი პარამეტრებითაა (PASSWORD_HASH_METHOD შეიცვალა) - განახლება პაროლის გადაყენების გარეშე
+                user.password_hash = new_hash
+                db.session.commit()
             login_user(user)
             return jsonify({
                 'success': True, 
@@ -872,6 +1119,8 @@ def login():
             'error': 'არასწორი ელ-ფოსტა ან პაროლი'
         }), 401
 
+    except PasswordHasherBusy:
+        return password_hasher_busy_response()
     except Exception as e:
         return jsonify({
             'success': False,
@@ -893,40 +1142,76 @@ def logout():
 @app.route('/api/status')
 def status():
     try:
-        if current_user.is_authenticated:
+        # სესიის user_id + ქეშირებული მომხმარებელი - current_user (და ბაზა) არ გვჭირდება
+        user_id = session_user_id()
+        user = identity_cache.peek(int(user_id)) if user_id is not None else None
+        if user is not None:
             return jsonify({
-                'logged_in': True, 
+                'logged_in': True,
                 'user': {
-                    'username': current_user.username, 
-                    'is_admin': current_user.is_admin
+                    'username': user.username,
+                    'is_admin': user.is_admin
                 }
             })
-        return jsonify({'logged_in': False})
+        return jsonify(auth_status())
     except Exception as e:
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
-@app.route('/api/projects/<int:project_id>/like', methods=['POST'])
+# POST - მოწონების გადართვა; PUT/DELETE - იდემპოტენტური მოწონება/მოხსნა
+@app.route('/api/projects/<int:project_id>/like', methods=['POST', 'PUT', 'DELETE'])
 @login_required
 def like_project(project_id):
     try:
-        project = Project.query.get_or_404(project_id)
+        action = {'POST': 'toggle', 'PUT': 'like', 'DELETE': 'unlike'}[request.method]
+
+        if like_buffer.enabled:
+            # write-behind: განზრახვა იწერება ლოკალურ ჟურნალში, ბაზაში მოგვიანებით გადავა
+            likes_count = db.session.execute(
+                select(Project.likes_count).where(Project.id == project_id)
+            ).scalar()
+            if likes_count is None:
+                return jsonify({
+                    'success': False,
+                    'error': f'Project with ID {project_id} not found'
+                }), 404
+            liked, changed = like_buffer.record(current_user.id, project_id, action)
+            if changed:
+                liked_ids_cache.changed(current_user.id)
+                replica_router.mark_write()
+            return jsonify({
+                'success': True,
+                'liked': liked,
+                'likes_count': likes_count + like_buffer.pending_deltas().get(project_id, 0)
+            })
+
+        try:
+            result = apply_project_like(project_id, current_user.id, action)
+        except IntegrityError:
+            # PostgreSQL-ზე არარსებული პროექტის მოწონება FK შეზღუდვას არღვევს
+            result = None
         
-        if project in current_user.liked_projects:
-            current_user.liked_projects.remove(project)
-            liked = False
-        else:
-            current_user.liked_projects.append(project)
-            liked = True
+        if result is None:
+            db.session.rollback()
+            return jsonify({
+                'success': False,
+                'error': f'Project with ID {project_id} not found'
+            }), 404
         
+        liked, changed, likes_count = result
         db.session.commit()
+        if changed:
+            liked_ids_cache.changed(current_user.id)
+            catalog_cache.bump()
+            # read-your-writes: მომდევნო კითხვები მთავარ ბაზიდან, სანამ replica დაეწევა
+            replica_router.mark_write()
         
         return jsonify({
             'success': True, 
             'liked': liked, 
-            'likes_count': project.liked_by_users.count()
+            'likes_count': likes_count
         })
         
     except Exception as e:
@@ -936,44 +1221,22 @@ def like_project(project_id):
             'error': str(e)
         }), 500
 
+def serialize_liked_projects(user_id):
+    """მომხმარებლის მოწონებული პროექტები - აგრეგაციის გარეშე, მხოლოდ მისი id-ებით"""
+    liked_ids = user_liked_ids(user_id)
+    projects_data = serialize_projects(liked_ids, liked_ids=liked_ids, session=replica_router.read_session())
+    if like_buffer.enabled:
+        # write-behind: likes_count-ს ჯერ არ გადატანილი ცვლილებები ემატება
+        projects_data = like_buffer.overlay(projects_data, user_id)
+    return projects_data
+
 # API route to get user's liked projects
 @app.route('/api/user/liked-projects')
 @login_required
 def get_user_liked_projects():
     try:
-        # N+1 პრობლემის გადაჭრა: Subquery მოწონებების დასათვლელად
-        likes_count_subquery = db.session.query(
-            project_likes.c.project_id,
-            func.count(project_likes.c.user_id).label('likes_count')
-        ).group_by(project_likes.c.project_id).subquery()
-
-        # მომხმარებლის მიერ მოწონებული პროექტები: join project_likes ტაბლოზე და ფილტრი მიმდინარე მომხმარებელზე
-        liked_projects_with_counts = db.session.query(
-            Project,
-            likes_count_subquery.c.likes_count
-        ).join(
-            project_likes, Project.id == project_likes.c.project_id
-        ).filter(
-            project_likes.c.user_id == current_user.id
-        ).outerjoin(
-            likes_count_subquery, Project.id == likes_count_subquery.c.project_id
-        ).options(selectinload(Project.photos)).all()
-
-        # Create JSON response
-        projects_data = []
-        for project, likes_count in liked_projects_with_counts:
-            # Get all photo URLs for this project
-            photo_urls = [photo.url for photo in project.photos]
-
-            project_data = {
-                'id': project.id,
-                'area': project.area,
-                'main_image_url': project.main_image_url,
-                'photos': photo_urls,
-                'is_liked': True,  # Always true for liked projects
-                'likes_count': likes_count or 0
-            }
-            projects_data.append(project_data)
+        # მომხმარებლის მიერ მოწონებული პროექტები (id-ები ქეშიდან, პროექტები და ფოტოები ორი მოთხოვნით)
+        projects_data = serialize_liked_projects(current_user.id)
 
         return jsonify({
             'success': True,
@@ -1000,46 +1263,15 @@ def get_admin_user_liked_projects(user_id):
             }), 403
         
         # Get the target user
-        target_user = User.query.get(user_id)
+        target_user = replica_router.read_session().get(User, user_id)
         if not target_user:
             return jsonify({
                 'success': False,
                 'error': f'User with ID {user_id} not found'
             }), 404
         
-        # N+1 პრობლემის გადაჭრა: Subquery მოწონებების დასათვლელად
-        likes_count_subquery = db.session.query(
-            project_likes.c.project_id,
-            func.count(project_likes.c.user_id).label('likes_count')
-        ).group_by(project_likes.c.project_id).subquery()
-        
-        # Get all liked projects for the target user with their like counts
-        liked_projects_with_counts = db.session.query(
-            Project,
-            likes_count_subquery.c.likes_count
-        ).join(
-            project_likes, Project.id == project_likes.c.project_id
-        ).filter(
-            project_likes.c.user_id == user_id
-        ).outerjoin(
-            likes_count_subquery, Project.id == likes_count_subquery.c.project_id
-        ).options(selectinload(Project.photos)).all()
-        
-        # Create JSON response
-        projects_data = []
-        for project, likes_count in liked_projects_with_counts:
-            # Get all photo URLs for this project
-            photo_urls = [photo.url for photo in project.photos]
-            
-            project_data = {
-                'id': project.id,
-                'area': project.area,
-                'main_image_url': project.main_image_url,
-                'photos': photo_urls,
-                'is_liked': True,  # Always true for liked projects
-                'likes_count': likes_count or 0
-            }
-            projects_data.append(project_data)
+        # Get all liked projects for the target user
+        projects_data = serialize_liked_projects(user_id)
         
         return jsonify({
             'success': True,
@@ -1058,6 +1290,132 @@ def get_admin_user_liked_projects(user_id):
             'error': str(e)
         }), 500
 
+# ===== ადმინის მომხმარებლების სია =====
+ADMIN_USERS_PAGE_SIZE = 50
+
+def prefix_condition(column, prefix):
+    """lower(column) იწყება prefix-ით - დიაპაზონი იყენებს lower() ინდექსს, LIKE კი ზუსტ შედეგს იძლევა"""
+    lowered = func.lower(column)
+    escaped = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    condition = and_(lowered >= prefix, lowered.like(f'{escaped}%', escape='\\'))
+    if ord(prefix[-1]) < 0x10FFFF:
+        condition = and_(condition, lowered < prefix[:-1] + chr(ord(prefix[-1]) + 1))
+    return condition
+
+def parse_admin_users_args():
+    """?limit=&after_id=&q= პარამეტრების წაკითხვა; არასწორ მნიშვნელობაზე ValueError"""
+    limit = request.args.get('limit', str(ADMIN_USERS_PAGE_SIZE))
+    if not limit.isdigit() or int(limit) < 1:
+        raise ValueError('limit must be a positive integer')
+    limit = min(int(limit), app.config['ADMIN_USERS_MAX_PAGE_SIZE'])
+
+    after_id = request.args.get('after_id')
+    if after_id is not None:
+        if not after_id.isdigit():
+            raise ValueError('after_id must be a non-negative integer')
+        after_id = int(after_id)
+
+    return limit, after_id, request.args.get('q', '').strip().lower()
+
+# მომხმარებლების სია ადმინისთვის - keyset პაგინაცია id-ით და ძებნა სახელის/ელ-ფოსტის დასაწყისით
+@app.route('/api/admin/users')
+@login_required
+def get_admin_users():
+    if not current_user.is_admin:
+        return jsonify({
+            'success': False,
+            'error': 'Access denied. Admin privileges required.'
+        }), 403
+
+    try:
+        limit, after_id, search = parse_admin_users_args()
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+    try:
+        reads = replica_router.read_session()
+        search_condition = None
+        if search:
+            search_condition = or_(prefix_condition(User.username, search), prefix_condition(User.email, search))
+
+        query = select(User.id, User.username, User.email, User.is_admin).order_by(User.id).limit(limit + 1)
+        if after_id is not None:
+            query = query.where(User.id > after_id)
+        if search_condition is not None:
+            query = query.where(search_condition)
+        rows = reads.execute(query).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        # მოწონებების რაოდენობა მთელი გვერდისთვის ერთი GROUP BY მოთხოვნით
+        likes_counts = {}
+        if rows:
+            likes_counts = dict(reads.execute(
+                select(project_likes.c.user_id, func.count())
+                .where(project_likes.c.user_id.in_([row.id for row in rows]))
+                .group_by(project_likes.c.user_id)
+            ).all())
+
+        response = {
+            'success': True,
+            'users': [{
+                'id': row.id,
+                'username': row.username,
+                'email': row.email,
+                'is_admin': bool(row.is_admin),
+                'likes_count': likes_counts.get(row.id, 0)
+            } for row in rows],
+            'count': len(rows),
+            'next_cursor': rows[-1].id if has_more else None
+        }
+        # სრული რაოდენობა მხოლოდ პირველ გვერდზე
+        if after_id is None:
+            total_query = select(func.count()).select_from(User)
+            if search_condition is not None:
+                total_query = total_query.where(search_condition)
+            response['total'] = reads.execute(total_query).scalar()
+        return jsonify(response)
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+def pool_stats(pool):
+    """pool-ის მრიცხველები /api/admin/db-pool-ისთვის"""
+    stats = {'pool_class': type(pool).__name__, 'status': pool.status()}
+    # QueuePool: size - მუდმივი კავშირები, checkedout - ახლა გამოყენებული (ეს მოთხოვნაც),
+    # overflow - size-ის ზემოთ გახსნილი (უარყოფითი - ჯერ არ გახსნილა)
+    for name in ('size', 'checkedin', 'checkedout', 'overflow'):
+        if hasattr(pool, name):
+            stats[name] = getattr(pool, name)()
+    return stats
+
+# ბაზის კავშირების pool-ის მდგომარეობა - მხოლოდ იმ worker-ის, რომელმაც მოთხოვნა მიიღო (pid)
+@app.route('/api/admin/db-pool')
+@login_required
+def get_db_pool_stats():
+    if not current_user.is_admin:
+        return jsonify({
+            'success': False,
+            'error': 'Access denied. Admin privileges required.'
+        }), 403
+
+    options = app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {}
+    response = {
+        'success': True,
+        'pid': os.getpid(),
+        'pool': pool_stats(db.engine.pool),
+        'config': {key: options[key] for key in ('pool_size', 'max_overflow', 'pool_timeout') if key in options}
+    }
+    if replica_router.enabled:
+        response['replica_pool'] = pool_stats(db.engines[REPLICA_BIND].pool)
+    return jsonify(response)
+
 # Contact form API endpoint
 @app.route('/api/contact', methods=['POST'])
 @limiter.limit('10 per minute')
@@ -1132,26 +1490,16 @@ def contact_form():
 @app.route('/api/carousel')
 def get_carousel_images():
     try:
-        # Query all active carousel images ordered by order field
-        carousel_images = CarouselImage.query.filter_by(is_active=True).order_by(CarouselImage.order.asc()).all()
-        
-        # Create JSON response
-        images_data = []
-        for image in carousel_images:
-            image_data = {
-                'id': image.id,
-                'url': image.url,
-                'order': image.order,
-                'is_active': image.is_active,
-                'created_at': image.created_at.isoformat() if image.created_at else None
-            }
-            images_data.append(image_data)
-        
-        return jsonify({
-            'success': True,
-            'images': images_data,
-            'count': len(images_data)
-        })
+        # If-None-Match: ვერსია ფაილიდან იკითხება, ბაზა არ გამოიყენება
+        response = not_modified(f'c{carousel_cache.current_version()}')
+        if response is not None:
+            return response
+
+        # აქტიური კარუსელის ფოტოები მეხსიერებიდან (რიგითობის მიხედვით)
+        # პასუხი იწყობა snapshot-ის მზა JSON ბაიტებიდან
+        snapshot = carousel_cache.get()
+        response = app.response_class(carousel_json(snapshot), mimetype='application/json')
+        return set_cache_headers(response, f'c{snapshot.version}')
     
     except Exception as e:
         return jsonify({
@@ -1186,9 +1534,9 @@ def add_carousel_image():
                 'error': 'Image file is required'
             }), 400
         
-        # Save image file
-        image_url = save_uploaded_file(image_file, 'carousel')
-        if not image_url:
+        # Stage image file (verified in the background job)
+        image_entry = stage_uploaded_file(image_file)
+        if not image_entry:
             return jsonify({
                 'success': False,
                 'error': 'Invalid image file format'
@@ -1201,28 +1549,243 @@ def add_carousel_image():
         except (ValueError, TypeError):
             order = 0
         
-        # Create new carousel image
-        carousel_image = CarouselImage(
-            url=image_url,
-            order=order,
-            is_active=True
-        )
+        # ფოტო კარუსელში დაემატება დავალების დასრულებისას (finish_carousel_upload)
+        job = image_jobs.submit('carousel', [image_entry], order=order)
+        return job_accepted(job, 'Carousel image accepted for processing')
         
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@image_jobs.handler('carousel')
+def finish_carousel_upload(payload, files):
+    """დამუშავებული ფოტოს დამატება კარუსელში"""
+    image_file = files[0]
+    if not image_file['url']:
+        raise ValueError(image_file['error'] or 'Invalid image file format')
+    
+    carousel_image = CarouselImage(
+        url=image_file['url'],
+        order=payload['order'],
+        is_active=True
+    )
+    try:
         db.session.add(carousel_image)
         db.session.commit()
+    except Exception:
+        db.session.rollback()
+        discard_processed_files(files)
+        raise
+    carousel_cache.bump()
+    
+    return {
+        'message': 'Carousel image added successfully',
+        'image': {
+            'id': carousel_image.id,
+            'url': carousel_image.url,
+            'srcset': image_srcset(carousel_image.url),
+            'order': carousel_image.order,
+            'is_active': carousel_image.is_active,
+            'created_at': carousel_image.created_at.isoformat() if carousel_image.created_at else None
+        }
+    }
+
+# API route to get image-processing job status
+@app.route('/api/jobs/<int:job_id>')
+@login_required
+def get_image_job(job_id):
+    try:
+        # დავალებებს ქმნის მხოლოდ ადმინისტრატორი
+        if not current_user.is_admin:
+            return jsonify({
+                'success': False,
+                'error': 'Access denied. Admin privileges required.'
+            }), 403
+        
+        job = db.session.get(ImageJob, job_id)
+        if not job:
+            return jsonify({
+                'success': False,
+                'error': f'Job with ID {job_id} not found'
+            }), 404
         
         return jsonify({
             'success': True,
-            'message': 'Carousel image added successfully',
-            'image': {
-                'id': carousel_image.id,
-                'url': carousel_image.url,
-                'order': carousel_image.order,
-                'is_active': carousel_image.is_active,
-                'created_at': carousel_image.created_at.isoformat() if carousel_image.created_at else None
-            }
-        }), 201
+            'job': job_to_dict(job)
+        })
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+# ===== ნაწილებად ატვირთვა (დიდი ფაილები) =====
+# POST /api/uploads -> PUT /api/uploads/<id>?offset=N (ნაწილი) -> POST /api/uploads/<id>/finalize
+# ფინალიზაციისას ფაილი გადაეცემა იმავე ImageJob-ს, რასაც ჩვეულებრივი ატვირთვა
+UPLOAD_TARGETS = {
+    'main': 'project_main',
+    'gallery': 'project_photos',
+    'carousel': 'carousel'
+}
+
+def upload_error_response(error):
+    return jsonify({
+        'success': False,
+        'error': str(error),
+        **error.extra
+    }), error.status
+
+# API route to start a chunked upload
+@app.route('/api/uploads', methods=['POST'])
+@login_required
+def create_chunked_upload():
+    try:
+        if not current_user.is_admin:
+            return jsonify({
+                'success': False,
+                'error': 'Access denied. Admin privileges required.'
+            }), 403
+        
+        data = request.get_json(silent=True) or {}
+        filename = secure_filename(str(data.get('filename') or ''))
+        if not filename or not allowed_file(filename):
+            return jsonify({
+                'success': False,
+                'error': 'File type not allowed'
+            }), 400
+        
+        size = data.get('size')
+        if not isinstance(size, int) or isinstance(size, bool):
+            return jsonify({
+                'success': False,
+                'error': 'File size is required'
+            }), 400
+        
+        upload = chunked_uploads.create(filename, size, current_user.id)
+        response = jsonify({
+            'success': True,
+            'upload': upload
+        })
+        response.status_code = 201
+        response.headers['Location'] = url_for('get_chunked_upload', upload_id=upload['id'])
+        return response
+    
+    except UploadError as e:
+        return upload_error_response(e)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+# API route to get chunked upload status (offset to resume from)
+@app.route('/api/uploads/<upload_id>', methods=['GET'])
+@login_required
+def get_chunked_upload(upload_id):
+    try:
+        return jsonify({
+            'success': True,
+            'upload': chunked_uploads.status(upload_id, current_user.id)
+        })
+    except UploadError as e:
+        return upload_error_response(e)
+
+# API route to upload one chunk (raw request body) at the given offset
+@app.route('/api/uploads/<upload_id>', methods=['PUT'])
+@login_required
+def put_upload_chunk(upload_id):
+    try:
+        offset = request.args.get('offset', request.headers.get('Upload-Offset', ''))
+        if not offset.isdigit():
+            return jsonify({
+                'success': False,
+                'error': 'offset must be a non-negative integer'
+            }), 400
         
+        # request.stream - ბაიტები იწერება ფაილში პირდაპირ, მეხსიერებაში დაგროვების გარეშე
+        upload = chunked_uploads.write_chunk(upload_id, int(offset), request.stream, current_user.id)
+        return jsonify({
+            'success': True,
+            'upload': upload
+        })
+    
+    except UploadError as e:
+        return upload_error_response(e)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+# API route to cancel a chunked upload
+@app.route('/api/uploads/<upload_id>', methods=['DELETE'])
+@login_required
+def cancel_chunked_upload(upload_id):
+    try:
+        chunked_uploads.cancel(upload_id, current_user.id)
+        return jsonify({
+            'success': True,
+            'message': 'Upload cancelled'
+        })
+    except UploadError as e:
+        return upload_error_response(e)
+
+# API route to finish a chunked upload and attach it to a project or the carousel
+@app.route('/api/uploads/<upload_id>/finalize', methods=['POST'])
+@login_required
+def finalize_chunked_upload(upload_id):
+    try:
+        if not current_user.is_admin:
+            return jsonify({
+                'success': False,
+                'error': 'Access denied. Admin privileges required.'
+            }), 403
+        
+        data = request.get_json(silent=True) or {}
+        target = data.get('target')
+        if target not in UPLOAD_TARGETS:
+            return jsonify({
+                'success': False,
+                'error': f'target must be one of: {", ".join(UPLOAD_TARGETS)}'
+            }), 400
+        kind = UPLOAD_TARGETS[target]
+        
+        # მიზნის შემოწმება ფინალიზაციამდე - შეცდომისას ატვირთვა რჩება და შეიძლება გამეორდეს
+        params = {}
+        if target == 'carousel':
+            try:
+                params['order'] = int(data.get('order', 0))
+            except (ValueError, TypeError):
+                params['order'] = 0
+        else:
+            project_id = data.get('project_id')
+            if not isinstance(project_id, int) or not db.session.get(Project, project_id):
+                return jsonify({
+                    'success': False,
+                    'error': f'Project with ID {project_id} not found'
+                }), 404
+            params['project_id'] = project_id
+        
+        part_path, meta, sha256 = chunked_uploads.finalize(upload_id, current_user.id, data.get('sha256'))
+        
+        # .part ფაილი უკვე .staging-შია - დავალება მას პირდაპირ საბოლოო ადგილზე გადაიტანს
+        # SHA-256 ატვირთვისას უკვე დაითვალა - ფაილის სახელი საცავში
+        try:
+            entry = image_jobs.staged_entry(os.path.basename(part_path), sha256, meta['filename'])
+            job = image_jobs.submit(kind, [entry], **params)
+        except Exception:
+            # სესია ბრუნდება - .part ფაილი არ ობლდება და finalize თავიდან შეიძლება
+            chunked_uploads.release(upload_id)
+            raise
+        chunked_uploads.complete(upload_id)
+        return job_accepted(job, 'Upload complete, processing started', sha256=sha256)
+    
+    except UploadError as e:
+        return upload_error_response(e)
     except Exception as e:
         db.session.rollback()
         return jsonify({
@@ -1271,6 +1834,7 @@ def update_carousel_image_order(image_id):
         # Update order
         carousel_image.order = new_order
         db.session.commit()
+        carousel_cache.bump()
         
         return jsonify({
             'success': True,
@@ -1313,6 +1877,7 @@ def toggle_carousel_image_status(image_id):
         # Toggle active status
         carousel_image.is_active = not carousel_image.is_active
         db.session.commit()
+        carousel_cache.bump()
         
         return jsonify({
             'success': True,
@@ -1352,12 +1917,13 @@ def delete_carousel_image(image_id):
                 'error': f'Carousel image with ID {image_id} not found'
             }), 404
         
-        # Delete image file from filesystem
-        file_deleted = delete_uploaded_file(carousel_image.url)
-        
         # Delete from database
         db.session.delete(carousel_image)
         db.session.commit()
+        carousel_cache.bump()
+        
+        # Delete image file from filesystem
+        file_deleted = delete_uploaded_file(carousel_image.url)
         
         return jsonify({
             'success': True,
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# ===== ARCHUB - სტატიკური ფაილების აგება =====
+# ეს ფაილი შეიცავს JS/CSS/შრიფტების აგებას ჰეშიანი სახელებით (static/dist/)
+# აგება: python assets.py - იქმნება script.<hash>.js, .gz/.br ასლები და manifest.json;
+# შაბლონებში asset_url('script.js') აბრუნებს აგებულ ვერსიას (თუ არ არის - ორიგინალს)
+
+import glob
+import gzip
+import hashlib
+import io
+import logging
+import os
+import re
+
+from flask import url_for
+
+from serializers import dumps_bytes, loads
+
+try:
+    import brotli
+except ImportError:  # brotli არასავალდებულოა - მაშინ მხოლოდ .gz ასლები იქმნება
+    brotli = None
+
+try:
+    from fontTools import subset as font_subset
+except ImportError:  # fonttools არასავალდებულოა - შრიფტები უცვლელად კოპირდება
+    font_subset = None
+
+DIST_FOLDER = 'dist'
+MANIFEST_NAME = 'manifest.json'
+ASSET_FILES = ('styles.css', 'admin.css', 'script.js', 'admin.js')
+FONT_FOLDER = 'fonts'
+HASH_LENGTH = 10
+# ჰეშიანი ფაილი: /static/dist/<სახელი>.<10 hex>.<გაფართოება>
+HASHED_ASSET_PATTERN = re.compile(r'^/static/dist/.+\.[0-9a-f]{%d}\.\w+$' % HASH_LENGTH)
+
+COMPRESS_EXTENSIONS = ('.js', '.css', '.svg', '.ttf', '.eot')
+# შრიფტის ფორმატი -> fontTools-ის flavor
+SUBSET_FLAVORS = {'.ttf': None, '.woff': 'woff', '.woff2': 'woff2'}
+# სიმბოლოები იკრიბება ამ ფაილებიდან; ბაზის ტექსტისთვის (პროექტები, სახელები)
+# ყოველთვის რჩება ASCII, Latin-1 და ქართული ანბანი
+GLYPH_SOURCES = ('templates/*.html', 'static/*.js', 'static/*.css')
+GLYPH_RANGES = (
+    (0x20, 0x7E),      # ASCII
+    (0xA0, 0xFF),      # Latin-1
+    (0x10A0, 0x10FF),  # ქართული (მხედრული, ასომთავრული)
+    (0x1C90, 0x1CBF),  # მთავრული
+    (0x2010, 0x2027),  # ტირეები, ბრჭყალები, ...
+    (0x20BE, 0x20BE),  # ₾
+)
+
+CSS_URL_PATTERN = re.compile(r'''url\((['"]?)([^'")]+)\1\)''')
+
+
+class AssetManifest:
+    """manifest.json-ის წაკითხვა და asset_url() შაბლონებისთვის
+
+    manifest ხელახლა იკითხება მხოლოდ ფაილის შეცვლისას (os.stat), ამიტომ
+    ახალი აგება worker-ების გადატვირთვის გარეშე ჩანს.
+    """
+
+    def __init__(self, app=None):
+        self.path = None
+        self._state = (None, {})  # (ფაილის stat გასაღები, ჩანაწერები)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.path = os.path.join(app.static_folder, DIST_FOLDER, MANIFEST_NAME)
+        app.add_template_global(self.url, 'asset_url')
+        app.extensions['asset_manifest'] = self
+
+    def entries(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return {}
+        key = (st.st_ino, st.st_mtime_ns, st.st_size)
+        cached_key, entries = self._state
+        if key != cached_key:
+            try:
+                with open(self.path, 'rb') as f:
+                    entries = loads(f.read())
+            except (OSError, ValueError):
+                return entries
+            self._state = (key, entries)
+        return entries
+
+    def version(self):
+        """manifest-ის შიგთავსი hashable სახით (გვერდების ქეშის გასაღებისთვის)"""
+        return tuple(sorted(self.entries().items()))
+
+    def url(self, filename, **kwargs):
+        """სტატიკური ფაილის URL - აგებული (ჰეშიანი) ვერსია, თუ manifest-შია"""
+        return url_for('static', filename=self.entries().get(filename, filename), **kwargs)
+
+
+def hashed_name(name, data):
+    """'fonts/x.woff2' -> 'dist/fonts/x.<hash>.woff2'"""
+    stem, extension = os.path.splitext(name)
+    digest = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+    return f'{DIST_FOLDER}/{stem}.{digest}{extension}'
+
+
+def glyph_unicodes(root):
+    """საიტზე გამოყენებული სიმბოლოები + GLYPH_RANGES"""
+    unicodes = set()
+    for start, end in GLYPH_RANGES:
+        unicodes.update(range(start, end + 1))
+    for pattern in GLYPH_SOURCES:
+        for path in glob.glob(os.path.join(root, pattern)):
+            with open(path, encoding='utf-8', errors='ignore') as f:
+                unicodes.update(ord(char) for char in f.read() if not char.isspace())
+    return unicodes
+
+
+def subset_font(path, unicodes, flavor):
+    """შრიფტის მხოლოდ საჭირო glyph-ები (OpenType ფუნქციები და სახელები რჩება)"""
+    options = font_subset.Options()
+    options.flavor = flavor
+    options.layout_features = ['*']
+    options.name_IDs = ['*']
+    options.notdef_outline = True
+    font = font_subset.load_font(path, options)
+    subsetter = font_subset.Subsetter(options)
+    subsetter.populate(unicodes=unicodes)
+    subsetter.subset(font)
+    buffer = io.BytesIO()
+    font_subset.save_font(font, buffer, options)
+    return buffer.getvalue()
+
+
+def rewrite_css_urls(css, manifest):
+    """url(fonts/x.woff2) -> url(fonts/x.<hash>.woff2) - გზები dist/-ის მიმართ"""
+    def replace(match):
+        quote, url = match.groups()
+        # '?#iefix' და '#font-id' სუფიქსები რჩება
+        cut = re.search(r'[?#]', url)
+        path, suffix = (url[:cut.start()], url[cut.start():]) if cut else (url, '')
+        built = manifest.get(path)
+        if built is None:
+            return match.group(0)
+        relative = os.path.relpath(built, DIST_FOLDER).replace(os.sep, '/')
+        return f'url({quote}{relative}{suffix}{quote})'
+    return CSS_URL_PATTERN.sub(replace, css)
+
+
+def write_file(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def write_compressed(path, data):
+    """.gz და .br ასლები nginx-ის gzip_static / brotli_static-ისთვის - აბრუნებს შექმნილ ფაილებს"""
+    written = []
+    variants = [('.gz', gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append(('.br', brotli.compress(data, quality=11)))
+    for suffix, compressed in variants:
+        if len(compressed) < len(data):
+            write_file(path + suffix, compressed)
+            written.append(path + suffix)
+    return written
+
+
+def build_assets(static_folder, root=None):
+    """ყველა asset-ის აგება static/dist-ში - აბრუნებს ახალ manifest-ს
+
+    წინა აგების ფაილები რჩება (ძველი HTML-ის ქეშისთვის), უფრო ძველები იშლება.
+    """
+    root = root or os.path.dirname(os.path.abspath(static_folder))
+    dist_folder = os.path.join(static_folder, DIST_FOLDER)
+    manifest_path = os.path.join(dist_folder, MANIFEST_NAME)
+    try:
+        with open(manifest_path, 'rb') as f:
+            previous = loads(f.read())
+    except (OSError, ValueError):
+        previous = {}
+
+    sources = []
+    fonts_folder = os.path.join(static_folder, FONT_FOLDER)
+    if os.path.isdir(fonts_folder):
+        sources.extend(f'{FONT_FOLDER}/{name}' for name in sorted(os.listdir(fonts_folder)))
+    # CSS ბოლოს - მას შრიფტების ჰეშიანი სახელები სჭირდება
+    sources.extend(sorted(ASSET_FILES, key=lambda name: name.endswith('.css')))
+
+    unicodes = glyph_unicodes(root) if font_subset is not None else None
+    manifest = {}
+    keep = {MANIFEST_NAME}
+    for name in sources:
+        path = os.path.join(static_folder, name)
+        if not os.path.isfile(path):
+            continue
+        extension = os.path.splitext(name)[1].lower()
+        if extension in SUBSET_FLAVORS and unicodes is not None:
+            data = subset_font(path, unicodes, SUBSET_FLAVORS[extension])
+        else:
+            with open(path, 'rb') as f:
+                data = f.read()
+        if extension == '.css':
+            data = rewrite_css_urls(data.decode('utf-8'), manifest).encode('utf-8')
+
+        built = hashed_name(name, data)
+        built_path = os.path.join(static_folder, built)
+        if not os.path.exists(built_path):
+            write_file(built_path, data)
+        compressed = write_compressed(built_path, data) if extension in COMPRESS_EXTENSIONS else []
+        manifest[name] = built
+        keep.update(os.path.relpath(p, dist_folder) for p in [built_path] + compressed)
+        print(f"  {name} -> {built} ({os.path.getsize(path):,} -> {len(data):,} bytes)")
+
+    write_file(manifest_path, dumps_bytes(manifest))
+
+    # წინა აგების ფაილები რჩება; დანარჩენი ძველი ფაილები იშლება
+    for built in previous.values():
+        for suffix in ('', '.gz', '.br'):
+            keep.add(os.path.relpath(os.path.join(static_folder, built + suffix), dist_folder))
+    for dirpath, _, filenames in os.walk(dist_folder):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            if os.path.relpath(path, dist_folder) not in keep:
+                os.remove(path)
+    return manifest
+
+
+if __name__ == '__main__':
+    # fontTools აფრთხილებს ყოველ ცხრილზე, რომელსაც ვერ ამცირებს (მაგ. FFTM) - ეს ცხრილები უბრალოდ იშლება
+    logging.getLogger('fontTools').setLevel(logging.ERROR)
+    folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+    if font_subset is None:
+        print("fonttools is not installed - fonts are copied without subsetting")
+    if brotli is None:
+        print("brotli is not installed - only .gz files are written")
+    built = build_assets(folder)
+    print(f"Built {len(built)} assets into static/{DIST_FOLDER}/")
@@ -0,0 +1,74 @@
+# ===== ARCHUB - JSON სერიალიზაციის micro-benchmark =====
+# ადარებს Flask-ის სტანდარტულ jsonify-ს, FastJSONProvider-ს და snapshot-ის
+# მზა ბაიტებიდან აწყობილ პასუხს 5000 პროექტიან payload-ზე
+#
+# გაშვება პროექტის ძირიდან:
+#    python benchmarks/bench_json.py [--projects 5000] [--repeat 20]
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+import serializers
+from catalog import Snapshot
+from serializers import FastJSONProvider
+
+
+def make_projects(count):
+    """GET /api/projects-ის მსგავსი სატესტო მონაცემები"""
+    return [{
+        'id': i,
+        'area': f'{100 + i % 400} მ²',
+        'main_image_url': f'/static/uploads/projects/{i:08x}.jpg',
+        'photos': [f'/static/uploads/projects/{i:08x}_{n}.jpg' for n in range(6)],
+        'is_liked': i % 7 == 0,
+        'likes_count': i % 113
+    } for i in range(1, count + 1)]
+
+
+def run(name, func, repeat):
+    best = min(timeit.repeat(func, number=1, repeat=repeat))
+    print(f'{name:<34} {best * 1000:8.2f} ms')
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='JSON serialization benchmark')
+    parser.add_argument('--projects', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    projects = make_projects(args.projects)
+    payload = {'success': True, 'projects': projects, 'count': len(projects), 'next_cursor': None}
+    snapshot = Snapshot.from_data(1, projects)
+
+    default_app = Flask('bench_default')
+    default_app.json = DefaultJSONProvider(default_app)
+    fast_app = Flask('bench_fast')
+    fast_app.json = FastJSONProvider(fast_app)
+
+    print(f'projects: {args.projects}, orjson: {"yes" if serializers.orjson else "no (stdlib json)"}')
+
+    with default_app.app_context():
+        baseline = run('jsonify (DefaultJSONProvider)', lambda: default_app.json.response(payload).get_data(), args.repeat)
+
+    with fast_app.app_context():
+        fast = run('jsonify (FastJSONProvider)', lambda: fast_app.json.response(payload).get_data(), args.repeat)
+
+        def pre_encoded():
+            body = b'{"success":true,"projects":%s,"count":%d,"next_cursor":null}' % (
+                snapshot.raw_items(0, len(snapshot.items)), len(snapshot.items))
+            return fast_app.response_class(body, mimetype='application/json').get_data()
+        cached = run('snapshot raw bytes (pre-encoded)', pre_encoded, args.repeat)
+
+    print(f'FastJSONProvider: {baseline / fast:.1f}x, pre-encoded: {baseline / cached:.1f}x vs jsonify')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+# ===== ARCHUB - rate limit-ის micro-benchmark =====
+# ზომავს ერთი limit-ის შემოწმების ღირებულებას: limits-ის hit() თითო საცავზე
+# (memory:// - worker-ის მეხსიერება, sqlite:// - საერთო ფაილი, ratelimit.py) და
+# Flask-ის მოთხოვნის დამატებით დროს შეზღუდულ route-ზე შეუზღუდავთან შედარებით
+#
+# გაშვება პროექტის ძირიდან:
+#    python benchmarks/bench_ratelimit.py [--hits 20000] [--requests 3000]
+
+import argparse
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from flask_limiter import Limiter
+from flask_limiter.util import get_remote_address
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import FixedWindowRateLimiter
+
+import ratelimit  # noqa: F401 - sqlite:// საცავის რეგისტრაცია
+
+
+def per_call_us(func, number, repeat=5):
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e6
+
+
+def bench_storage(uri, hits):
+    """limits-ის ერთი hit() - ზუსტად ის, რასაც Flask-Limiter თითო მოთხოვნაზე აკეთებს"""
+    limiter = FixedWindowRateLimiter(storage_from_string(uri))
+    item = parse('1000000000 per minute')
+    keys = [f'10.0.{i // 256}.{i % 256}' for i in range(1000)]
+    counter = iter(range(10 ** 9))
+    return per_call_us(lambda: limiter.hit(item, 'login', keys[next(counter) % len(keys)]), hits)
+
+
+def bench_requests(uri, requests):
+    """Flask test client: შეზღუდული route-ის დამატებითი დრო შეუზღუდავთან შედარებით"""
+    app = Flask('bench_ratelimit')
+    app.config['RATELIMIT_STORAGE_URI'] = uri
+    limiter = Limiter(key_func=get_remote_address, app=app)
+
+    @app.route('/plain')
+    def plain():
+        return 'ok'
+
+    @app.route('/limited')
+    @limiter.limit('1000000000 per minute')
+    def limited():
+        return 'ok'
+
+    client = app.test_client()
+    baseline = per_call_us(lambda: client.get('/plain'), requests)
+    limited_us = per_call_us(lambda: client.get('/limited'), requests)
+    return baseline, limited_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rate limiter overhead benchmark')
+    parser.add_argument('--hits', type=int, default=20000)
+    parser.add_argument('--requests', type=int, default=3000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storages = (
+            ('memory://', 'memory://'),
+            ('sqlite:// (shared file)', f'sqlite:///{os.path.join(tmp, "ratelimit.db")}'),
+        )
+        print(f'{"storage":<26} {"hit()":>10} {"request":>10} {"+limiter":>10}')
+        for name, uri in storages:
+            hit_us = bench_storage(uri, args.hits)
+            baseline, limited_us = bench_requests(uri, args.requests)
+            print(f'{name:<26} {hit_us:8.1f}us {limited_us:8.1f}us {limited_us - baseline:8.1f}us')
+
+
+if __name__ == '__main__':
+    main()
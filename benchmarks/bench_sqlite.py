@@ -0,0 +1,163 @@
+# ===== ARCHUB - SQLite-ის კონკურენტული კითხვა/ჩაწერის benchmark =====
+# ადარებს SQLite-ის სტანდარტულ რეჟიმს (rollback journal) და SQLITE_PRAGMAS-ს
+# (WAL, synchronous=NORMAL, mmap, ... - sqlitemode.py): რამდენიმე პროცესი
+# (gunicorn worker-ების მსგავსად) კითხულობს პროექტებს და მოწონებულ პროექტებს,
+# სხვები კი ერთდროულად ცვლიან მოწონებებს (ცალკე commit თითო მოწონებაზე)
+#
+# გაშვება პროექტის ძირიდან:
+#    python benchmarks/bench_sqlite.py [--readers 4] [--writers 2] [--seconds 5]
+
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, delete, event, insert, select, update
+from sqlalchemy.exc import OperationalError
+
+from config import Config
+from extensions import db
+from models import Project, User, project_likes
+from sqlitemode import apply_pragmas
+
+PROJECTS = 500
+USERS = 2000
+
+
+def make_engine(path, pragmas):
+    engine = create_engine(f'sqlite:///{path}')
+    if pragmas:
+        event.listen(engine, 'connect', lambda dbapi_connection, record: apply_pragmas(dbapi_connection, pragmas))
+    return engine
+
+
+def seed(path, pragmas):
+    """ცხრილები models.py-დან და სატესტო მონაცემები"""
+    engine = make_engine(path, pragmas)
+    db.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {'username': f'user{i}', 'email': f'user{i}@example.com', 'password_hash': 'x', 'is_admin': False}
+            for i in range(1, USERS + 1)
+        ])
+        conn.execute(insert(Project), [
+            {'area': f'{100 + i % 400} მ²', 'main_image_url': f'/static/uploads/{i:08x}.jpg', 'likes_count': 0}
+            for i in range(1, PROJECTS + 1)
+        ])
+        rng = random.Random(1)
+        likes = {(rng.randint(1, USERS), rng.randint(1, PROJECTS)) for _ in range(USERS * 5)}
+        conn.execute(insert(project_likes), [{'user_id': u, 'project_id': p} for u, p in likes])
+    engine.dispose()
+
+
+def reader(path, pragmas, start_at, seconds, seed_value):
+    """GET /api/projects-ის გვერდი და GET /api/user/liked-projects - აბრუნებს (ოპერაციები, შეცდომები, დაყოვნებები)"""
+    engine = make_engine(path, pragmas)
+    rng = random.Random(seed_value)
+    ops, errors, latencies = 0, 0, []
+    while time.time() < start_at:
+        time.sleep(0.001)
+    deadline = start_at + seconds
+    while time.time() < deadline:
+        begin = time.perf_counter()
+        try:
+            with engine.connect() as conn:
+                after_id = rng.randint(0, PROJECTS)
+                conn.execute(
+                    select(Project.id, Project.area, Project.main_image_url, Project.likes_count)
+                    .where(Project.id > after_id).order_by(Project.id).limit(24)
+                ).all()
+                conn.execute(
+                    select(Project.id, Project.area, Project.main_image_url)
+                    .join(project_likes, project_likes.c.project_id == Project.id)
+                    .where(project_likes.c.user_id == rng.randint(1, USERS))
+                ).all()
+            ops += 1
+        except OperationalError:
+            errors += 1
+        latencies.append(time.perf_counter() - begin)
+    engine.dispose()
+    return ops, errors, latencies
+
+
+def writer(path, pragmas, start_at, seconds, seed_value):
+    """მოწონების toggle (likes.apply_project_like-ის მსგავსად) - თითო ცალკე ტრანზაქციაში"""
+    engine = make_engine(path, pragmas)
+    rng = random.Random(seed_value)
+    ops, errors, latencies = 0, 0, []
+    while time.time() < start_at:
+        time.sleep(0.001)
+    deadline = start_at + seconds
+    while time.time() < deadline:
+        user_id, project_id = rng.randint(1, USERS), rng.randint(1, PROJECTS)
+        begin = time.perf_counter()
+        try:
+            with engine.begin() as conn:
+                removed = conn.execute(delete(project_likes).where(
+                    project_likes.c.user_id == user_id, project_likes.c.project_id == project_id
+                )).rowcount
+                if not removed:
+                    conn.execute(insert(project_likes).values(user_id=user_id, project_id=project_id))
+                conn.execute(
+                    update(Project).where(Project.id == project_id)
+                    .values(likes_count=Project.likes_count + (-1 if removed else 1))
+                )
+            ops += 1
+        except OperationalError:
+            errors += 1
+        latencies.append(time.perf_counter() - begin)
+    engine.dispose()
+    return ops, errors, latencies
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def run_mode(directory, name, pragmas, args):
+    path = os.path.join(directory, f'{name}.db')
+    seed(path, pragmas)
+
+    ctx = multiprocessing.get_context('spawn')
+    start_at = time.time() + 2  # spawn-ს დრო სჭირდება - ყველა ერთად იწყებს
+    with ctx.Pool(args.readers + args.writers) as pool:
+        readers = [pool.apply_async(reader, (path, pragmas, start_at, args.seconds, i)) for i in range(args.readers)]
+        writers = [pool.apply_async(writer, (path, pragmas, start_at, args.seconds, 1000 + i)) for i in range(args.writers)]
+        read_results = [r.get() for r in readers]
+        write_results = [w.get() for w in writers]
+
+    def summary(results):
+        ops = sum(r[0] for r in results)
+        errors = sum(r[1] for r in results)
+        latencies = [latency for r in results for latency in r[2]]
+        return ops / args.seconds, errors, percentile(latencies, 0.99) * 1000
+
+    reads, read_errors, read_p99 = summary(read_results)
+    writes, write_errors, write_p99 = summary(write_results)
+    print(f'{name:<10} {reads:9.0f} {read_p99:9.1f}ms {writes:9.0f} {write_p99:9.1f}ms {read_errors + write_errors:7d}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SQLite concurrent read/write benchmark')
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--seconds', type=float, default=5)
+    args = parser.parse_args()
+
+    print(f'{args.readers} reader and {args.writers} writer processes, {args.seconds:g}s per mode')
+    print(f'{"mode":<10} {"reads/s":>9} {"read p99":>11} {"writes/s":>9} {"write p99":>11} {"errors":>7}')
+    with tempfile.TemporaryDirectory() as tmp:
+        run_mode(tmp, 'default', {}, args)
+        run_mode(tmp, 'wal', Config.SQLITE_PRAGMAS, args)
+
+
+if __name__ == '__main__':
+    main()
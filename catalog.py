@@ -0,0 +1,338 @@
+# ===== ARCHUB - კატალოგის ქეში =====
+# ეს ფაილი შეიცავს პროექტების კატალოგისა და კარუსელის snapshot-ებს
+# snapshot თავიდან იგება მხოლოდ შესაბამისი ვერსიის შეცვლისას და ქვეყნდება
+# memory-mapped ფაილში, რომელსაც ყველა gunicorn worker კითხულობს
+
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import defaultdict
+
+try:
+    import fcntl
+except ImportError:  # Windows - პროცესებს შორის lock არ გვჭირდება (ერთი პროცესი)
+    fcntl = None
+
+from sqlalchemy import select
+
+from extensions import db
+from images import SrcsetIndex
+from models import Project, Photo, CarouselImage
+from serializers import dumps_bytes, loads
+
+
+def serialize_projects(project_ids=None, liked_ids=frozenset(), session=None):
+    """პროექტების სერიალიზაცია მაქსიმუმ ორი მოთხოვნით (პროექტები + ფოტოები)
+
+    project_ids=None ნიშნავს ყველა პროექტს; შედეგი დალაგებულია id-ით.
+    მოწონებების რაოდენობა Project.likes_count სვეტიდან - project_likes-ის აგრეგაცია აღარ გვჭირდება.
+    session - საიდან იკითხება (None - db.session, მაგ. replica_router.read_session()).
+    """
+    if project_ids is not None and not project_ids:
+        return []
+    session = session or db.session
+
+    projects_query = select(Project.id, Project.area, Project.main_image_url, Project.likes_count).order_by(Project.id)
+    photos_query = select(Photo.project_id, Photo.url).order_by(Photo.id)
+    if project_ids is not None:
+        project_ids = list(project_ids)
+        projects_query = projects_query.where(Project.id.in_(project_ids))
+        photos_query = photos_query.where(Photo.project_id.in_(project_ids))
+
+    rows = session.execute(projects_query).all()
+    if not rows:
+        return []
+    photos = defaultdict(list)
+    for project_id, url in session.execute(photos_query):
+        photos[project_id].append(url)
+
+    # srcset-ები ფაილური სისტემიდან - თითო ვარიანტების საქაღალდე ერთხელ იკითხება
+    srcsets = SrcsetIndex()
+    projects_data = []
+    for project_id, area, main_image_url, likes_count in rows:
+        photo_urls = photos.get(project_id, [])
+        projects_data.append({
+            'id': project_id,
+            'area': area,
+            'main_image_url': main_image_url,
+            'main_image_srcset': srcsets.srcset(main_image_url),
+            'photos': photo_urls,
+            'photos_srcset': [srcsets.srcset(url) for url in photo_urls],
+            'is_liked': project_id in liked_ids,
+            'likes_count': likes_count
+        })
+    return projects_data
+
+
+def build_catalog():
+    """ყველა პროექტის სერიალიზაცია - is_liked ყოველთვის False (ანონიმური ხედი)"""
+    return serialize_projects()
+
+
+def build_carousel():
+    """აქტიური კარუსელის ფოტოების სერიალიზაცია რიგითობის მიხედვით"""
+    carousel_images = CarouselImage.query.filter_by(is_active=True).order_by(CarouselImage.order.asc()).all()
+
+    srcsets = SrcsetIndex()
+    images_data = []
+    for image in carousel_images:
+        images_data.append({
+            'id': image.id,
+            'url': image.url,
+            'srcset': srcsets.srcset(image.url),
+            'order': image.order,
+            'is_active': image.is_active,
+            'created_at': image.created_at.isoformat() if image.created_at else None
+        })
+    return images_data
+
+
+# ===== snapshot ფაილის ფორმატი =====
+# header: magic, ვერსია, ვერსიის ფაილის თაობა, ბაზის URL-ის SHA-256, ჩანაწერების რაოდენობა
+# index: თითო ჩანაწერზე (id, დასაწყისი, დასასრული) payload-ში
+# payload: თითოეული ჩანაწერის JSON ბაიტები ერთმანეთის მიყოლებით
+SNAPSHOT_MAGIC = b'ARCHSNP2'
+SNAPSHOT_HEADER = struct.Struct('<8sQQ32sI')
+SNAPSHOT_INDEX_ENTRY = struct.Struct('<qQQ')
+# snapshot-ის აგება thread-ებს შორის - flock მის თავზე მხოლოდ fcntl-ის არსებობისას ემატება
+_snapshot_lock = threading.RLock()
+
+
+def encode_item(item):
+    """ერთი ჩანაწერის კომპაქტური JSON ბაიტები"""
+    return dumps_bytes(item)
+
+
+class Snapshot:
+    """უცვლელი snapshot - ვერსია, id-ები და თითო ჩანაწერის JSON ბაიტები
+
+    items შეიძლება იყოს mmap-ის memoryview ნაწილები (გაზიარებული ფაილიდან)
+    ან ჩვეულებრივი bytes; data (Python ობიექტები) იქმნება მხოლოდ საჭიროებისას.
+    """
+    __slots__ = ('version', 'ids', 'items', '_data', '_lock')
+
+    def __init__(self, version, ids, items, data=None):
+        self.version = version
+        self.ids = ids
+        self.items = items
+        self._data = data
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_data(cls, version, data):
+        return cls(version, [item['id'] for item in data], [encode_item(item) for item in data], data)
+
+    @property
+    def data(self):
+        """ჩანაწერები Python dict-ებად (გაზიარებული ფაილიდან ერთხელ იპარსება)"""
+        if self._data is None:
+            with self._lock:
+                if self._data is None:
+                    self._data = loads(self.raw_items(0, len(self.items)))
+        return self._data
+
+    def raw_items(self, start, end):
+        """ჩანაწერების JSON მასივი [start:end] - ხელახალი სერიალიზაციის გარეშე"""
+        return b'[' + b','.join(self.items[start:end]) + b']'
+
+    def write(self, path, generation=0, source=b''):
+        """snapshot-ის ატომური ჩაწერა ფაილში (tmp + os.replace)"""
+        index = []
+        offset = 0
+        for item_id, item in zip(self.ids, self.items):
+            index.append(SNAPSHOT_INDEX_ENTRY.pack(item_id, offset, offset + len(item)))
+            offset += len(item)
+
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, self.version, generation, source, len(self.items)))
+            f.write(b''.join(index))
+            f.writelines(self.items)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, version, generation=0, source=b''):
+        """გაზიარებული snapshot-ის mmap; None, თუ ფაილი სხვა ვერსიის/თაობის/ბაზისაა ან არ არსებობს"""
+        try:
+            with open(path, 'rb') as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+
+        view = memoryview(buffer)
+        if len(view) < SNAPSHOT_HEADER.size:
+            return None
+        magic, file_version, file_generation, file_source, count = SNAPSHOT_HEADER.unpack_from(view)
+        if magic != SNAPSHOT_MAGIC or file_version != version or file_generation != generation:
+            return None
+        if file_source != source.ljust(len(file_source), b'\0'):
+            return None
+
+        payload_start = SNAPSHOT_HEADER.size + count * SNAPSHOT_INDEX_ENTRY.size
+        ids = []
+        items = []
+        for item_id, start, end in SNAPSHOT_INDEX_ENTRY.iter_unpack(view[SNAPSHOT_HEADER.size:payload_start]):
+            ids.append(item_id)
+            items.append(view[payload_start + start:payload_start + end])
+        return cls(version, ids, items)
+
+
+def new_generation():
+    return int.from_bytes(os.urandom(8), 'little') >> 1
+
+
+class DataVersion:
+    """მონაცემების ვერსიის ნომერი საერთო ფაილში (<NAME>_VERSION_FILE)
+
+    ვერსია ინახება პატარა ფაილში, რათა ყველა gunicorn worker-მა დაინახოს
+    ცვლილება. ფაილის შემოწმება არის ერთი os.stat და არა SQL მოთხოვნა.
+    ფაილში ვერსიასთან ერთად ინახება თაობა - შემთხვევითი რიცხვი, რომელიც
+    ფაილთან ერთად იქმნება: წაშლილი/ახალი ფაილის ვერსია ძველ snapshot-ს არ
+    დაემთხვევა. ფაილის გარეშე (None) ვერსია მხოლოდ ამ პროცესშია (ტესტები).
+    """
+
+    def __init__(self, name, app=None):
+        self.name = name
+        self.version_file = None
+        self._version_state = (None, 0, new_generation())  # (ფაილის stat გასაღები, ვერსია, თაობა)
+        self._bump_lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.version_file = app.config[f'{self.name.upper()}_VERSION_FILE']
+        if self.version_file:
+            os.makedirs(os.path.dirname(self.version_file), exist_ok=True)
+        app.extensions[f'{self.name}_version'] = self
+
+    def _read(self):
+        """(ვერსია, თაობა) - ფაილი ხელახლა იკითხება მხოლოდ შეცვლისას; None, თუ ფაილი არ არსებობს"""
+        if not self.version_file:
+            return self._version_state[1:]
+        try:
+            st = os.stat(self.version_file)
+        except FileNotFoundError:
+            return None
+        key = (st.st_ino, st.st_mtime_ns, st.st_size)
+        cached_key, version, generation = self._version_state
+        if key != cached_key:
+            try:
+                with open(self.version_file) as f:
+                    fields = f.read().split()
+                version = int(fields[0]) if fields else 0
+                generation = int(fields[1]) if len(fields) > 1 else 0
+            except (OSError, ValueError):
+                # ფაილი წაკითხვისას შეიცვალა - ძველ ვერსიას ვაბრუნებთ
+                return version, generation
+            self._version_state = (key, version, generation)
+        return version, generation
+
+    def _state(self):
+        state = self._read()
+        if state is None:
+            # ფაილი ჯერ არ არსებობს (ახალი ან აღდგენილი ბაზა) - იქმნება ახალი თაობით
+            self.bump()
+            state = self._read() or self._version_state[1:]
+        return state
+
+    def current_version(self):
+        """მიმდინარე ვერსია"""
+        return self._state()[0]
+
+    @property
+    def generation(self):
+        """ვერსიის ფაილის თაობა (snapshot-ის header-ში)"""
+        return self._state()[1]
+
+    def bump(self):
+        """ვერსიის გაზრდა - იძახება ყოველი ცვლილების commit-ის შემდეგ"""
+        if not self.version_file:
+            with self._bump_lock:
+                _, version, generation = self._version_state
+                version = max(version + 1, time.time_ns())
+                self._version_state = (None, version, generation)
+            return version
+
+        version, generation = self._read() or (0, new_generation())
+        version = max(version + 1, time.time_ns())
+        tmp_path = f'{self.version_file}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(f'{version} {generation}')
+        os.replace(tmp_path, self.version_file)
+        return version
+
+
+class VersionedCache(DataVersion):
+    """მონაცემების ქეში, დაცული ვერსიის ნომრით
+
+    აგებული snapshot ქვეყნდება საერთო ფაილში: ერთ ვერსიაზე მას აგებს მხოლოდ
+    ერთი worker, დანარჩენები კი იმავე ფაილს mmap-ით კითხულობენ.
+    """
+
+    def __init__(self, name, builder, app=None):
+        self.builder = builder
+        self.snapshot_file = None
+        self.source = b''  # ბაზის URL-ის SHA-256 - სხვა ბაზის snapshot არ ჩაიტვირთება
+        self._lock = threading.Lock()
+        self._snapshot = None
+        super().__init__(name, app)
+
+    def init_app(self, app):
+        super().init_app(app)
+        # mmap-ით გახსნილი ფაილის ჩანაცვლება Windows-ზე შეუძლებელია - იქ მხოლოდ პროცესის ქეში
+        if os.name != 'nt':
+            self.snapshot_file = app.config.get(f'{self.name.upper()}_SNAPSHOT_FILE')
+        if self.snapshot_file:
+            os.makedirs(os.path.dirname(self.snapshot_file), exist_ok=True)
+        self.source = hashlib.sha256(str(app.config['SQLALCHEMY_DATABASE_URI']).encode()).digest()
+        app.extensions[f'{self.name}_cache'] = self
+
+    def get(self):
+        """მიმდინარე ვერსიის snapshot-ის დაბრუნება (საჭიროების შემთხვევაში აგება)"""
+        version = self.current_version()
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == version:
+            return snapshot
+
+        with self._lock:
+            # სხვა thread-მა შეიძლება უკვე ააგო, სანამ lock-ს ველოდით
+            version = self.current_version()
+            snapshot = self._snapshot
+            if snapshot is None or snapshot.version != version:
+                snapshot = self._load_or_build(version)
+                self._snapshot = snapshot
+        return snapshot
+
+    def _load_or_build(self, version):
+        """გაზიარებული snapshot-ის ჩატვირთვა ან (თუ ჯერ არავის აუგია) აგება და გამოქვეყნება"""
+        if not self.snapshot_file:
+            return Snapshot.from_data(version, self.builder())
+
+        stamp = (self.generation, self.source)
+        snapshot = Snapshot.load(self.snapshot_file, version, *stamp)
+        if snapshot is not None:
+            return snapshot
+
+        # პროცესებს შორის lock: სხვა worker-ები ელოდებიან და შემდეგ მზა ფაილს კითხულობენ;
+        # fcntl-ის გარეშეც thread-ები ერთმანეთს ელოდებიან (_snapshot_lock)
+        with _snapshot_lock, open(f'{self.snapshot_file}.lock', 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                snapshot = Snapshot.load(self.snapshot_file, version, *stamp)
+                if snapshot is None:
+                    built = Snapshot.from_data(version, self.builder())
+                    built.write(self.snapshot_file, *stamp)
+                    # ამ worker-მაც გაზიარებული ასლი გამოიყენოს - მეხსიერებაში მხოლოდ ერთი ასლი რჩება
+                    snapshot = Snapshot.load(self.snapshot_file, version, *stamp) or built
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+        return snapshot
+
+
+catalog_cache = VersionedCache('catalog', build_catalog)
+carousel_cache = VersionedCache('carousel', build_carousel)
@@ -3,8 +3,21 @@
 # ეს ფაილი შეიცავს ბაზის მართვის ბრძანებებს
 # ტესტირების, მონაცემების შექმნისა და მართვისთვის
 
+import glob
+import hashlib
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import quote
+
+from sqlalchemy import func, select, update
+
 from app import app, db
-from models import Project, Photo, User
+from models import Project, Photo, User, CarouselImage, project_likes
+from catalog import catalog_cache, carousel_cache
+from replicas import REPLICA_BIND
+from images import optimize_image, variant_paths
+from storage import CONTENT_FOLDER, content_location, content_lock, is_content_url
 
 # ===== ტესტირების მონაცემების შექმნა =====
 def create_sample_data():
@@ -54,6 +67,7 @@ def create_sample_data():
                 db.session.add(photo)
         
         db.session.commit()
+        catalog_cache.bump()
         print("Sample data created successfully!")
 
 def show_database_stats():
@@ -78,6 +92,7 @@ def clear_database():
         Photo.query.delete()
         Project.query.delete()
         db.session.commit()
+        catalog_cache.bump()
         print("Database cleared!")
 
 def make_admin(email):
@@ -103,6 +118,269 @@ def list_users():
         else:
             print("No users found in database.")
 
+def verify_likes_count(repair=False):
+    """Compare Project.likes_count with project_likes and optionally repair drift"""
+    with app.app_context():
+        actual_counts = dict(
+            db.session.query(project_likes.c.project_id, func.count(project_likes.c.user_id))
+            .group_by(project_likes.c.project_id)
+            .all()
+        )
+
+        drifted = []
+        for project_id, stored_count in db.session.query(Project.id, Project.likes_count).order_by(Project.id):
+            actual_count = actual_counts.get(project_id, 0)
+            if stored_count != actual_count:
+                drifted.append((project_id, stored_count, actual_count))
+
+        if not drifted:
+            print("likes_count is consistent for all projects.")
+            return
+
+        print(f"Found {len(drifted)} projects with likes_count drift:")
+        for project_id, stored_count, actual_count in drifted:
+            print(f"  - Project {project_id}: stored {stored_count}, actual {actual_count}")
+
+        if not repair:
+            print("Run with --repair to fix the stored counts.")
+            return
+
+        # Recount inside the UPDATE itself so likes made since the check are not lost
+        recount = (
+            select(func.count())
+            .select_from(project_likes)
+            .where(project_likes.c.project_id == Project.id)
+            .scalar_subquery()
+        )
+        drifted_ids = [project_id for project_id, _, _ in drifted]
+        db.session.execute(
+            update(Project)
+            .where(Project.id.in_(drifted_ids))
+            .values(likes_count=recount)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        catalog_cache.bump()
+        print(f"Repaired likes_count for {len(drifted_ids)} projects.")
+
+# ===== სურათების ოპტიმიზაცია =====
+OPTIMIZE_FOLDERS = ('photos', 'uploads')
+OPTIMIZE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+# ფაილები, რომლებზეც კოდი/შაბლონები პირდაპირ მიუთითებს - მათი სახელი არ იცვლება
+SOURCE_PATTERNS = ('*.py', '*.html', 'templates/*.html', 'static/*.js', 'static/*.css')
+IMAGE_URL_COLUMNS = ((Project, Project.main_image_url), (Photo, Photo.url), (CarouselImage, CarouselImage.url))
+
+def iter_optimizable_images(static_folder):
+    """JPEG/PNG ფაილები static/photos-სა და static/uploads-ში (ვარიანტებისა და .staging-ის გარეშე)"""
+    content_root = os.path.join(static_folder, 'uploads', CONTENT_FOLDER)
+    variant_folders = {str(width) for width in app.config['IMAGE_VARIANT_WIDTHS']}
+    for folder in OPTIMIZE_FOLDERS:
+        for root, dirs, files in os.walk(os.path.join(static_folder, folder)):
+            # ვარიანტები (<საქაღალდე>/320/...) მხოლოდ ატვირთვებშია; content/-ის ქვესაქაღალდეები
+            # SHA-256-ის პრეფიქსებია (content/12/) და ციფრებიც რომ იყოს, ვარიანტები არ არიან
+            skip = variant_folders if folder == 'uploads' and root != content_root else ()
+            dirs[:] = sorted(d for d in dirs if not d.startswith('.') and d not in skip)
+            for name in sorted(files):
+                if name.lower().endswith(OPTIMIZE_EXTENSIONS):
+                    yield os.path.join(root, name)
+
+def referenced_in_sources(relative_paths):
+    """რომელ ფაილებს ახსენებს კოდი (JS, CSS, შაბლონები) - მათი ფორმატი არ უნდა შეიცვალოს"""
+    sources = []
+    for pattern in SOURCE_PATTERNS:
+        for path in glob.glob(os.path.join(app.root_path, pattern)):
+            with open(path, encoding='utf-8', errors='ignore') as f:
+                sources.append(f.read())
+    text = '\n'.join(sources)
+    return {
+        relative for relative in relative_paths
+        if relative in text or quote(relative) in text
+    }
+
+def optimized_relative_path(relative, data, extension):
+    """ახალი გზა static-ის მიმართ: საცავში - ახალი SHA-256, სხვაგან - მხოლოდ გაფართოება იცვლება"""
+    if is_content_url(f'static/{relative}'):
+        folder, filename = content_location(hashlib.sha256(data).hexdigest(), f'x.{extension}' if extension else relative)
+        return f'uploads/{folder}/{filename}'
+    if extension:
+        return f'{os.path.splitext(relative)[0]}.{extension}'
+    return relative
+
+def write_file_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def optimize_images(dry_run=False, workers=None):
+    """Recompress bundled and uploaded images in parallel (EXIF stripped, PNG -> WebP when smaller)
+
+    Renamed files (new format or, in content storage, new SHA-256) get their
+    database URLs and variants moved; dry_run only prints the size report.
+    """
+    with app.app_context():
+        static_folder = app.static_folder
+        paths = list(iter_optimizable_images(static_folder))
+        if not paths:
+            print("No images to optimize.")
+            return
+
+        relatives = [os.path.relpath(path, static_folder).replace(os.sep, '/') for path in paths]
+        referenced = referenced_in_sources(relatives)
+
+        # Encoding runs on all cores; files are written here, one at a time
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(optimize_image, path, relative not in referenced)
+                for path, relative in zip(paths, relatives)
+            ]
+        # One unreadable image is reported and left as is instead of aborting the run
+        results = []
+        failures = []
+        for relative, future in zip(relatives, futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(None)
+                failures.append((relative, e))
+
+        total_before = total_after = 0
+        changes = []
+        for path, relative, result in zip(paths, relatives, results):
+            size = os.path.getsize(path)
+            total_before += size
+            if result is None:
+                total_after += size
+                continue
+            data, extension = result
+            new_relative = optimized_relative_path(relative, data, extension)
+            if new_relative != relative and not is_content_url(f'static/{new_relative}') \
+                    and os.path.exists(os.path.join(static_folder, new_relative)):
+                print(f"  - {relative}: skipped, {new_relative} already exists")
+                total_after += size
+                continue
+            total_after += len(data)
+            changes.append((relative, new_relative, data))
+            renamed = f" -> {new_relative}" if new_relative != relative else ''
+            print(f"  - {relative}: {size:,} -> {len(data):,} bytes ({100 - len(data) * 100 // size}% smaller){renamed}")
+
+        saved = total_before - total_after
+        print(f"{len(changes)} of {len(paths)} images can be optimized: "
+              f"{total_before:,} -> {total_after:,} bytes ({saved:,} bytes saved)")
+        if failures:
+            print(f"{len(failures)} images could not be processed and were left unchanged:")
+            for relative, error in failures:
+                print(f"  - {relative}: {error}")
+        if dry_run or not changes:
+            return
+
+        # Same lock as uploads and deletes, so no job stores or removes these files meanwhile
+        with content_lock():
+            renamed_urls = {}
+            obsolete_paths = []
+            for relative, new_relative, data in changes:
+                new_path = os.path.join(static_folder, new_relative)
+                if new_relative == relative:
+                    write_file_atomic(new_path, data)
+                    continue
+                if not os.path.exists(new_path):
+                    write_file_atomic(new_path, data)
+                old_url, new_url = f'static/{relative}', f'static/{new_relative}'
+                # Variants keep their pixels; they only follow the new name
+                for old_variant, new_variant in zip(variant_paths(old_url), variant_paths(new_url)):
+                    if os.path.exists(old_variant) and not os.path.exists(new_variant):
+                        os.makedirs(os.path.dirname(new_variant), exist_ok=True)
+                        os.replace(old_variant, new_variant)
+                    elif os.path.exists(old_variant):
+                        obsolete_paths.append(old_variant)
+                renamed_urls[old_url] = new_url
+                obsolete_paths.append(os.path.join(static_folder, relative))
+
+            updated_rows = 0
+            for model, column in IMAGE_URL_COLUMNS:
+                for old_url, new_url in renamed_urls.items():
+                    updated_rows += db.session.execute(
+                        update(model).where(column == old_url).values({column.key: new_url})
+                        .execution_options(synchronize_session=False)
+                    ).rowcount
+            db.session.commit()
+            if updated_rows:
+                catalog_cache.bump()
+                carousel_cache.bump()
+
+            for path in obsolete_paths:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+        print(f"Optimized {len(changes)} images, renamed {len(renamed_urls)}, updated {updated_rows} database URLs.")
+
+# ===== ძველი ატვირთვების წაშლა =====
+def iter_legacy_uploads(upload_folder, variant_folders):
+    """ფაილები static/uploads-ში content/-ის გარეთ (ვარიანტებისა და .staging-ის გარეშე)"""
+    for root, dirs, files in os.walk(upload_folder):
+        dirs[:] = sorted(
+            d for d in dirs
+            if not d.startswith('.') and d not in variant_folders
+            and not (root == upload_folder and d == CONTENT_FOLDER)
+        )
+        for name in sorted(files):
+            if name.rsplit('.', 1)[-1].lower() in app.config['ALLOWED_EXTENSIONS']:
+                yield os.path.join(root, name)
+
+def cleanup_uploads(dry_run=False):
+    """content/-ის გარეთ დარჩენილი ფაილები, რომლებსაც ბაზა აღარ მიმართავს (და მათი ვარიანტები)
+
+    მიგრაცია e4a9d7c21b58 ატვირთვებს საცავში მხოლოდ აკოპირებს - ძველები აქ იშლება,
+    როცა ახალი URL-ები უკვე commit-ებულია.
+    """
+    with app.app_context():
+        upload_folder = app.config['UPLOAD_FOLDER']
+        variant_folders = {str(width) for width in app.config['IMAGE_VARIANT_WIDTHS']}
+        referenced = set()
+        for _, column in IMAGE_URL_COLUMNS:
+            referenced.update(db.session.execute(select(column).where(column.is_not(None))).scalars())
+
+        removed = 0
+        for path in iter_legacy_uploads(upload_folder, variant_folders):
+            url = 'static/uploads/' + os.path.relpath(path, upload_folder).replace(os.sep, '/')
+            if url in referenced:
+                continue
+            for obsolete_path in [path] + [p for p in variant_paths(url) if os.path.isfile(p)]:
+                print(f"{'Would remove' if dry_run else 'Removing'} {os.path.relpath(obsolete_path, app.root_path)}")
+                if not dry_run:
+                    try:
+                        os.remove(obsolete_path)
+                    except FileNotFoundError:
+                        continue
+                removed += 1
+
+        print(f"{'Would remove' if dry_run else 'Removed'} {removed} unreferenced files.")
+
+# ===== replica-ს სინქრონიზაცია (ლოკალური ტესტირება) =====
+def sync_replica():
+    """მთავარი SQLite ბაზის კოპირება replica-ს ფაილში - ორი ფაილით replica-ს "დაწევის" იმიტაცია"""
+    with app.app_context():
+        if REPLICA_BIND not in db.engines:
+            print("REPLICA_DATABASE_URL is not set.")
+            return
+        primary, replica = db.engine.url, db.engines[REPLICA_BIND].url
+        if primary.get_backend_name() != 'sqlite' or replica.get_backend_name() != 'sqlite':
+            print("sync-replica copies SQLite files only; use the database's own replication.")
+            return
+
+        # sqlite3 backup API: replica-ს ღია კავშირები ახალ მონაცემებს მაშინვე ხედავენ
+        source = sqlite3.connect(primary.database)
+        target = sqlite3.connect(replica.database)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
+        print(f"Copied {primary.database} to {replica.database}.")
+
 if __name__ == "__main__":
     import sys
     
@@ -122,8 +400,17 @@ if __name__ == "__main__":
                 make_admin(email)
             else:
                 print("Usage: python db_commands.py make-admin <email>")
+        elif command == "verify-likes":
+            verify_likes_count(repair="--repair" in sys.argv[2:])
+        elif command == "optimize-images":
+            workers = next((int(arg.split("=", 1)[1]) for arg in sys.argv[2:] if arg.startswith("--workers=")), None)
+            optimize_images(dry_run="--dry-run" in sys.argv[2:], workers=workers)
+        elif command == "cleanup-uploads":
+            cleanup_uploads(dry_run="--dry-run" in sys.argv[2:])
+        elif command == "sync-replica":
+            sync_replica()
         else:
-            print("Available commands: create, stats, clear, list-users, make-admin")
+            print("Available commands: create, stats, clear, list-users, make-admin, verify-likes, optimize-images, cleanup-uploads, sync-replica")
     else:
         print("Database Management Commands:")
         print("  python db_commands.py create  - Create sample data")
@@ -131,3 +418,7 @@ if __name__ == "__main__":
         print("  python db_commands.py clear   - Clear all data")
         print("  python db_commands.py list-users - List all users")
         print("  python db_commands.py make-admin <email> - Make user admin")
+        print("  python db_commands.py verify-likes [--repair] - Check/repair Project.likes_count drift")
+        print("  python db_commands.py optimize-images [--dry-run] [--workers=N] - Recompress images in static/photos and static/uploads")
+        print("  python db_commands.py cleanup-uploads [--dry-run] - Remove uploads outside content/ that no row references")
+        print("  python db_commands.py sync-replica - Copy the SQLite database to the SQLite replica (local testing)")
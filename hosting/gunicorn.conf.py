@@ -34,9 +34,33 @@ chdir = str(project_root)
 preload_app = True
 
 def post_fork(server, worker):
+    # With preload_app the worker inherits the master's engine together with any
+    # pooled connections opened while loading the app. Sharing those sockets
+    # between processes corrupts the protocol stream, so drop them without
+    # closing (close=False leaves the master's connections intact) and let the
+    # worker open its own.
+    from app import app
+    from extensions import db
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
     server.log.info("Worker spawned (pid: %s)", worker.pid)
 
 def on_starting(server):
     server.log.info("Starting Gunicorn with config %s", __file__)
 
+def when_ready(server):
+    # Pool sizing is derived from GUNICORN_THREADS (config.engine_options);
+    # the total must stay below the database's connection limit
+    from app import app
+    options = app.config.get("SQLALCHEMY_ENGINE_OPTIONS") or {}
+    if "pool_size" in options:
+        per_worker = options["pool_size"] + options["max_overflow"]
+        server.log.info(
+            "Database pool: %s + %s overflow per worker, up to %s connections",
+            options["pool_size"], options["max_overflow"], per_worker * server.num_workers,
+        )
+        if app.config.get("SQLALCHEMY_BINDS"):
+            server.log.info("Read replica: up to %s more connections", per_worker * server.num_workers)
+
 
@@ -18,3 +18,8 @@ os.environ.setdefault("FLASK_ENV", "production")
 
 # Expose WSGI callable named 'application' for Passenger
 from app import app as application
+
+# Compile all templates up front: with gunicorn preload_app the workers inherit
+# them from the master instead of compiling on their first requests
+from pagecache import warm_templates
+warm_templates(application)
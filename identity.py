@@ -0,0 +1,82 @@
+# ===== ARCHUB - მომხმარებლის ჩატვირთვის ქეში =====
+# ეს ფაილი შეიცავს Flask-Login-ის load_user-ის ქეშს
+# სესიიანი მოთხოვნა მომხმარებელს ბაზიდან აღარ კითხულობს: ჩანაწერი worker-ის
+# მეხსიერებაშია IDENTITY_CACHE_TTL წამი და უქმდება users ვერსიის შეცვლისას
+# (User-ის ნებისმიერი ჩაწერა - make_admin, პაროლის შეცვლა, რეგისტრაცია)
+
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy.orm import make_transient_to_detached
+
+from extensions import db
+from models import User
+from pagecache import users_version
+
+
+class IdentityCache:
+    """User ჩანაწერების LRU ქეში (IDENTITY_CACHE_SIZE, IDENTITY_CACHE_TTL)
+
+    ინახება სესიისგან მოწყვეტილი (detached) ასლი; თითო მოთხოვნაზე ის
+    session.merge(load=False)-ით ერთვება მიმდინარე სესიას SQL-ის გარეშე,
+    ამიტომ მოთხოვნაში მომხმარებლის შეცვლა ქეშირებულ ასლს არ ეხება.
+    """
+
+    def __init__(self, app=None):
+        self.max_size = 10000
+        self.ttl = 60
+        self._entries = OrderedDict()  # user_id -> (users ვერსია, ვადა, detached User)
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.max_size = app.config['IDENTITY_CACHE_SIZE']
+        self.ttl = app.config['IDENTITY_CACHE_TTL']
+        app.extensions['identity_cache'] = self
+
+    def peek(self, user_id):
+        """ქეშირებული (detached) მომხმარებელი ან None - ბაზას არ მიმართავს"""
+        version = users_version.current_version()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            if entry[0] != version or entry[1] < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return entry[2]
+
+    def get(self, user_id):
+        """მომხმარებელი მიმდინარე სესიაში (load_user) - ბაზიდან მხოლოდ ქეშის გარეშე"""
+        cached = self.peek(user_id)
+        if cached is not None:
+            return db.session.merge(cached, load=False)
+
+        # ვერსია იკითხება მოთხოვნამდე: შუაში მომხდარი ცვლილება ჩანაწერს მაინც გააუქმებს
+        version = users_version.current_version()
+        user = db.session.get(User, user_id)
+        if user is None or not self.max_size:
+            return user
+
+        detached = User(**{attr.key: getattr(user, attr.key) for attr in User.__mapper__.column_attrs})
+        make_transient_to_detached(detached)
+        with self._lock:
+            self._entries[user_id] = (version, time.monotonic() + self.ttl, detached)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return user
+
+    def invalidate(self, user_id=None):
+        """ერთი მომხმარებლის (ან ყველას) წაშლა ამ worker-ის ქეშიდან"""
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_id, None)
+
+
+identity_cache = IdentityCache()
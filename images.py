@@ -0,0 +1,246 @@
+# ===== ARCHUB - სურათების ვარიანტები =====
+# ეს ფაილი შეიცავს ატვირთული სურათების შემცირებული ასლების (ვარიანტების) შექმნას
+# თითო სიგანეზე იქმნება WebP და JPEG ვერსია: static/uploads/<folder>/<width>/<name>.<ext>
+# API-ები აბრუნებენ srcset-ისთვის მზა სტრიქონებს: {'webp': 'url 320w, ...', 'jpeg': ...}
+
+import io
+import os
+
+from flask import current_app
+from PIL import Image, ImageOps
+
+# (srcset-ის გასაღები, Pillow-ის ფორმატი, ფაილის გაფართოება)
+VARIANT_FORMATS = (
+    ('webp', 'WEBP', 'webp'),
+    ('jpeg', 'JPEG', 'jpg'),
+)
+
+UPLOADS_PREFIX = 'static/uploads/'
+
+EXIF_ORIENTATION_TAG = 0x0112
+# ხარისხი JPEG-ისთვის, რომლის პიქსელებიც EXIF ორიენტაციის გამო ბრუნდება ('keep' მაშინ შეუძლებელია)
+JPEG_REENCODE_QUALITY = 92
+# optimize_image: უფრო მცირე მოგებისთვის ფაილი არ გადაიწერება (განმეორებით გაშვებაზე ცვლილება არ ხდება)
+OPTIMIZE_MIN_SAVING = 0.02
+
+
+def split_upload_url(image_url):
+    """'static/uploads/main/x.png' -> ('main', 'x'); None, თუ URL ატვირთვებს არ ეკუთვნის"""
+    normalized = (image_url or '').replace('\\', '/').lstrip('/')
+    if not normalized.startswith(UPLOADS_PREFIX):
+        return None
+    folder, _, filename = normalized[len(UPLOADS_PREFIX):].rpartition('/')
+    if not filename or '..' in folder.split('/'):
+        return None
+    return folder.strip('/'), os.path.splitext(filename)[0]
+
+
+def variant_url(folder, stem, width, extension):
+    """ვარიანტის URL - იწყება '/'-ით, რათა ნებისმიერი გვერდიდან სწორად გაიხსნას"""
+    subfolder = f'{folder}/{width}' if folder else str(width)
+    return f'/{UPLOADS_PREFIX}{subfolder}/{stem}.{extension}'
+
+
+def variant_paths(image_url):
+    """სურათის ყველა შესაძლო ვარიანტის აბსოლუტური გზა (წაშლისთვის)"""
+    parts = split_upload_url(image_url)
+    if parts is None:
+        return []
+    folder, stem = parts
+    upload_folder = current_app.config['UPLOAD_FOLDER']
+    return [
+        os.path.join(upload_folder, folder, str(width), f'{stem}.{extension}')
+        for width in current_app.config['IMAGE_VARIANT_WIDTHS']
+        for _, _, extension in VARIANT_FORMATS
+    ]
+
+
+def create_variants(source_path, image_url):
+    """ვარიანტების შექმნა ატვირთული ფაილიდან - აბრუნებს შექმნილი ფაილების გზებს"""
+    return render_variants(
+        source_path, image_url,
+        current_app.config['UPLOAD_FOLDER'],
+        current_app.config['IMAGE_VARIANT_WIDTHS'],
+        current_app.config['IMAGE_VARIANT_QUALITY']
+    )
+
+
+def render_variants(source_path, image_url, upload_folder, widths, quality, missing_only=False):
+    """ვარიანტების შექმნა აპლიკაციის კონტექსტის გარეშე (გამოიყენება ფონურ პროცესებშიც)
+
+    ორიგინალზე დიდი სიგანეები გამოტოვებულია (გადიდება არ ხდება); EXIF
+    ორიენტაცია გამოიყენება და მეტამონაცემები ვარიანტებში აღარ ინახება.
+    missing_only - მხოლოდ დისკზე არარსებული ვარიანტები (სრული ნაკრებისას სურათი არ იშიფრება).
+    """
+    parts = split_upload_url(image_url)
+    if parts is None:
+        return []
+    folder, stem = parts
+
+    created = []
+    with Image.open(source_path) as img:
+        # სიგანე EXIF შემობრუნების შემდეგ (5-8 ორიენტაციაზე სიგანე და სიმაღლე იცვლება)
+        rotated = img.getexif().get(EXIF_ORIENTATION_TAG, 1) in (5, 6, 7, 8)
+        source_width = img.height if rotated else img.width
+        pending = [width for width in sorted(widths, reverse=True) if width <= source_width]
+        if missing_only:
+            pending = [
+                width for width in pending
+                if not all(
+                    os.path.exists(os.path.join(upload_folder, folder, str(width), f'{stem}.{extension}'))
+                    for _, _, extension in VARIANT_FORMATS
+                )
+            ]
+        if not pending:
+            return created
+
+        img = ImageOps.exif_transpose(img)
+        has_alpha = img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info)
+        img = img.convert('RGBA' if has_alpha else 'RGB')
+
+        for width in pending:
+            height = max(1, round(img.height * width / img.width))
+            resized = img.resize((width, height), Image.LANCZOS)
+            # შემდეგი (უფრო პატარა) ზომა იქმნება უკვე შემცირებულიდან - უფრო სწრაფია
+            img = resized
+
+            width_folder = os.path.join(upload_folder, folder, str(width))
+            os.makedirs(width_folder, exist_ok=True)
+            for _, pillow_format, extension in VARIANT_FORMATS:
+                target = resized
+                if pillow_format == 'JPEG' and has_alpha:
+                    # JPEG-ს გამჭვირვალობა არ აქვს - თეთრ ფონზე დადება
+                    target = Image.new('RGB', resized.size, (255, 255, 255))
+                    target.paste(resized, mask=resized.getchannel('A'))
+                path = os.path.join(width_folder, f'{stem}.{extension}')
+                target.save(path, pillow_format, quality=quality, optimize=pillow_format == 'JPEG')
+                created.append(path)
+    return created
+
+
+def process_upload(staging_path, target_path, image_url, upload_folder, widths, quality):
+    """დროებით შენახული ატვირთვის დამუშავება (ფონურ პროცესში)
+
+    Pillow-ით შემოწმება და ვარიანტების შექმნა; არასწორ სურათზე დროებითი ფაილი
+    იშლება და ValueError ისვრის. ფაილი .staging-ში რჩება - საცავში მას
+    jobs.py გადაიტანს lock-ით. target_path შიგთავსის SHA-256-ით არის დასახელებული,
+    ამიტომ თუ ის უკვე არსებობს (იგივე ფაილი ადრე აიტვირთა ან დავალება თავიდან
+    ეშვება), შემოწმება აღარ გვჭირდება და იქმნება მხოლოდ დაკარგული ვარიანტები.
+    """
+    if os.path.exists(target_path):
+        source_path = staging_path if os.path.exists(staging_path) else target_path
+        try:
+            render_variants(source_path, image_url, upload_folder, widths, quality, missing_only=True)
+        except Exception as e:
+            print(f"Error creating image variants for {image_url}: {e}")
+        return image_url
+    if not os.path.exists(staging_path):
+        raise ValueError('Uploaded file is missing')
+
+    try:
+        with Image.open(staging_path) as img:
+            img.verify()
+    except Exception:
+        os.remove(staging_path)
+        raise ValueError('Invalid image file format')
+
+    try:
+        render_variants(staging_path, image_url, upload_folder, widths, quality)
+    except Exception as e:
+        # ვარიანტების გარეშეც სურათი გამოსადეგია - კლიენტი ორიგინალს იყენებს
+        print(f"Error creating image variants for {image_url}: {e}")
+    return image_url
+
+
+def _encode(img, pillow_format, **options):
+    buffer = io.BytesIO()
+    img.save(buffer, pillow_format, **options)
+    return buffer.getvalue()
+
+
+def optimize_image(path, allow_webp=True):
+    """ფაილის ხელახალი შეკუმშვა მეტამონაცემების გარეშე (optimize-images ბრძანება, ცალკე პროცესში)
+
+    JPEG ინახება იმავე კვანტიზაციის ცხრილებით (quality='keep' - თითქმის
+    უდანაკარგო), progressive-ად; PNG - optimize-ით ან უდანაკარგო WebP-ად, თუ
+    allow_webp და WebP უფრო პატარაა. აბრუნებს (ბაიტები, ახალი გაფართოება ან
+    None, თუ ფორმატი არ შეიცვალა); None - თუ OPTIMIZE_MIN_SAVING-ით პატარა ფაილი ვერ მივიღეთ.
+    """
+    size = os.path.getsize(path)
+    candidates = []
+    with Image.open(path) as img:
+        icc_profile = img.info.get('icc_profile')
+        if img.format == 'JPEG':
+            options = {'optimize': True, 'progressive': True, 'icc_profile': icc_profile}
+            if img.getexif().get(EXIF_ORIENTATION_TAG, 1) != 1:
+                # EXIF-თან ერთად ორიენტაციაც იკარგება - პიქსელებს ვაბრუნებთ
+                data = _encode(ImageOps.exif_transpose(img), 'JPEG', quality=JPEG_REENCODE_QUALITY, **options)
+            else:
+                data = _encode(img, 'JPEG', quality='keep', subsampling='keep', **options)
+            candidates.append((data, None))
+        elif img.format == 'PNG' and not getattr(img, 'is_animated', False):
+            candidates.append((_encode(img, 'PNG', optimize=True, icc_profile=icc_profile), None))
+            if allow_webp:
+                candidates.append((_encode(img, 'WEBP', lossless=True, quality=100, method=4, icc_profile=icc_profile), 'webp'))
+        else:
+            return None
+
+    data, extension = min(candidates, key=lambda candidate: len(candidate[0]))
+    return (data, extension) if len(data) < size * (1 - OPTIMIZE_MIN_SAVING) else None
+
+
+def delete_variants(image_url):
+    """სურათის ყველა ვარიანტის წაშლა - აბრუნებს წაშლილების რაოდენობას"""
+    deleted = 0
+    for path in variant_paths(image_url):
+        try:
+            os.remove(path)
+            deleted += 1
+        except FileNotFoundError:
+            pass
+    return deleted
+
+
+class SrcsetIndex:
+    """srcset-ების აგება ბევრი სურათისთვის - თითო <folder>/<width> საქაღალდე ერთხელ იკითხება
+
+    ძველ ატვირთვებს (ვარიანტების გარეშე) ცარიელი dict უბრუნდება და კლიენტი
+    ორიგინალს იყენებს.
+    """
+
+    def __init__(self):
+        self.upload_folder = current_app.config['UPLOAD_FOLDER']
+        self.widths = sorted(current_app.config['IMAGE_VARIANT_WIDTHS'])
+        self._listings = {}
+
+    def _files(self, folder, width):
+        key = (folder, width)
+        files = self._listings.get(key)
+        if files is None:
+            try:
+                files = self._listings[key] = set(os.listdir(os.path.join(self.upload_folder, folder, str(width))))
+            except OSError:
+                files = self._listings[key] = set()
+        return files
+
+    def srcset(self, image_url):
+        parts = split_upload_url(image_url)
+        if parts is None:
+            return {}
+        folder, stem = parts
+        srcset = {}
+        for key, _, extension in VARIANT_FORMATS:
+            filename = f'{stem}.{extension}'
+            entries = [
+                f'{variant_url(folder, stem, width, extension)} {width}w'
+                for width in self.widths
+                if filename in self._files(folder, width)
+            ]
+            if entries:
+                srcset[key] = ', '.join(entries)
+        return srcset
+
+
+def image_srcset(image_url):
+    """ერთი სურათის srcset-ები ({'webp': ..., 'jpeg': ...})"""
+    return SrcsetIndex().srcset(image_url)
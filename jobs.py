@@ -0,0 +1,261 @@
+# ===== ARCHUB - სურათების დამუშავების რიგი =====
+# ეს ფაილი შეიცავს ატვირთული სურათების ფონურ დამუშავებას
+# request-ი ფაილებს მხოლოდ დროებით საქაღალდეში ინახავს და ქმნის ImageJob ჩანაწერს;
+# Pillow-ით შემოწმება და ვარიანტების შექმნა ხდება ცალკე პროცესებში (process pool),
+# ბაზაში შედეგის ჩაწერა კი - დავალების დასრულების შემდეგ
+
+import atexit
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, or_, select, update
+
+from extensions import db
+from images import process_upload, render_variants
+from models import ImageJob
+from storage import HASH_BLOCK_SIZE, content_location, content_lock
+
+
+class ImageJobQueue:
+    """ლოკალური დავალებების რიგი - დავალებები ბაზაშია, დამუშავება process pool-ში
+
+    თითო worker-ს (gunicorn) აქვს საკუთარი pool, რომელიც პირველი დავალებისას
+    იქმნება. დავალება მხოლოდ ერთმა worker-მა შეიძლება აიღოს (პირობითი UPDATE),
+    ამიტომ გადატვირთვის შემდეგ დარჩენილი დავალებები თავიდან ეშვება.
+    IMAGE_JOB_WORKERS = 0 - დავალება სრულდება იმავე request-ში; მაშინ ფაილები
+    მუშავდება IMAGE_UPLOAD_THREADS ზომის thread pool-ში (Pillow GIL-ს ათავისუფლებს).
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.workers = 0
+        self.upload_threads = 4
+        self.stale_after = timedelta(minutes=10)
+        self._handlers = {}
+        self._lock = threading.Lock()
+        self._pid = None
+        self._processes = None
+        self._runners = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.workers = app.config['IMAGE_JOB_WORKERS']
+        self.upload_threads = app.config['IMAGE_UPLOAD_THREADS']
+        self.stale_after = timedelta(seconds=app.config['IMAGE_JOB_STALE_SECONDS'])
+        app.extensions['image_jobs'] = self
+
+    @property
+    def staging_folder(self):
+        return os.path.join(self.app.config['UPLOAD_FOLDER'], '.staging')
+
+    def handler(self, kind):
+        """დავალების დასრულების ფუნქციის რეგისტრაცია: handler(payload, files) -> result dict"""
+        def decorator(func):
+            self._handlers[kind] = func
+            return func
+        return decorator
+
+    # ----- request-ის მხარე -----
+    def stage(self, file):
+        """ატვირთული ფაილის დროებით შენახვა SHA-256-ის დათვლით - აბრუნებს payload-ის ჩანაწერს"""
+        os.makedirs(self.staging_folder, exist_ok=True)
+        staged_name = f'{uuid.uuid4().hex}.upload'
+        hasher = hashlib.sha256()
+        with open(os.path.join(self.staging_folder, staged_name), 'wb') as f:
+            for block in iter(lambda: file.stream.read(HASH_BLOCK_SIZE), b''):
+                hasher.update(block)
+                f.write(block)
+        return self.staged_entry(staged_name, hasher.hexdigest(), file.filename)
+
+    def staged_entry(self, staged_name, sha256, original_name):
+        """payload-ის ჩანაწერი .staging-ში უკვე არსებული ფაილისთვის (მაგ. ნაწილებად ატვირთული)
+
+        საბოლოო სახელი შიგთავსის SHA-256-ია (storage.py).
+        """
+        folder, filename = content_location(sha256, original_name)
+        return {
+            'staged': staged_name,
+            'folder': folder,
+            'filename': filename,
+            'original_name': original_name,
+            'sha256': sha256
+        }
+
+    def reject(self, file, error):
+        """უარყოფილი ფაილის ჩანაწერი - შედეგში ჩანს, მაგრამ არ მუშავდება"""
+        return {
+            'staged': None,
+            'folder': None,
+            'filename': None,
+            'original_name': file.filename,
+            'error': error
+        }
+
+    def submit(self, kind, files, **params):
+        """დავალების შექმნა და გაშვება - აბრუნებს ImageJob-ს"""
+        job = ImageJob(kind=kind, status='pending', payload=json.dumps(dict(params, files=files)))
+        db.session.add(job)
+        db.session.commit()
+
+        if self.workers:
+            self._ensure_started()
+            self._runners.submit(self._run, job.id)
+        else:
+            self._run(job.id)
+            db.session.refresh(job)
+        return job
+
+    # ----- დამუშავება -----
+    def _ensure_started(self):
+        """pool-ების შექმნა მიმდინარე პროცესში (fork-ის შემდეგაც) და დარჩენილი დავალებების აღდგენა"""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            # spawn: ახალ პროცესს არ გადაყვება worker-ის thread-ები და ბაზის კავშირები
+            self._processes = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context('spawn')
+            )
+            self._runners = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='image-job')
+            self._pid = os.getpid()
+            atexit.register(self._processes.shutdown, wait=False, cancel_futures=True)
+
+        with self.app.app_context():
+            job_ids = db.session.execute(
+                select(ImageJob.id).where(self._claimable()).order_by(ImageJob.id)
+            ).scalars().all()
+        for job_id in job_ids:
+            self._runners.submit(self._run, job_id)
+
+    def _claimable(self):
+        """დავალება, რომელიც ჯერ არავის აუღია ან რომლის დამმუშავებელი აღარ პასუხობს"""
+        return or_(
+            ImageJob.status == 'pending',
+            and_(ImageJob.status == 'running', ImageJob.started_at < datetime.utcnow() - self.stale_after)
+        )
+
+    def _claim(self, job_id):
+        result = db.session.execute(
+            update(ImageJob)
+            .where(ImageJob.id == job_id, self._claimable())
+            .values(status='running', started_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        return result.rowcount == 1
+
+    def _process_files(self, files):
+        """ფაილების პარალელური დამუშავება - თითო ფაილზე {'filename', 'folder', 'url', 'error'}"""
+        if self.workers:
+            return self._collect(files, self._processes)
+        accepted = sum(1 for entry in files if entry.get('staged'))
+        with ThreadPoolExecutor(max_workers=max(1, min(self.upload_threads, accepted)),
+                                thread_name_prefix='image-upload') as executor:
+            return self._collect(files, executor)
+
+    def _collect(self, files, executor):
+        """ყველა ფაილის გაშვება executor-ში და შედეგების შეგროვება ატვირთვის თანმიმდევრობით"""
+        config = self.app.config
+        tasks = []
+        for entry in files:
+            if not entry.get('staged'):
+                tasks.append((entry, None))
+                continue
+            tasks.append((entry, executor.submit(
+                process_upload,
+                os.path.join(self.staging_folder, entry['staged']),
+                os.path.join(config['UPLOAD_FOLDER'], entry['folder'], entry['filename']),
+                f"static/uploads/{entry['folder']}/{entry['filename']}",
+                config['UPLOAD_FOLDER'],
+                tuple(config['IMAGE_VARIANT_WIDTHS']),
+                config['IMAGE_VARIANT_QUALITY']
+            )))
+
+        results = []
+        for entry, future in tasks:
+            result = {'filename': entry['original_name'], 'folder': entry['folder'], 'url': None, 'error': entry.get('error')}
+            if future is not None:
+                try:
+                    result['url'] = future.result()
+                except Exception as e:
+                    result['error'] = str(e)
+            results.append(result)
+        return results
+
+    def _store(self, entries, files):
+        """დამუშავებული ფაილების გადატანა საცავში; უკვე არსებული შიგთავსი აღარ ინახება
+
+        დამუშავებასა და lock-ს შორის პარალელურმა წაშლამ შეიძლება ვარიანტებიც
+        წაშალა - დაკარგულები აქვე, lock-ის ქვეშ, თავიდან იქმნება.
+        """
+        config = self.app.config
+        for entry, result in zip(entries, files):
+            if not result['url']:
+                continue
+            staging_path = os.path.join(self.staging_folder, entry['staged'])
+            target_path = os.path.join(config['UPLOAD_FOLDER'], entry['folder'], entry['filename'])
+            if os.path.exists(target_path):
+                if os.path.exists(staging_path):
+                    os.remove(staging_path)
+            else:
+                os.makedirs(os.path.dirname(target_path), exist_ok=True)
+                os.replace(staging_path, target_path)
+            try:
+                render_variants(
+                    target_path, result['url'], config['UPLOAD_FOLDER'],
+                    config['IMAGE_VARIANT_WIDTHS'], config['IMAGE_VARIANT_QUALITY'], missing_only=True
+                )
+            except Exception as e:
+                print(f"Error creating image variants for {result['url']}: {e}")
+
+    def _run(self, job_id):
+        with self.app.app_context():
+            try:
+                if not self._claim(job_id):
+                    return
+                job = db.session.get(ImageJob, job_id)
+                payload = json.loads(job.payload)
+                entries = payload.pop('files')
+                files = self._process_files(entries)
+                # საცავში გადატანა და handler-ის commit ერთი lock-ით - პარალელური წაშლა
+                # ვერ წაშლის ფაილს, რომელზეც მიმართვა ჯერ არ ჩაწერილა
+                with content_lock():
+                    self._store(entries, files)
+                    result = self._handlers[job.kind](payload, files)
+                job.status = 'done'
+                job.result = json.dumps(result)
+            except Exception as e:
+                db.session.rollback()
+                job = db.session.get(ImageJob, job_id)
+                if job is None:
+                    return
+                job.status = 'failed'
+                job.error = str(e)
+            job.finished_at = datetime.utcnow()
+            db.session.commit()
+
+
+def job_to_dict(job):
+    """ImageJob-ის JSON წარმოდგენა /api/jobs/<id>-ისთვის"""
+    return {
+        'id': job.id,
+        'kind': job.kind,
+        'status': job.status,
+        'result': json.loads(job.result) if job.result else None,
+        'error': job.error,
+        'created_at': job.created_at.isoformat() if job.created_at else None,
+        'started_at': job.started_at.isoformat() if job.started_at else None,
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None
+    }
+
+
+image_jobs = ImageJobQueue()
@@ -0,0 +1,483 @@
+# ===== ARCHUB - მოწონებების ფუნქციები =====
+# ეს ფაილი შეიცავს project_likes-ში ჩაწერის ფუნქციებს და write-behind ბუფერს
+# write-behind რეჟიმში მოწონებები ჯერ ლოკალურ SQLite ჟურნალში იწერება,
+# შემდეგ კი ფონური thread-ი მათ ჯგუფურად გადაიტანს მთავარ ბაზაში
+
+import atexit
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, defaultdict
+
+from flask import has_request_context, session
+from sqlalchemy import delete, event, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from catalog import DataVersion, catalog_cache
+from extensions import db
+from models import Project, project_likes
+
+
+# ===== project_likes-ში ჩაწერა =====
+def insert_ignore(table, **values):
+    """INSERT, რომელიც არსებულ ჩანაწერზე არაფერს აკეთებს (ON CONFLICT DO NOTHING)"""
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        return postgresql_insert(table).values(**values).on_conflict_do_nothing()
+    if dialect == 'sqlite':
+        return sqlite_insert(table).values(**values).on_conflict_do_nothing()
+    return insert(table).values(**values).prefix_with('IGNORE', dialect='mysql')
+
+def write_project_like(project_id, user_id, liked):
+    """project_likes-ში ერთი INSERT ან DELETE - აბრუნებს True-ს, თუ ჩანაწერი შეიცვალა"""
+    if liked:
+        stmt = insert_ignore(project_likes, user_id=user_id, project_id=project_id)
+    else:
+        stmt = delete(project_likes).where(
+            project_likes.c.user_id == user_id,
+            project_likes.c.project_id == project_id
+        )
+    return db.session.execute(stmt).rowcount == 1
+
+def apply_project_like(project_id, user_id, action):
+    """მოწონების ცვლილება ('toggle', 'like', 'unlike') ერთ ტრანზაქციაში
+
+    აბრუნებს (liked, changed, likes_count) ან None-ს, თუ პროექტი არ არსებობს.
+    ერთდროული მოთხოვნები უსაფრთხოა: მრიცხველი იცვლება მხოლოდ მაშინ,
+    როცა INSERT/DELETE-მა მართლა შეცვალა ჩანაწერი.
+    """
+    if action == 'toggle':
+        # ჯერ DELETE: თუ წასაშლელი არაფერი იყო, მოწონება არ არსებობდა
+        liked = not write_project_like(project_id, user_id, liked=False)
+        changed = write_project_like(project_id, user_id, liked=True) if liked else True
+    else:
+        liked = action == 'like'
+        changed = write_project_like(project_id, user_id, liked)
+
+    count_query = select(Project.likes_count).where(Project.id == project_id)
+    if changed:
+        stmt = (
+            update(Project)
+            .where(Project.id == project_id)
+            .values(likes_count=Project.likes_count + (1 if liked else -1))
+            .execution_options(synchronize_session=False)
+        )
+        if db.session.get_bind().dialect.update_returning:
+            # ახალი რაოდენობა UPDATE ... RETURNING-ით - COUNT(*) მოთხოვნის გარეშე
+            likes_count = db.session.execute(stmt.returning(Project.likes_count)).scalar()
+        else:
+            # RETURNING-ის გარეშე (MySQL): იმავე ტრანზაქციაში UPDATE-ის შემდეგ SELECT
+            db.session.execute(stmt)
+            likes_count = db.session.execute(count_query).scalar()
+    else:
+        likes_count = db.session.execute(count_query).scalar()
+
+    if likes_count is None:
+        return None
+    return liked, changed, likes_count
+
+
+# ===== write-behind ბუფერი =====
+class LikeBuffer:
+    """მოწონებების ლოკალური ჟურნალი (SQLite) და ფონური flusher
+
+    ჟურნალში თითო (user_id, project_id) წყვილზე ერთი ჩანაწერია: liked არის
+    სასურველი მდგომარეობა, base_liked - მთავარ ბაზაში არსებული. ამიტომ
+    ერთი და იგივე მომხმარებლის განმეორებითი დაჭერები ერთ ჩანაწერად იკუმშება.
+    ჟურნალი საერთოა ერთ სერვერზე მომუშავე ყველა worker-ისთვის.
+
+    flush ჟურნალს მთავარ ბაზაში ჩაწერისას არ კეტავს: ჩანაწერები ჯერ
+    ინიშნება (claimed_at), შემდეგ გადაიტანება და ბოლოს იშლება მხოლოდ მაშინ,
+    თუ შუაში არ შეცვლილა (seq); შეცვლილს base_liked უახლდება.
+    """
+
+    SCHEMA = (
+        'CREATE TABLE IF NOT EXISTS pending_like ('
+        ' user_id INTEGER NOT NULL,'
+        ' project_id INTEGER NOT NULL,'
+        ' liked INTEGER NOT NULL,'
+        ' base_liked INTEGER NOT NULL,'
+        ' seq INTEGER NOT NULL DEFAULT 0,'
+        ' claimed_at REAL,'
+        ' PRIMARY KEY (user_id, project_id))',
+        'CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)',
+        "INSERT OR IGNORE INTO meta (key, value) VALUES ('revision', 0)",
+    )
+    # ძველი ჟურნალის ფაილებისთვის (სვეტები seq და claimed_at მოგვიანებით დაემატა)
+    ADDED_COLUMNS = (
+        ('seq', 'ALTER TABLE pending_like ADD COLUMN seq INTEGER NOT NULL DEFAULT 0'),
+        ('claimed_at', 'ALTER TABLE pending_like ADD COLUMN claimed_at REAL'),
+    )
+    # ამდენი წამის შემდეგ დაუსრულებელი flush-ის ჩანაწერებს სხვა flusher იღებს
+    CLAIM_TIMEOUT = 60
+
+    def __init__(self, app=None):
+        self.app = None
+        self.enabled = False
+        self.path = None
+        self.flush_interval = 0.5
+        self._local = threading.local()
+        self._flusher_pid = None
+        self._flusher_lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.enabled = app.config['LIKES_WRITE_BEHIND']
+        self.path = app.config['LIKES_JOURNAL_PATH']
+        self.flush_interval = app.config['LIKES_FLUSH_INTERVAL_MS'] / 1000
+        app.extensions['like_buffer'] = self
+        if self.enabled:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = self._connect()
+            for statement in self.SCHEMA:
+                conn.execute(statement)
+            columns = {row[1] for row in conn.execute('PRAGMA table_info(pending_like)')}
+            for column, statement in self.ADDED_COLUMNS:
+                if column not in columns:
+                    conn.execute(statement)
+            conn.close()
+            atexit.register(self._flush_at_exit)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=FULL')
+        return conn
+
+    @property
+    def conn(self):
+        """ჟურნალის კავშირი - თითო thread-ზე ცალკე"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            conn = self._local.conn = self._connect()
+            self._local.pid = os.getpid()
+        return conn
+
+    # ----- ჩაწერა -----
+    def record(self, user_id, project_id, action):
+        """მოწონების განზრახვის ჩაწერა ჟურნალში - აბრუნებს (liked, changed)"""
+        self.ensure_flusher()
+        conn = self.conn
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute(
+                'SELECT liked, base_liked, claimed_at FROM pending_like WHERE user_id = ? AND project_id = ?',
+                (user_id, project_id)
+            ).fetchone()
+            if row is not None:
+                current, base, claimed = bool(row[0]), bool(row[1]), row[2] is not None
+            else:
+                current = base = self._stored_like(user_id, project_id)
+                claimed = False
+
+            liked = {'toggle': not current, 'like': True, 'unlike': False}[action]
+            changed = liked != current
+            if changed:
+                if liked == base and not claimed:
+                    # ისევ ბაზის მდგომარეობას დაუბრუნდა - გადასატანი არაფერია
+                    conn.execute(
+                        'DELETE FROM pending_like WHERE user_id = ? AND project_id = ?',
+                        (user_id, project_id)
+                    )
+                else:
+                    # მიმდინარე flush-ის ჩანაწერი რჩება: seq-ის ცვლილებას flush დაინახავს
+                    conn.execute(
+                        'INSERT INTO pending_like (user_id, project_id, liked, base_liked) VALUES (?, ?, ?, ?) '
+                        'ON CONFLICT (user_id, project_id) DO UPDATE SET liked = excluded.liked, seq = seq + 1',
+                        (user_id, project_id, int(liked), int(base))
+                    )
+                conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'revision'")
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return liked, changed
+
+    def _stored_like(self, user_id, project_id):
+        """მთავარ ბაზაში შენახული მდგომარეობა - ახალი ტრანზაქციით, ჟურნალის lock-ის აღების შემდეგ
+
+        request-ის db.session-ის ღია ტრანზაქცია შეიძლება flush-ის commit-ამდელ
+        მდგომარეობას ხედავდეს; მაშინ toggle არასწორ მიმართულებით წავიდოდა.
+        """
+        with db.engine.connect() as connection:
+            return connection.execute(
+                select(project_likes.c.user_id).where(
+                    project_likes.c.user_id == user_id,
+                    project_likes.c.project_id == project_id
+                )
+            ).first() is not None
+
+    # ----- წაკითხვა (გაერთიანებული ხედი) -----
+    def revision(self):
+        """ჟურნალის რევიზია - იზრდება ყოველი ცვლილებისას (ETag-ისთვის)"""
+        return self.conn.execute("SELECT value FROM meta WHERE key = 'revision'").fetchone()[0]
+
+    def pending_deltas(self):
+        """ჯერ არ გადატანილი likes_count ცვლილებები: {project_id: delta}"""
+        rows = self.conn.execute(
+            'SELECT project_id, SUM(liked - base_liked) FROM pending_like GROUP BY project_id'
+        ).fetchall()
+        return {project_id: delta for project_id, delta in rows if delta}
+
+    def has_pending(self, user_id):
+        """აქვს თუ არა მომხმარებელს ჯერ არ გადატანილი მოწონებები"""
+        return self.conn.execute(
+            'SELECT 1 FROM pending_like WHERE user_id = ? LIMIT 1', (user_id,)
+        ).fetchone() is not None
+
+    def pending_for_user(self, user_id):
+        """მომხმარებლის ჯერ არ გადატანილი მოწონებები: {project_id: liked}"""
+        rows = self.conn.execute(
+            'SELECT project_id, liked FROM pending_like WHERE user_id = ?', (user_id,)
+        ).fetchall()
+        return {project_id: bool(liked) for project_id, liked in rows}
+
+    def overlay(self, projects_data, user_id=None):
+        """სერიალიზებულ პროექტებზე ჟურნალის ცვლილებების დადება (likes_count, is_liked)"""
+        self.ensure_flusher()
+        deltas = self.pending_deltas()
+        pending = self.pending_for_user(user_id) if user_id else {}
+        if not deltas and not pending:
+            return projects_data
+
+        merged = []
+        for project in projects_data:
+            project_id = project['id']
+            if project_id in deltas or project_id in pending:
+                project = dict(project, likes_count=project['likes_count'] + deltas.get(project_id, 0))
+                if project_id in pending:
+                    project['is_liked'] = pending[project_id]
+            merged.append(project)
+        return merged
+
+    # ----- მთავარ ბაზაში გადატანა -----
+    def flush(self):
+        """ჟურნალის ჩანაწერების ჯგუფური გადატანა მთავარ ბაზაში - აბრუნებს რაოდენობას"""
+        conn = self.conn
+        claimed_at = time.time()
+        claimable = 'claimed_at IS NULL OR claimed_at < ?'
+        stale = claimed_at - self.CLAIM_TIMEOUT
+        # ცარიელ ჟურნალზე ჩაწერის lock არ იღება (flusher ყველა worker-ში მუშაობს)
+        if conn.execute(f'SELECT 1 FROM pending_like WHERE {claimable} LIMIT 1', (stale,)).fetchone() is None:
+            return 0
+
+        # 1. ჩანაწერების დანიშვნა - ჟურნალი იკეტება მხოლოდ ამ მოკლე ტრანზაქციაზე
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            rows = conn.execute(
+                f'SELECT user_id, project_id, liked, seq FROM pending_like WHERE {claimable}', (stale,)
+            ).fetchall()
+            conn.executemany(
+                'UPDATE pending_like SET claimed_at = ? WHERE user_id = ? AND project_id = ?',
+                [(claimed_at, user_id, project_id) for user_id, project_id, _, _ in rows]
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        if not rows:
+            return 0
+
+        # 2. მთავარ ბაზაში ჩაწერა - ამ დროს record() სხვა worker-ებში არ იბლოკება
+        try:
+            with self.app.app_context():
+                try:
+                    # წაშლილი პროექტების ჩანაწერებს ვტოვებთ (FK შეცდომა მთელ batch-ს გააჩერებდა)
+                    project_ids = {project_id for _, project_id, _, _ in rows}
+                    existing = set(db.session.execute(
+                        select(Project.id).where(Project.id.in_(project_ids))
+                    ).scalars())
+
+                    # მრიცხველი იცვლება რეალური rowcount-ით, ამიტომ ხელახალი გადატანა უსაფრთხოა
+                    deltas = defaultdict(int)
+                    for user_id, project_id, liked, _ in rows:
+                        if project_id in existing and write_project_like(project_id, user_id, bool(liked)):
+                            deltas[project_id] += 1 if liked else -1
+                    for project_id, delta in deltas.items():
+                        if delta:
+                            db.session.execute(
+                                update(Project)
+                                .where(Project.id == project_id)
+                                .values(likes_count=Project.likes_count + delta)
+                                .execution_options(synchronize_session=False)
+                            )
+                    db.session.commit()
+                except Exception:
+                    db.session.rollback()
+                    raise
+        except Exception:
+            # ჩანაწერები თავისუფლდება - შემდეგი flush მათ თავიდან აიღებს
+            conn.execute('UPDATE pending_like SET claimed_at = NULL WHERE claimed_at = ?', (claimed_at,))
+            raise
+
+        # 3. გადატანილის წაშლა; შუაში შეცვლილ ჩანაწერს ბაზაში უკვე ჩაწერილი liked ხდება base
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            for user_id, project_id, liked, seq in rows:
+                key = (user_id, project_id)
+                if conn.execute('DELETE FROM pending_like WHERE user_id = ? AND project_id = ? AND seq = ?', key + (seq,)).rowcount:
+                    continue
+                conn.execute(
+                    'UPDATE pending_like SET base_liked = ?, claimed_at = NULL WHERE user_id = ? AND project_id = ?',
+                    (liked,) + key
+                )
+                conn.execute(
+                    'DELETE FROM pending_like WHERE user_id = ? AND project_id = ? AND liked = base_liked', key
+                )
+            conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'revision'")
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+        # likes_count შეიცვალა ბაზაში - კატალოგის snapshot უნდა განახლდეს
+        catalog_cache.bump()
+        return len(rows)
+
+    def ensure_flusher(self):
+        """ფონური flusher-ის გაშვება მიმდინარე პროცესში (fork-ის შემდეგაც)"""
+        if self._flusher_pid == os.getpid():
+            return
+        with self._flusher_lock:
+            if self._flusher_pid == os.getpid():
+                return
+            self._flusher_pid = os.getpid()
+            thread = threading.Thread(target=self._run_flusher, name='like-buffer-flusher', daemon=True)
+            thread.start()
+
+    def _run_flusher(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Error flushing like buffer: {e}")
+
+    def _flush_at_exit(self):
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"Error flushing like buffer on exit: {e}")
+
+
+like_buffer = LikeBuffer()
+
+
+# ===== მომხმარებლის მოწონებული id-ების ქეში =====
+# სესიის გასაღები: მომხმარებლის საკუთარი მოწონებების თაობა (ყველა worker-ისთვის)
+LIKES_GENERATION = '_likes_generation'
+# იზრდება მხოლოდ მაშინ, როცა მოწონებები მომხმარებლის გარეშე ქრება (პროექტის წაშლა)
+liked_ids_version = DataVersion('liked_ids')
+
+
+class LikedIdsCache:
+    """მომხმარებლის მოწონებული პროექტების id-ები (LRU, worker-ის მეხსიერებაში)
+
+    ჩანაწერი უქმდება მხოლოდ ამ მომხმარებლისთვის: საკუთარი მოწონება ზრდის
+    სესიაში შენახულ თაობას (changed), ამიტომ სხვა worker-იც ხედავს ცვლილებას.
+    პროექტის წაშლა liked_ids ვერსიას ზრდის; სხვა მოწყობილობიდან მოწონება
+    ჩანს LIKED_IDS_CACHE_TTL წამში.
+    """
+
+    def __init__(self, app=None):
+        self.max_size = 10000
+        self.ttl = 300
+        self._entries = OrderedDict()  # user_id -> ((ვერსია, თაობა), ვადა, frozenset)
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.max_size = app.config['LIKED_IDS_CACHE_SIZE']
+        self.ttl = app.config['LIKED_IDS_CACHE_TTL']
+        app.extensions['liked_ids_cache'] = self
+
+    def get(self, user_id):
+        """მთავარ ბაზაში შენახული მოწონებები (ჟურნალის გარეშე)"""
+        # ვერსია იკითხება მოთხოვნამდე: შუაში მომხდარი ცვლილება ჩანაწერს მაინც გააუქმებს
+        key = (liked_ids_version.current_version(), self._generation())
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] == key and entry[1] > time.monotonic():
+                self._entries.move_to_end(user_id)
+                return entry[2]
+
+        # write-behind: ჟურნალში მომლოდინე მოწონებისას ბაზა flush-ის შემდეგ შეიცვლება - არ ქეშდება
+        cacheable = not (like_buffer.enabled and like_buffer.has_pending(user_id))
+
+        # მთავარი ბაზიდან (replica-დან არა): ინდექსით პატარა მოთხოვნაა და ჩამორჩენილი
+        # replica-ს პასუხი ქეშში თაობის შეცვლამდე დარჩებოდა
+        liked_ids = frozenset(db.session.execute(
+            select(project_likes.c.project_id).where(project_likes.c.user_id == user_id)
+        ).scalars())
+        if not cacheable:
+            return liked_ids
+        with self._lock:
+            self._entries[user_id] = (key, time.monotonic() + self.ttl, liked_ids)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return liked_ids
+
+    def changed(self, user_id):
+        """მომხმარებელმა მოწონება შეცვალა - ამ worker-ში ჩანაწერი იშლება, სხვებში კი თაობა აღარ ემთხვევა"""
+        self.invalidate(user_id)
+        if has_request_context():
+            session[LIKES_GENERATION] = session.get(LIKES_GENERATION, 0) + 1
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    @staticmethod
+    def _generation():
+        return session.get(LIKES_GENERATION, 0) if has_request_context() else 0
+
+
+liked_ids_cache = LikedIdsCache()
+
+
+# პროექტის წაშლისას მისი მოწონებებიც ქრება (cascade) - ყველა მომხმარებლის ჩანაწერი უქმდება
+PROJECTS_DELETED = 'liked_ids_projects_deleted'
+
+
+@event.listens_for(Session, 'after_flush')
+def _track_project_deletes(session, flush_context):
+    if any(isinstance(obj, Project) for obj in session.deleted):
+        session.info[PROJECTS_DELETED] = True
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _track_project_delete_statements(orm_execute_state):
+    # delete(Project) / Query.delete() flush-ს არ გადის
+    if orm_execute_state.is_delete and any(mapper.class_ is Project for mapper in orm_execute_state.all_mappers):
+        orm_execute_state.session.info[PROJECTS_DELETED] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _bump_liked_ids_version(session):
+    if session.info.pop(PROJECTS_DELETED, False):
+        liked_ids_version.bump()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_project_deletes(session):
+    session.info.pop(PROJECTS_DELETED, None)
+
+
+def user_liked_ids(user_id):
+    """მომხმარებლის მოწონებული პროექტების id-ები - ქეში და write-behind ჟურნალი ერთად"""
+    liked_ids = liked_ids_cache.get(user_id)
+    if like_buffer.enabled:
+        pending = like_buffer.pending_for_user(user_id)
+        if pending:
+            liked_ids = frozenset(
+                {project_id for project_id in liked_ids if pending.get(project_id, True)} |
+                {project_id for project_id, liked in pending.items() if liked}
+            )
+    return liked_ids
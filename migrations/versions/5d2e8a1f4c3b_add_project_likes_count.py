@@ -0,0 +1,51 @@
+"""Add denormalized likes_count column to project
+
+Revision ID: 5d2e8a1f4c3b
+Revises: 01418a376da0
+Create Date: 2026-10-18 12:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d2e8a1f4c3b'
+down_revision = '01418a376da0'
+branch_labels = None
+depends_on = None
+
+# backfill-ის ზომა - პროექტები მუშავდება id-ის დიაპაზონებად, თითო დიაპაზონი
+# ცალკე ტრანზაქციაშია, რომ დიდ ცხრილზე ერთმა გრძელმა ტრანზაქციამ არ დაბლოკოს ბაზა
+BACKFILL_CHUNK_SIZE = 500
+
+
+def upgrade():
+    with op.batch_alter_table('project', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('likes_count', sa.Integer(), nullable=False, server_default='0'))
+
+    # არსებული მოწონებების გადათვლა ნაწილ-ნაწილ; autocommit_block ჯერ სვეტის
+    # დამატებას ადასტურებს, შემდეგ კი ყოველი UPDATE თავისთავად commit-დება
+    bind = op.get_bind()
+    project = sa.table('project', sa.column('id', sa.Integer), sa.column('likes_count', sa.Integer))
+    project_likes = sa.table('project_likes', sa.column('project_id', sa.Integer))
+
+    max_id = bind.execute(sa.select(sa.func.max(project.c.id))).scalar() or 0
+    likes_subquery = (
+        sa.select(sa.func.count())
+        .select_from(project_likes)
+        .where(project_likes.c.project_id == project.c.id)
+        .scalar_subquery()
+    )
+    with op.get_context().autocommit_block():
+        for start in range(0, max_id, BACKFILL_CHUNK_SIZE):
+            bind.execute(
+                project.update()
+                .where(project.c.id > start, project.c.id <= start + BACKFILL_CHUNK_SIZE)
+                .values(likes_count=likes_subquery)
+            )
+
+
+def downgrade():
+    with op.batch_alter_table('project', schema=None) as batch_op:
+        batch_op.drop_column('likes_count')
@@ -0,0 +1,31 @@
+"""Add lower(username) and lower(email) indexes for admin user search
+
+Revision ID: b3f6d9e0a4c2
+Revises: e4a9d7c21b58
+Create Date: 2026-10-18 18:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3f6d9e0a4c2'
+down_revision = 'e4a9d7c21b58'
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ('ix_user_username_lower', 'username'),
+    ('ix_user_email_lower', 'email'),
+)
+
+
+def upgrade():
+    for index_name, column_name in INDEXES:
+        op.create_index(index_name, 'user', [sa.text(f'lower({column_name})')], unique=False)
+
+
+def downgrade():
+    for index_name, _ in INDEXES:
+        op.drop_index(index_name, table_name='user')
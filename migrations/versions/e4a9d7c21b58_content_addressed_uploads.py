@@ -0,0 +1,125 @@
+"""Move uploads to content-addressed storage and index image URLs
+
+Revision ID: e4a9d7c21b58
+Revises: 7c41f0b2d9e6
+Create Date: 2026-10-18 15:20:00.000000
+
+"""
+import hashlib
+import os
+import shutil
+
+from alembic import op
+import sqlalchemy as sa
+from flask import current_app
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4a9d7c21b58'
+down_revision = '7c41f0b2d9e6'
+branch_labels = None
+depends_on = None
+
+UPLOADS_PREFIX = 'static/uploads/'
+CONTENT_FOLDER = 'content'
+VARIANT_EXTENSIONS = ('webp', 'jpg')
+EXTENSION_ALIASES = {'jpeg': 'jpg'}
+
+INDEXES = (
+    ('project', 'ix_project_main_image_url', 'main_image_url'),
+    ('photo', 'ix_photo_url', 'url'),
+    ('carousel_image', 'ix_carousel_image_url', 'url'),
+)
+
+
+def upgrade():
+    for table_name, index_name, column_name in INDEXES:
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.create_index(index_name, [column_name], unique=False)
+
+    rehash_uploads()
+
+    # URL-ები შეიცვალა: snapshot-ები ძველ მისამართებს აღარ უნდა ემსახურონ. ვერსია
+    # იზრდება commit-ის შემდეგ, რათა worker-მა ახალი ვერსია ძველი მონაცემებით არ ააგოს
+    with op.get_context().autocommit_block():
+        for name in ('catalog', 'carousel'):
+            cache = current_app.extensions.get(f'{name}_cache')
+            if cache is not None:
+                cache.bump()
+
+
+def downgrade():
+    # ფაილები საცავში რჩება - ბაზის URL-ები მათზე მიუთითებს და ისევ მუშაობს
+    for table_name, index_name, _ in INDEXES:
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.drop_index(index_name)
+
+
+def file_sha256(path):
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(64 * 1024), b''):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+def copy_file(source, target):
+    """ფაილის ასლი საცავში (hard link, თუ შესაძლებელია); არსებული ასლი არ იცვლება"""
+    if os.path.exists(target):
+        return
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+def rehash_uploads():
+    """არსებული ატვირთვების გადატანა static/uploads/content/<2>/<sha256>.<ext>-ში
+
+    ერთნაირი შიგთავსის ფაილები ერთდება. იქმნება მხოლოდ ასლები და ახლდება URL-ები:
+    ძველი ფაილები (და მათი ვარიანტები) რჩება, რათა მიგრაციის rollback-ისას ბაზა
+    არარსებულ ფაილებზე არ მიუთითებდეს. მათ შლის `python db_commands.py cleanup-uploads`.
+    """
+    upload_folder = current_app.config['UPLOAD_FOLDER']
+    widths = current_app.config['IMAGE_VARIANT_WIDTHS']
+    bind = op.get_bind()
+    columns = [
+        sa.table(table_name, sa.column(column_name, sa.String)).c[column_name]
+        for table_name, _, column_name in INDEXES
+    ]
+
+    urls = set()
+    for column in columns:
+        urls.update(bind.execute(sa.select(column).where(column.like(f'{UPLOADS_PREFIX}%'))).scalars())
+
+    moved = {}  # ძველი URL -> ახალი URL
+    for url in sorted(urls):
+        relative = url[len(UPLOADS_PREFIX):]
+        if relative.startswith(f'{CONTENT_FOLDER}/') or '..' in relative.split('/'):
+            continue
+        path = os.path.join(upload_folder, relative)
+        if not os.path.isfile(path):
+            continue
+
+        digest = file_sha256(path)
+        folder, _, filename = relative.rpartition('/')
+        stem, extension = os.path.splitext(filename)
+        extension = extension.lstrip('.').lower()
+        extension = EXTENSION_ALIASES.get(extension, extension)
+        content_folder = f'{CONTENT_FOLDER}/{digest[:2]}'
+        content_name = f'{digest}.{extension}' if extension else digest
+
+        copy_file(path, os.path.join(upload_folder, content_folder, content_name))
+        for width in widths:
+            for variant_extension in VARIANT_EXTENSIONS:
+                variant_path = os.path.join(upload_folder, folder, str(width), f'{stem}.{variant_extension}')
+                if os.path.isfile(variant_path):
+                    copy_file(variant_path, os.path.join(
+                        upload_folder, content_folder, str(width), f'{digest}.{variant_extension}'
+                    ))
+        moved[url] = f'{UPLOADS_PREFIX}{content_folder}/{content_name}'
+
+    for column in columns:
+        for old_url, new_url in moved.items():
+            bind.execute(column.table.update().where(column == old_url).values({column.name: new_url}))
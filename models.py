@@ -27,6 +27,12 @@ class User(UserMixin, db.Model):
     liked_projects = db.relationship('Project', secondary=project_likes, lazy='dynamic',
                                      backref=db.backref('liked_by_users', lazy='dynamic'))
 
+    # ადმინის სიაში ძებნა სახელის/ელ-ფოსტის დასაწყისით (რეგისტრის გარეშე)
+    __table_args__ = (
+        db.Index('ix_user_username_lower', db.func.lower(username)),
+        db.Index('ix_user_email_lower', db.func.lower(email)),
+    )
+
     def set_password(self, password):
         """პაროლის დაშიფვრა და შენახვა"""
         self.password_hash = generate_password_hash(password)
@@ -43,7 +49,9 @@ class Project(db.Model):
     """პროექტის მოდელი - შეიცავს არქიტექტურული პროექტის ინფორმაციას"""
     id = db.Column(db.Integer, primary_key=True)  # უნიკალური ID
     area = db.Column(db.String(100), nullable=False)  # პროექტის ფართობი
-    main_image_url = db.Column(db.String(200), nullable=True, default='')  # მთავარი სურათის URL
+    main_image_url = db.Column(db.String(200), nullable=True, default='', index=True)  # მთავარი სურათის URL
+    # მოწონებების რაოდენობა (დენორმალიზებული) - იცვლება იმავე ტრანზაქციაში, რაც project_likes
+    likes_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     
     # კავშირი Photo მოდელთან (ერთ-მრავალ კავშირი)
     photos = db.relationship('Photo', backref='project', lazy=True, cascade='all, delete-orphan')
@@ -55,7 +63,7 @@ class Project(db.Model):
 class Photo(db.Model):
     """ფოტოს მოდელი - შეიცავს პროექტის ფოტოების ინფორმაციას"""
     id = db.Column(db.Integer, primary_key=True)  # უნიკალური ID
-    url = db.Column(db.String(200), nullable=False)  # ფოტოს URL
+    url = db.Column(db.String(200), nullable=False, index=True)  # ფოტოს URL (ინდექსი - საცავის მიმართვების დათვლა)
     project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=False)  # პროექტის ID
     
     def __repr__(self):
@@ -65,7 +73,7 @@ class Photo(db.Model):
 class CarouselImage(db.Model):
     """კარუსელის ფოტოს მოდელი - შეიცავს მთავარი გვერდის კარუსელის ფოტოების ინფორმაციას"""
     id = db.Column(db.Integer, primary_key=True)  # უნიკალური ID
-    url = db.Column(db.String(200), nullable=False)  # ფოტოს URL
+    url = db.Column(db.String(200), nullable=False, index=True)  # ფოტოს URL (ინდექსი - საცავის მიმართვების დათვლა)
     order = db.Column(db.Integer, default=0)  # ფოტოს რიგითობა კარუსელში
     is_active = db.Column(db.Boolean, default=True)  # არის თუ არა ფოტო აქტიური
     created_at = db.Column(db.DateTime, default=datetime.utcnow)  # შექმნის თარიღი
@@ -83,4 +91,20 @@ class ContactSubmission(db.Model):
     is_read = db.Column(db.Boolean, default=False)
 
     def __repr__(self):
-        return f'<ContactSubmission {self.id} from {self.sender_email}>'
\ No newline at end of file
+        return f'<ContactSubmission {self.id} from {self.sender_email}>'
+
+# ===== სურათების დამუშავების დავალების მოდელი =====
+class ImageJob(db.Model):
+    """ფონური დავალება ატვირთული სურათების დასამუშავებლად (შემოწმება, ვარიანტები)"""
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(32), nullable=False)  # დავალების ტიპი (project, project_photos, ...)
+    status = db.Column(db.String(16), nullable=False, default='pending', index=True)  # pending/running/done/failed
+    payload = db.Column(db.Text, nullable=False)  # ფაილები და პარამეტრები (JSON)
+    result = db.Column(db.Text, nullable=True)  # შედეგი (JSON)
+    error = db.Column(db.Text, nullable=True)  # შეცდომის ტექსტი
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f'<ImageJob {self.id}: {self.kind} {self.status}>'
\ No newline at end of file
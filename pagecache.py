@@ -0,0 +1,135 @@
+# ===== ARCHUB - გვერდების ქეში =====
+# ეს ფაილი შეიცავს დარენდერებული შაბლონების (ფრაგმენტების) LRU ქეშს
+# გასაღები: (შაბლონი, მონაცემების ვერსიები, მომხმარებლის როლი, ...) - ცვლილებისას
+# ვერსია იზრდება და ძველი ჩანაწერი აღარ გამოიყენება, LRU კი მას თავად ამოაგდებს;
+# users ვერსია იზრდება ავტომატურად User-ის ყოველი ჩაწერის commit-ზე (SQLAlchemy events)
+
+import os
+import threading
+from collections import OrderedDict
+from itertools import chain
+
+from flask import current_app
+from flask_login import current_user
+from jinja2 import FileSystemBytecodeCache
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from catalog import DataVersion
+from models import User
+
+users_version = DataVersion('users')
+
+
+class FragmentCache:
+    """დარენდერებული HTML-ის LRU ქეში (თითო worker-ში, FRAGMENT_CACHE_SIZE ჩანაწერი)
+
+    ქეში მხოლოდ ვერსიებს ენდობა: სხვა worker-ში მომხდარი ცვლილება ჩანს
+    ვერსიის ფაილით, invalidate() კი ამ worker-ის ჩანაწერებს მაშინვე შლის.
+    """
+
+    def __init__(self, app=None):
+        self.max_entries = 256
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.max_entries = app.config['FRAGMENT_CACHE_SIZE']
+        app.extensions['fragment_cache'] = self
+
+    def get_or_render(self, key, render):
+        """ქეშირებული HTML ან render()-ის შედეგი (რომელიც ქეშში ინახება)"""
+        with self._lock:
+            html = self._entries.get(key)
+            if html is not None:
+                self._entries.move_to_end(key)
+                return html
+
+        html = render()
+        if self.max_entries:
+            with self._lock:
+                self._entries[key] = html
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return html
+
+    @staticmethod
+    def key(template, versions, role=None, vary=()):
+        """ქეშის გასაღები - versions: {'users': ვერსია, ...} ყველა მონაცემისთვის, რომელსაც შაბლონი აჩვენებს
+
+        asset_url()-ის შედეგები (static/dist/manifest.json) გასაღებში ყოველთვის შედის.
+        """
+        manifest = current_app.extensions.get('asset_manifest')
+        assets = manifest.version() if manifest is not None else ()
+        return (template, tuple(sorted(versions.items())), role or user_role(), tuple(vary), assets)
+
+    def invalidate(self, data=None):
+        """ჩანაწერების წაშლა, რომლებიც data-ზეა დამოკიდებული (None - ყველა)"""
+        with self._lock:
+            if data is None:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if data in dict(key[1])]:
+                del self._entries[key]
+
+
+def user_role():
+    """როლი ქეშის გასაღებისთვის: 'admin', 'user' ან 'anonymous'"""
+    if not current_user.is_authenticated:
+        return 'anonymous'
+    return 'admin' if current_user.is_admin else 'user'
+
+
+# ===== მოდელების ჩაწერის hook-ები =====
+USERS_CHANGED = 'users_changed'
+
+
+def _touches_users(mappers):
+    return any(mapper.class_ is User for mapper in mappers)
+
+
+@event.listens_for(Session, 'after_flush')
+def _track_user_changes(session, flush_context):
+    if any(isinstance(obj, User) for obj in chain(session.new, session.dirty, session.deleted)):
+        session.info[USERS_CHANGED] = True
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _track_user_statements(orm_execute_state):
+    # update(User)/delete(User) ბრძანებები flush-ს არ გადიან
+    if not orm_execute_state.is_select and _touches_users(orm_execute_state.all_mappers):
+        orm_execute_state.session.info[USERS_CHANGED] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _bump_users_version(session):
+    if session.info.pop(USERS_CHANGED, False):
+        users_version.bump()
+        fragment_cache.invalidate('users')
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_user_changes(session):
+    session.info.pop(USERS_CHANGED, None)
+
+
+# ===== Jinja bytecode ქეში =====
+def init_bytecode_cache(app):
+    """კომპილირებული შაბლონები ინახება JINJA_BYTECODE_CACHE_DIR-ში - ახალი worker-ი მათ აღარ აკომპილირებს"""
+    directory = app.config.get('JINJA_BYTECODE_CACHE_DIR')
+    if not directory:
+        return
+    os.makedirs(directory, exist_ok=True)
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(directory)
+
+
+def warm_templates(app):
+    """ყველა შაბლონის ჩატვირთვა (gunicorn preload_app - worker-ები მათ fork-ით იღებენ)"""
+    for name in app.jinja_env.list_templates(extensions=['html']):
+        app.jinja_env.get_template(name)
+
+
+fragment_cache = FragmentCache()
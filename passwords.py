@@ -0,0 +1,112 @@
+# ===== ARCHUB - პაროლების ჰეშირება =====
+# ეს ფაილი შეიცავს პაროლების ჰეშირებას ცალკე პროცესებში (process pool)
+# PBKDF2/scrypt CPU-ს მძიმე სამუშაოა და GIL-ს იკავებს - request-ის thread-ში
+# შესრულებისას login-ების ტალღა /api/projects-საც ანელებს. რიგი შეზღუდულია:
+# PASSWORD_HASH_QUEUE_LIMIT-ზე მეტი მოთხოვნისას PasswordHasherBusy (503) ისვრის
+
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+class PasswordHasherBusy(Exception):
+    """ჰეშირების რიგი სავსეა - კლიენტმა მოგვიანებით უნდა სცადოს"""
+
+
+def hash_password(password, method):
+    return generate_password_hash(password, method=method)
+
+
+def verify_password(password_hash, password, method):
+    """პაროლის შემოწმება - აბრუნებს (სწორია, ახალი ჰეში ან None)
+
+    თუ ჰეში ძველი პარამეტრებითაა (method განსხვავდება), იმავე პროცესში
+    ახალი ჰეშიც იქმნება, რათა login-მა ის შეუმჩნევლად განაახლოს.
+    """
+    if not check_password_hash(password_hash, password):
+        return False, None
+    if needs_rehash(password_hash, method):
+        return True, generate_password_hash(password, method=method)
+    return True, None
+
+
+def needs_rehash(password_hash, method):
+    """ჰეში შექმნილია სხვა მეთოდით/პარამეტრებით ('pbkdf2:sha256:600000$...')"""
+    return password_hash.split('$', 1)[0] != method
+
+
+class PasswordHasher:
+    """პაროლების ჰეშირება ცალკე პროცესებში, შეზღუდული რიგით
+
+    თითო worker-ს (gunicorn) აქვს საკუთარი pool PASSWORD_HASH_WORKERS
+    პროცესით, რომელიც პირველი მოთხოვნისას იქმნება. request-ის thread-ი
+    შედეგს ელოდება GIL-ის დაკავების გარეშე. PASSWORD_HASH_WORKERS = 0 -
+    ჰეშირება ხდება იმავე thread-ში (ტესტები, ერთპროცესიანი გაშვება).
+    """
+
+    def __init__(self, app=None):
+        self.workers = 1
+        self.queue_limit = 8
+        self.method = 'pbkdf2:sha256:600000'
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._pid = None
+        self._pool = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.workers = app.config['PASSWORD_HASH_WORKERS']
+        self.queue_limit = app.config['PASSWORD_HASH_QUEUE_LIMIT']
+        self.method = app.config['PASSWORD_HASH_METHOD']
+        app.extensions['password_hasher'] = self
+
+    def hash(self, password):
+        return self._call(hash_password, password, self.method)
+
+    def verify(self, password_hash, password):
+        """(სწორია, ახალი ჰეში ან None) - იხ. verify_password"""
+        return self._call(verify_password, password_hash, password, self.method)
+
+    def _ensure_started(self):
+        """pool-ის შექმნა მიმდინარე პროცესში (fork-ის შემდეგაც)"""
+        if self._pid == os.getpid():
+            return self._pool
+        with self._lock:
+            if self._pid != os.getpid():
+                # spawn: ახალ პროცესს არ გადაყვება worker-ის thread-ები და ბაზის კავშირები
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context('spawn')
+                )
+                self._pid = os.getpid()
+                atexit.register(self._pool.shutdown, wait=False, cancel_futures=True)
+        return self._pool
+
+    def _call(self, func, *args):
+        with self._lock:
+            if self._pending >= self.queue_limit:
+                raise PasswordHasherBusy('Password hashing queue is full')
+            self._pending += 1
+        try:
+            if not self.workers:
+                return func(*args)
+            pool = self._ensure_started()
+            try:
+                return pool.submit(func, *args).result()
+            except BrokenProcessPool:
+                # პროცესი მოკვდა (მაგ. OOM) - შემდეგი მოთხოვნა ახალ pool-ს შექმნის
+                with self._lock:
+                    if self._pool is pool:
+                        self._pid = None
+                raise PasswordHasherBusy('Password hashing pool restarted')
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+
+password_hasher = PasswordHasher()
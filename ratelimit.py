@@ -0,0 +1,99 @@
+# ===== ARCHUB - rate limit-ის საერთო საცავი =====
+# ეს ფაილი შეიცავს Flask-Limiter-ის (limits) საცავს SQLite ფაილში
+# ყველა gunicorn worker-ი ერთ მრიცხველებს იყენებს: RATELIMIT_STORAGE_URI=sqlite:///<გზა>
+# (sqlite:////abs/path.db - აბსოლუტური გზა). მრიცხველი - ერთი UPSERT ... RETURNING
+
+import os
+import sqlite3
+import threading
+import time
+
+from limits.storage import Storage
+
+# ყოველი ამდენი incr-ის შემდეგ ვადაგასული მრიცხველები იშლება
+PURGE_EVERY = 1000
+
+
+class SQLiteStorage(Storage):
+    """ფიქსირებული ფანჯრის (fixed-window) მრიცხველები SQLite-ში
+
+    WAL რეჟიმი და synchronous=OFF: მრიცხველების დაკარგვა სერვერის ავარიისას
+    დასაშვებია, სამაგიეროდ ერთი incr რამდენიმე ათეული მიკროწამია.
+    """
+
+    STORAGE_SCHEME = ['sqlite']
+
+    def __init__(self, uri, wrap_exceptions=False, **options):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        self.path = uri.split('://', 1)[1][1:] or ':memory:'
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._local = threading.local()
+        self._calls = 0
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=OFF')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS counters ('
+            'key TEXT PRIMARY KEY, count INTEGER NOT NULL, expires_at REAL NOT NULL'
+            ') WITHOUT ROWID'
+        )
+        return conn
+
+    @property
+    def conn(self):
+        """კავშირი - თითო thread-ზე ცალკე (fork-ის შემდეგ ხელახლა)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            conn = self._local.conn = self._connect()
+            self._local.pid = os.getpid()
+        return conn
+
+    def incr(self, key, expiry, amount=1):
+        now = time.time()
+        # ვადაგასული ფანჯარა იწყება თავიდან - ისევე, როგორც limits-ის MemoryStorage-ში
+        count = self.conn.execute(
+            'INSERT INTO counters (key, count, expires_at) VALUES (?1, ?2, ?3) '
+            'ON CONFLICT (key) DO UPDATE SET '
+            'count = CASE WHEN expires_at <= ?4 THEN ?2 ELSE count + ?2 END, '
+            'expires_at = CASE WHEN expires_at <= ?4 THEN ?3 ELSE expires_at END '
+            'RETURNING count',
+            (key, amount, now + expiry, now)
+        ).fetchone()[0]
+
+        self._calls += 1
+        if self._calls % PURGE_EVERY == 0:
+            self.conn.execute('DELETE FROM counters WHERE expires_at <= ?', (now,))
+        return count
+
+    def get(self, key):
+        row = self.conn.execute(
+            'SELECT count FROM counters WHERE key = ? AND expires_at > ?', (key, time.time())
+        ).fetchone()
+        return row[0] if row else 0
+
+    def get_expiry(self, key):
+        now = time.time()
+        row = self.conn.execute(
+            'SELECT expires_at FROM counters WHERE key = ? AND expires_at > ?', (key, now)
+        ).fetchone()
+        return row[0] if row else now
+
+    def check(self):
+        try:
+            self.conn.execute('SELECT 1').fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self):
+        return self.conn.execute('DELETE FROM counters').rowcount
+
+    def clear(self, key):
+        self.conn.execute('DELETE FROM counters WHERE key = ?', (key,))
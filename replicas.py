@@ -0,0 +1,62 @@
+# ===== ARCHUB - read replica-ს მარშრუტიზაცია =====
+# ეს ფაილი შეიცავს read-only endpoint-ების სესიას replica ბაზაზე
+# (SQLALCHEMY_BINDS['replica'], REPLICA_DATABASE_URL). ჩაწერა ყოველთვის db.session-ით
+# მთავარ ბაზაში ხდება. მოწონების შემდეგ მომხმარებელი REPLICA_READ_YOUR_WRITES_SECONDS
+# წამი მთავარ ბაზას კითხულობს, რათა replica-ს დაგვიანებამ მისი ცვლილება არ დამალოს
+
+import time
+
+from flask import g, has_request_context, session
+from sqlalchemy.orm import Session
+
+from extensions import db
+
+REPLICA_BIND = 'replica'
+# Flask-ის სესიაში (cookie) - ვადა, რომლამდეც მომხმარებელი მთავარ ბაზას კითხულობს
+READ_PRIMARY_UNTIL = 'read_primary_until'
+
+
+class ReplicaRouter:
+    """კითხვის სესია: replica, ან db.session (replica-ს გარეშე და read-your-writes ფანჯარაში)
+
+    replica-ს სესია იქმნება მოთხოვნაზე ერთხელ და იხურება app context-ის
+    დასრულებისას. ის მხოლოდ კითხვისთვისაა - commit არასდროს კეთდება.
+    """
+
+    def __init__(self, app=None):
+        self.window = 5
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.window = app.config['REPLICA_READ_YOUR_WRITES_SECONDS']
+        app.extensions['replica_router'] = self
+        app.teardown_appcontext(self._close_session)
+
+    @property
+    def enabled(self):
+        return REPLICA_BIND in db.engines
+
+    def read_session(self):
+        if not has_request_context() or not self.enabled or self.reads_own_writes():
+            return db.session
+        read_session = g.get('replica_session')
+        if read_session is None:
+            read_session = g.replica_session = Session(bind=db.engines[REPLICA_BIND], autoflush=False)
+        return read_session
+
+    def mark_write(self):
+        """მომხმარებლის ჩაწერის შემდეგ - მისი მომდევნო კითხვები მთავარ ბაზაზე"""
+        if self.enabled and self.window:
+            session[READ_PRIMARY_UNTIL] = time.time() + self.window
+
+    def reads_own_writes(self):
+        return session.get(READ_PRIMARY_UNTIL, 0) > time.time()
+
+    def _close_session(self, exception=None):
+        read_session = g.pop('replica_session', None)
+        if read_session is not None:
+            read_session.close()
+
+
+replica_router = ReplicaRouter()
@@ -0,0 +1,64 @@
+# ===== ARCHUB - JSON სერიალიზაცია =====
+# ეს ფაილი შეიცავს სწრაფ JSON სერიალიზატორს API პასუხებისთვის
+# თუ orjson დაყენებულია, გამოიყენება ის; თუ არა - სტანდარტული json მოდული
+
+import json
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # orjson არასავალდებულოა - სტანდარტული json-ით ვმუშაობთ
+    orjson = None
+
+
+if orjson is not None:
+    # datetime-ს Flask-ის default() ამუშავებს, რათა ფორმატი არ შეიცვალოს
+    ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+def dumps_bytes(obj, default=None, sort_keys=False):
+    """ობიექტის კომპაქტური JSON ბაიტები (UTF-8)"""
+    if orjson is not None:
+        option = ORJSON_OPTIONS | orjson.OPT_SORT_KEYS if sort_keys else ORJSON_OPTIONS
+        return orjson.dumps(obj, default=default, option=option)
+    return json.dumps(
+        obj, default=default, ensure_ascii=False, separators=(',', ':'), sort_keys=sort_keys
+    ).encode('utf-8')
+
+
+def loads(data):
+    """JSON-ის პარსინგი bytes-დან, memoryview-დან ან სტრიქონიდან"""
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask-ის JSON provider - jsonify() და request.get_json() ამ სერიალიზატორს იყენებს
+
+    პასუხი იწერება პირდაპირ ბაიტებად (str-ში გადაყვანის გარეშე). დამატებითი
+    არგუმენტებით გამოძახებისას (მაგ. indent) სტანდარტულ json-ს ვუბრუნდებით.
+    sort_keys (JSON_SORT_KEYS) ორივე გზაზე მოქმედებს.
+    """
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return dumps_bytes(obj, default=self.default, sort_keys=self.sort_keys).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        # debug რეჟიმში (pretty-print) სტანდარტული გზა
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            dumps_bytes(obj, default=self.default, sort_keys=self.sort_keys), mimetype=self.mimetype
+        )
@@ -0,0 +1,53 @@
+# ===== ARCHUB - SQLite-ის მაღალი კონკურენტულობის რეჟიმი =====
+# ეს ფაილი შეიცავს SQLite ბაზის PRAGMA-ებს, რომლებიც ყოველ ახალ კავშირზე ეშვება
+# (SQLAlchemy-ის 'connect' event). WAL რეჟიმში წამკითხველები ჩამწერს აღარ
+# ელოდებიან - მოწონება ან კონტაქტის ფორმა /api/projects-ს აღარ ბლოკავს.
+# PostgreSQL-ზე და მეხსიერების ბაზაზე (ტესტები) არაფერს აკეთებს
+
+from sqlalchemy import event
+
+from extensions import db
+
+
+def apply_pragmas(dbapi_connection, pragmas):
+    """PRAGMA-ების გაშვება ერთ sqlite3 კავშირზე (busy_timeout პირველია - WAL-ზე გადასვლაც ელოდება)"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+    finally:
+        cursor.close()
+
+
+class SQLiteMode:
+    """SQLITE_PRAGMAS ყველა SQLite ფაილის engine-ზე (SQLITE_HIGH_CONCURRENCY)
+
+    journal_mode=WAL ბაზის ფაილში ინახება, დანარჩენი PRAGMA-ები კი მხოლოდ
+    კავშირზე მოქმედებს, ამიტომ ყოველ ახალ კავშირზე თავიდან ეშვება.
+    """
+
+    def __init__(self, app=None):
+        self.pragmas = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        if app.config['SQLITE_HIGH_CONCURRENCY']:
+            self.pragmas = dict(app.config['SQLITE_PRAGMAS'])
+        app.extensions['sqlite_mode'] = self
+        with app.app_context():
+            for engine in db.engines.values():
+                self.attach(engine)
+
+    def attach(self, engine):
+        if not self.pragmas or engine.dialect.name != 'sqlite':
+            return
+        if engine.url.database in (None, '', ':memory:'):
+            return
+        event.listen(engine, 'connect', self._on_connect)
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        apply_pragmas(dbapi_connection, self.pragmas)
+
+
+sqlite_mode = SQLiteMode()
@@ -8,6 +8,7 @@ let galleryPhotos = [];  // გალერეის ფოტოების 
 
 // ===== API კონფიგურაცია და უსაფრთხო fetch =====
 const API_BASE_URL = '/api/projects';  // API-ის ძირითადი URL
+const ADMIN_PAGE_SIZE = 100;  // პროექტების რაოდენობა ერთ გვერდზე
 const csrfToken = document.querySelector('meta[name="csrf-token"]')?.getAttribute('content');
 
 async function secureFetch(url, options = {}) {
@@ -16,28 +17,119 @@ async function secureFetch(url, options = {}) {
     return fetch(url, { credentials: 'same-origin', ...options, headers });
 }
 
+// ===== ფონური დავალებები (სურათების დამუშავება) =====
+const JOB_POLL_INTERVAL = 700;  // /api/jobs/<id> შემოწმების ინტერვალი (ms)
+
+// ატვირთვის პასუხი (202 + job) -> დავალების დასრულების შემდეგ მისი შედეგი
+async function resolveJob(data) {
+    if (!data.success || !data.job) return data;
+    
+    let job = data.job;
+    while (job.status === 'pending' || job.status === 'running') {
+        await new Promise(resolve => setTimeout(resolve, JOB_POLL_INTERVAL));
+        const response = await secureFetch(`/api/jobs/${job.id}`);
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+        job = (await response.json()).job;
+    }
+    
+    if (job.status === 'failed') {
+        return { success: false, error: job.error };
+    }
+    return { success: true, ...job.result };
+}
+
+// ===== დიდი ფაილების ნაწილებად ატვირთვა =====
+// ფაილი იგზავნება ნაწილებად /api/uploads-ზე; კავშირის გაწყვეტისას ატვირთვა
+// გრძელდება სერვერზე უკვე მიღებული offset-იდან
+const CHUNKED_UPLOAD_THRESHOLD = 8 * 1024 * 1024;
+const UPLOAD_CHUNK_SIZE = 4 * 1024 * 1024;
+const UPLOAD_CHUNK_RETRIES = 5;
+
+async function uploadInChunks(file, finalizeBody) {
+    const createResponse = await secureFetch('/api/uploads', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ filename: file.name, size: file.size })
+    });
+    const upload = await createResponse.json();
+    if (!upload.success) return upload;
+    
+    const uploadUrl = `/api/uploads/${upload.upload.id}`;
+    let offset = 0;
+    let failures = 0;
+    while (offset < file.size) {
+        try {
+            const response = await secureFetch(`${uploadUrl}?offset=${offset}`, {
+                method: 'PUT',
+                headers: { 'Content-Type': 'application/octet-stream' },
+                body: file.slice(offset, offset + UPLOAD_CHUNK_SIZE)
+            });
+            const data = await response.json();
+            if (response.status === 409) {
+                // სერვერმა სხვა ზომა მიიღო - ვაგრძელებთ მისი offset-იდან
+                offset = data.offset;
+                continue;
+            }
+            if (!data.success) return data;
+            offset = data.upload.offset;
+            failures = 0;
+        } catch (error) {
+            if (++failures > UPLOAD_CHUNK_RETRIES) throw error;
+            await new Promise(resolve => setTimeout(resolve, 1000 * failures));
+            const statusResponse = await secureFetch(uploadUrl);
+            if (statusResponse.ok) {
+                offset = (await statusResponse.json()).upload.offset;
+            }
+        }
+    }
+    
+    const response = await secureFetch(`${uploadUrl}/finalize`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(finalizeBody)
+    });
+    return resolveJob(await response.json());
+}
+
 // ===== პროექტების ჩატვირთვა API-დან =====
 async function loadCardsFromAPI() {
     try {
         console.log('Loading cards from API...');
-        const response = await secureFetch(API_BASE_URL);
+        // პროექტები იტვირთება გვერდებად (keyset პაგინაცია); სია ყოველი გვერდის შემდეგ ახლდება
+        const loaded = [];
+        let cursor = null;
         
-        if (!response.ok) {
-            throw new Error(`HTTP error! status: ${response.status}`);
-        }
-        
-        const data = await response.json();
-        console.log('API response:', data);
-        
-        if (data.success) {
-            projectsCards = data.projects || [];
-            console.log('Cards loaded successfully from API:', projectsCards);
+        do {
+            const params = new URLSearchParams({ limit: String(ADMIN_PAGE_SIZE) });
+            if (cursor !== null) {
+                params.set('after_id', String(cursor));
+            }
+            
+            const response = await secureFetch(`${API_BASE_URL}?${params}`);
+            
+            if (!response.ok) {
+                throw new Error(`HTTP error! status: ${response.status}`);
+            }
+            
+            const data = await response.json();
+            console.log('API response:', data);
+            
+            if (!data.success) {
+                console.error('API returned error:', data.error);
+                projectsCards = loaded;
+                showError('შეცდომა მონაცემების ჩატვირთვისას: ' + data.error);
+                return;
+            }
+            
+            loaded.push(...(data.projects || []));
+            projectsCards = loaded;
             loadCardsList();
-        } else {
-            console.error('API returned error:', data.error);
-            projectsCards = [];
-            showError('შეცდომა მონაცემების ჩატვირთვისას: ' + data.error);
-        }
+            cursor = data.next_cursor ?? null;
+        } while (cursor !== null);
+        
+        console.log('Cards loaded successfully from API:', projectsCards);
     } catch (error) {
         console.error('Error loading cards from API:', error);
         projectsCards = [];
@@ -627,24 +719,36 @@ function addPhotosToProject(projectId) {
         if (files.length === 0) return;
         
         try {
-            // შექმნას FormData
-            const formData = new FormData();
-            files.forEach(file => {
-                formData.append('photos', file);
-            });
-            
             console.log(`Adding ${files.length} photos to project ${projectId}`);
             
-            const response = await secureFetch(`/api/projects/${projectId}/photos`, {
-                method: 'POST',
-                body: formData
-            });
+            // დიდი ფაილები სათითაოდ, ნაწილებად; დანარჩენი - ერთი multipart მოთხოვნით
+            const largeFiles = files.filter(file => file.size > CHUNKED_UPLOAD_THRESHOLD);
+            const smallFiles = files.filter(file => file.size <= CHUNKED_UPLOAD_THRESHOLD);
             
-            if (!response.ok) {
-                throw new Error(`HTTP error! status: ${response.status}`);
+            let data;
+            for (const file of largeFiles) {
+                data = await uploadInChunks(file, { target: 'gallery', project_id: projectId });
+                if (!data.success) break;
             }
             
-            const data = await response.json();
+            if (smallFiles.length > 0 && (!data || data.success)) {
+                // შექმნას FormData
+                const formData = new FormData();
+                smallFiles.forEach(file => {
+                    formData.append('photos', file);
+                });
+                
+                const response = await secureFetch(`/api/projects/${projectId}/photos`, {
+                    method: 'POST',
+                    body: formData
+                });
+                
+                if (!response.ok) {
+                    throw new Error(`HTTP error! status: ${response.status}`);
+                }
+                
+                data = await resolveJob(await response.json());
+            }
             console.log('Add photos response:', data);
             
             if (data.success) {
@@ -736,22 +840,27 @@ function changeMainImage(projectId) {
         if (!file) return;
         
         try {
-            // შექმნას FormData
-            const formData = new FormData();
-            formData.append('main_image', file);
-            
             console.log(`Updating main image for project ${projectId}`);
             
-            const response = await secureFetch(`/api/projects/${projectId}/main-image`, {
-                method: 'PUT',
-                body: formData
-            });
-            
-            if (!response.ok) {
-                throw new Error(`HTTP error! status: ${response.status}`);
+            let data;
+            if (file.size > CHUNKED_UPLOAD_THRESHOLD) {
+                data = await uploadInChunks(file, { target: 'main', project_id: projectId });
+            } else {
+                // შექმნას FormData
+                const formData = new FormData();
+                formData.append('main_image', file);
+                
+                const response = await secureFetch(`/api/projects/${projectId}/main-image`, {
+                    method: 'PUT',
+                    body: formData
+                });
+                
+                if (!response.ok) {
+                    throw new Error(`HTTP error! status: ${response.status}`);
+                }
+                
+                data = await resolveJob(await response.json());
             }
-            
-            const data = await response.json();
             console.log('Update main image response:', data);
             
             if (data.success) {
@@ -1004,14 +1113,20 @@ function renderCarouselImages() {
 async function addCarouselImage() {
     const form = document.getElementById('carouselUploadForm');
     const formData = new FormData(form);
+    const file = formData.get('image');
     
     try {
-        const response = await secureFetch('/api/carousel', {
-            method: 'POST',
-            body: formData
-        });
-        
-        const data = await response.json();
+        let data;
+        if (file && file.size > CHUNKED_UPLOAD_THRESHOLD) {
+            data = await uploadInChunks(file, { target: 'carousel', order: Number(formData.get('order')) || 0 });
+        } else {
+            const response = await secureFetch('/api/carousel', {
+                method: 'POST',
+                body: formData
+            });
+            
+            data = await resolveJob(await response.json());
+        }
         
         if (data.success) {
             showCarouselSuccess('ფოტო წარმატებით დაემატა კარუსელში');
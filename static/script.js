@@ -42,10 +42,15 @@ document.addEventListener('DOMContentLoaded', function() {
     // --- ავტორიზაციის სტატუსის შემოწმება ---
     async function checkAuthStatus() {
         try {
-            console.log('Checking auth status...');
-            const response = await fetch('/api/status');
-            const data = await response.json();
-            console.log('Auth status response:', data);
+            // გვერდში ჩაშენებული სტატუსი - სექციები ჯერ არ დარენდერებულა, ამიტომ მათი განახლება არ გვჭირდება
+            const embedded = bootstrapValue('auth');
+            let data = embedded;
+            if (!data) {
+                console.log('Checking auth status...');
+                const response = await fetch('/api/status');
+                data = await response.json();
+                console.log('Auth status response:', data);
+            }
             
             if (data.logged_in) {
                 userAuthenticated = true;
@@ -62,6 +67,7 @@ document.addEventListener('DOMContentLoaded', function() {
             // ავტორიზაციის სტატუსის გლობალურად ხელმისაწვდომად გაკეთება
             window.userAuthenticated = userAuthenticated;
             console.log('window.userAuthenticated set to:', window.userAuthenticated);
+            if (embedded) return;
             
             // სექცია 2-ის მონაცემების განახლება ავტორიზაციის სტატუსის დადასტურების შემდეგ
             if (typeof loadCardsFromAPI === 'function' && typeof renderProjectsCards === 'function') {
@@ -138,6 +144,7 @@ document.addEventListener('DOMContentLoaded', function() {
                 currentUser = null;
                 window.userAuthenticated = false;
                 updateAuthButtons('login');
+                discardBootstrap();
                 // ლაიქების ღილაკების ხელახალი რენდერი გამოსვლის შემდეგ
                 await loadCardsFromAPI();
                 renderProjectsCards();
@@ -226,6 +233,7 @@ document.addEventListener('DOMContentLoaded', function() {
                     currentUser = result.user;
                     window.userAuthenticated = true;
                     updateAuthButtons('logout');
+                    discardBootstrap();
                     // ლაიქების ღილაკების ხელახალი რენდერი ავტორიზაციის შემდეგ
                     await loadCardsFromAPI();
                     renderProjectsCards();
@@ -343,7 +351,104 @@ window.initProjectsCarousel = async function initProjectsCarousel() {
     initSection2Arrows();
 }
 
+// ===== საწყისი მონაცემები (index.html-ში ჩაშენებული) =====
+// სერვერი გვერდში სვამს ავტორიზაციის სტატუსს, კარუსელს და პროექტების პირველ
+// გვერდს - ისინი API-დან აღარ ითხოვება. შესვლა/გამოსვლის შემდეგ მონაცემები
+// ძველდება (is_liked), ამიტომ discardBootstrap() მათ აუქმებს.
+let bootstrapData;
+
+function bootstrapValue(key) {
+    if (bootstrapData === undefined) {
+        const element = document.getElementById('bootstrapData');
+        try {
+            bootstrapData = element ? JSON.parse(element.textContent) : null;
+        } catch (error) {
+            console.error('Invalid bootstrap data:', error);
+            bootstrapData = null;
+        }
+    }
+    return bootstrapData ? bootstrapData[key] : undefined;
+}
+
+function discardBootstrap() {
+    bootstrapData = null;
+    projectPages = null;
+}
+
+// ===== პროექტების გვერდებად ჩატვირთვა (keyset პაგინაცია) =====
+const PROJECTS_PAGE_SIZE = 24;
+// ქარდის სიგანე ბადეში (.projects-grid: minmax(310px, 1fr)) - srcset-ის sizes
+const CARD_IMAGE_SIZES = '(max-width: 700px) 100vw, 400px';
+
+async function fetchProjectsPage(afterId = null, limit = PROJECTS_PAGE_SIZE) {
+    const params = new URLSearchParams({ limit: String(limit) });
+    if (afterId !== null) {
+        params.set('after_id', String(afterId));
+    }
+    
+    const response = await fetch(`/api/projects?${params}`);
+    
+    if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+    }
+    
+    return response.json();
+}
+
+// ===== პროექტების საერთო გვერდები (სექცია 2 და სექცია 3) =====
+// ორივე სექცია ერთსა და იმავე გვერდებს კითხულობს: თითო გვერდი API-დან ერთხელ მოდის.
+// პირველი გვერდი გვერდშივეა (index.html), დანარჩენები - PROJECTS_LIST_PAGE_SIZE-ით
+const PROJECTS_LIST_PAGE_SIZE = 100;
+let projectPages = null;  // გვერდების Promise-ები რიგით; discardBootstrap() აუქმებს
+
+function projectsPage(index) {
+    if (!projectPages) {
+        projectPages = [];
+    }
+    const pages = projectPages;
+    if (!pages[index]) {
+        pages[index] = index === 0
+            ? Promise.resolve(bootstrapValue('projects') || fetchProjectsPage(null))
+            : projectsPage(index - 1).then(previous => {
+                if (!previous || !previous.success || previous.next_cursor === null || previous.next_cursor === undefined) {
+                    return null;
+                }
+                return fetchProjectsPage(previous.next_cursor, PROJECTS_LIST_PAGE_SIZE);
+            });
+        // შეცდომის შემდეგ გვერდი თავიდან მოითხოვება
+        pages[index].catch(() => {
+            if (pages.length > index) {
+                pages.length = index;
+            }
+        });
+    }
+    return pages[index];
+}
+
+// ყველა გვერდის თანმიმდევრული ჩატვირთვა (სექცია 2 და ძებნისთვის)
+async function fetchAllProjects() {
+    const projects = [];
+    
+    for (let index = 0; ; index++) {
+        const data = await projectsPage(index);
+        if (!data) {
+            break;
+        }
+        if (!data.success) {
+            return data;
+        }
+        projects.push(...data.projects);
+    }
+    
+    return { success: true, projects };
+}
+
 // ===== სექცია 3 - პროექტების გრიდი =====
+// გრიდი იტვირთება გვერდებად: შემდეგი გვერდი მოდის, როცა გრიდის ბოლო ეკრანს უახლოვდება
+let section3Generation = 0;
+let section3Observer = null;
+let section3Sentinel = null;
+
 window.initSection3Projects = async function initSection3Projects() {
     const projectsGrid = document.getElementById('projectsGrid');
     
@@ -352,35 +457,92 @@ window.initSection3Projects = async function initSection3Projects() {
         return;
     }
     
-    try {
-        // Load projects from API (same data as section 2)
-        const response = await fetch('/api/projects');
+    // წინა ინიციალიზაციის (მაგ. ავტორიზაციამდე) ჩატვირთვის შეწყვეტა
+    const generation = ++section3Generation;
+    if (section3Observer) {
+        section3Observer.disconnect();
+        section3Observer = null;
+    }
+    if (!section3Sentinel) {
+        section3Sentinel = document.createElement('div');
+        section3Sentinel.className = 'projects-grid-sentinel';
+        section3Sentinel.setAttribute('aria-hidden', 'true');
+        projectsGrid.after(section3Sentinel);
+    }
+    
+    let pageIndex = 0;
+    let hasMore = true;
+    let loadedCount = 0;
+    let loading = false;
+    
+    const sentinelIsNear = () => section3Sentinel.getBoundingClientRect().top < window.innerHeight + 400;
+    
+    async function loadNextPage() {
+        if (loading || generation !== section3Generation) return;
+        loading = true;
         
-        if (!response.ok) {
-            throw new Error(`HTTP error! status: ${response.status}`);
+        try {
+            // იგივე გვერდები, რასაც სექცია 2 ტვირთავს - ხელახლა არ ითხოვება
+            const data = await projectsPage(pageIndex);
+            if (generation !== section3Generation) return;
+            
+            if (!data) {
+                hasMore = false;
+            } else if (data.success && data.projects) {
+                // Clear existing content
+                if (loadedCount === 0) {
+                    projectsGrid.innerHTML = '';
+                }
+                
+                // Create project cards
+                data.projects.forEach(project => {
+                    const cardElement = createSection3CardElement(project);
+                    projectsGrid.appendChild(cardElement);
+                });
+                
+                loadedCount += data.projects.length;
+                pageIndex += 1;
+                hasMore = data.next_cursor !== null && data.next_cursor !== undefined;
+                console.log(`Section 3: Loaded ${loadedCount} projects`);
+            } else {
+                console.error('Failed to load projects for section 3:', data.error);
+                if (loadedCount === 0) {
+                    projectsGrid.innerHTML = '<div style="text-align: center; color: #666; padding: 40px;">პროექტები ვერ ჩაიტვირთა</div>';
+                }
+                hasMore = false;
+            }
+        } catch (error) {
+            console.error('Error loading projects for section 3:', error);
+            if (loadedCount === 0) {
+                projectsGrid.innerHTML = '<div style="text-align: center; color: #666; padding: 40px;">შეცდომა პროექტების ჩატვირთვისას</div>';
+            }
+            hasMore = false;
+        } finally {
+            loading = false;
         }
         
-        const data = await response.json();
-        
-        if (data.success && data.projects) {
-            // Clear existing content
-            projectsGrid.innerHTML = '';
-            
-            // Create project cards
-            data.projects.forEach(project => {
-                const cardElement = createSection3CardElement(project);
-                projectsGrid.appendChild(cardElement);
-            });
-            
-            console.log(`Section 3: Loaded ${data.projects.length} projects`);
-        } else {
-            console.error('Failed to load projects for section 3:', data.error);
-            projectsGrid.innerHTML = '<div style="text-align: center; color: #666; padding: 40px;">პროექტები ვერ ჩაიტვირთა</div>';
+        if (generation !== section3Generation) return;
+        if (!hasMore) {
+            if (section3Observer) {
+                section3Observer.disconnect();
+                section3Observer = null;
+            }
+        } else if (!('IntersectionObserver' in window) || sentinelIsNear()) {
+            // მოკლე გვერდი ეკრანს არ ავსებს - observer ხელახლა არ გაისვრის, ამიტომ პირდაპირ ვაგრძელებთ
+            await loadNextPage();
         }
-    } catch (error) {
-        console.error('Error loading projects for section 3:', error);
-        projectsGrid.innerHTML = '<div style="text-align: center; color: #666; padding: 40px;">შეცდომა პროექტების ჩატვირთვისას</div>';
     }
+    
+    if ('IntersectionObserver' in window) {
+        section3Observer = new IntersectionObserver(entries => {
+            if (entries.some(entry => entry.isIntersecting)) {
+                loadNextPage();
+            }
+        }, { rootMargin: '400px 0px' });
+        section3Observer.observe(section3Sentinel);
+    }
+    
+    await loadNextPage();
 }
 
 // Create card element for section 3
@@ -399,7 +561,7 @@ function createSection3CardElement(project) {
     ` : '';
     
     cardElement.innerHTML = `
-        <img src="${project.main_image_url}" class="card-image" alt="${escapeHtml(project.area)}">
+        ${responsiveImageHtml(project.main_image_url, project.main_image_srcset, CARD_IMAGE_SIZES, `class="card-image" alt="${escapeHtml(project.area)}"`)}
         <div class="card-info">
             <div class="card-area">${escapeHtml(project.area)}</div>
         </div>
@@ -438,16 +600,10 @@ function createSection3CardElement(project) {
     return cardElement;
 }
 
-    // ქარდების ჩატვირთვა API-დან
+    // ქარდების ჩატვირთვა API-დან (ყველა გვერდი - კარუსელს და ძებნას სრული სია სჭირდება)
 async function loadCardsFromAPI() {
     try {
-        const response = await fetch('/api/projects');
-        
-        if (!response.ok) {
-            throw new Error(`HTTP error! status: ${response.status}`);
-        }
-        
-        const data = await response.json();
+        const data = await fetchAllProjects();
         
         if (data.success && data.projects) {
             projectsCards = data.projects.map(project => {
@@ -1075,16 +1231,19 @@ function openAdminPanel() {
 // ===== კარუსელის ფოტოების ჩატვირთვის ფუნქცია =====
 async function loadCarouselImages() {
     try {
-        console.log('Loading carousel images from API...');
-        const response = await fetch('/api/carousel');
-        
-        if (!response.ok) {
-            throw new Error(`HTTP error! status: ${response.status}`);
+        let data = bootstrapValue('carousel');
+        if (!data) {
+            console.log('Loading carousel images from API...');
+            const response = await fetch('/api/carousel');
+            
+            if (!response.ok) {
+                throw new Error(`HTTP error! status: ${response.status}`);
+            }
+            
+            data = await response.json();
+            console.log('Carousel API response:', data);
         }
         
-        const data = await response.json();
-        console.log('Carousel API response:', data);
-        
         if (data.success && data.images && data.images.length > 0) {
             renderCarouselImages(data.images);
         } else {
@@ -1419,4 +1578,14 @@ function initSection2Arrows() {
 
 function escapeHtml(s) {
   return String(s).replace(/[&<>"'`=\/]/g, c => ({'&':'&amp;','<':'&lt;','>':'&gt;','"':'&quot;',"'":'&#39;','/':'&#x2F;','`':'&#x60;','=':'&#x3D;'}[c]));
+}
+
+// სურათი შემცირებული ვარიანტებით (API-ს srcset: {webp, jpeg}); ვარიანტების გარეშე - ორიგინალი
+function responsiveImageHtml(url, srcset, sizes, attrs) {
+  if (!srcset || (!srcset.webp && !srcset.jpeg)) {
+    return `<img src="${url}" ${attrs}>`;
+  }
+  const webpSource = srcset.webp ? `<source type="image/webp" srcset="${srcset.webp}" sizes="${sizes}">` : '';
+  const jpegSrcset = srcset.jpeg ? ` srcset="${srcset.jpeg}" sizes="${sizes}"` : '';
+  return `<picture>${webpSource}<img src="${url}"${jpegSrcset} ${attrs}></picture>`;
 }
\ No newline at end of file
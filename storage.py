@@ -0,0 +1,94 @@
+# ===== ARCHUB - ატვირთვების საცავი =====
+# ეს ფაილი შეიცავს შიგთავსით მისამართებად (content-addressed) საცავს
+# ფაილის სახელი მისი SHA-256-ია: static/uploads/content/<2 სიმბოლო>/<sha256>.<ext>
+# ერთნაირი ფაილი დისკზე ერთხელ ინახება და მისი URL არასდროს იცვლება;
+# ფაილი იშლება მხოლოდ მაშინ, როცა მას ბაზაში აღარც ერთი ჩანაწერი მიმართავს
+
+import hashlib
+import os
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows - პროცესებს შორის lock არ გვჭირდება (ერთი პროცესი)
+    fcntl = None
+
+from flask import current_app
+from sqlalchemy import func, select
+
+from extensions import db
+from models import Project, Photo, CarouselImage
+
+CONTENT_FOLDER = 'content'
+CONTENT_URL_PREFIX = f'static/uploads/{CONTENT_FOLDER}/'
+HASH_BLOCK_SIZE = 64 * 1024
+
+# ერთი ფორმატი - ერთი გაფართოება, რათა .jpeg და .jpg ერთ ფაილად ჩაითვალოს
+EXTENSION_ALIASES = {'jpeg': 'jpg'}
+
+_local = threading.local()
+# პროცესის შიგნით (thread-ებს შორის) ყოველთვის აიღება; flock მხოლოდ მის თავზე ემატება
+_content_lock = threading.RLock()
+
+
+def content_location(digest, original_filename):
+    """(საქაღალდე, ფაილის სახელი) SHA-256-ისა და ორიგინალი გაფართოებისთვის"""
+    extension = original_filename.rsplit('.', 1)[1].lower() if '.' in original_filename else ''
+    extension = EXTENSION_ALIASES.get(extension, extension)
+    filename = f'{digest}.{extension}' if extension else digest
+    return f'{CONTENT_FOLDER}/{digest[:2]}', filename
+
+
+def is_content_url(url):
+    """არის თუ არა URL შიგთავსით მისამართებად საცავში (უცვლელი ფაილი)"""
+    return (url or '').replace('\\', '/').lstrip('/').startswith(CONTENT_URL_PREFIX)
+
+
+def file_sha256(path):
+    """ფაილის SHA-256 (ბლოკებად კითხვით)"""
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+@contextmanager
+def content_lock():
+    """საცავის lock (ყველა პროცესისთვის) - ფაილის დამატება/წაშლა და შესაბამისი commit
+
+    იმავე thread-ში განმეორებით აღება დაშვებულია (მაგ. დავალების handler-ი
+    ძველ ფაილს შლის, სანამ ახალი ფაილის lock ჯერ კიდევ აღებულია).
+    """
+    with _content_lock:
+        depth = getattr(_local, 'depth', 0)
+        if depth:
+            _local.depth = depth + 1
+            try:
+                yield
+            finally:
+                _local.depth -= 1
+            return
+
+        folder = os.path.join(current_app.config['UPLOAD_FOLDER'], CONTENT_FOLDER)
+        os.makedirs(folder, exist_ok=True)
+        with open(os.path.join(folder, '.lock'), 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            _local.depth = 1
+            try:
+                yield
+            finally:
+                _local.depth = 0
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def reference_count(url):
+    """რამდენი ჩანაწერი მიმართავს ფაილს (მთავარი ფოტოები, გალერეა, კარუსელი)"""
+    return db.session.execute(select(
+        select(func.count()).where(Project.main_image_url == url).scalar_subquery()
+        + select(func.count()).where(Photo.url == url).scalar_subquery()
+        + select(func.count()).where(CarouselImage.url == url).scalar_subquery()
+    )).scalar()
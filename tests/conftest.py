@@ -0,0 +1,80 @@
+# ===== ARCHUB - ტესტების საერთო fixture-ები =====
+# აპლიკაცია იტვირთება testing კონფიგურაციით (მეხსიერებაში ბაზა, ვერსიები პროცესში);
+# ყოველი ტესტი იწყება ცარიელი ბაზით და ატვირთვების დროებითი საქაღალდით
+
+import io
+import os
+import sys
+
+os.environ['FLASK_ENV'] = 'testing'
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from PIL import Image
+
+from app import app as flask_app
+from catalog import carousel_cache, catalog_cache
+from extensions import db
+from identity import identity_cache
+from likes import liked_ids_version
+from models import Project, User
+from pagecache import fragment_cache, users_version
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.setitem(flask_app.config, 'UPLOAD_FOLDER', str(tmp_path / 'uploads'))
+    with flask_app.app_context():
+        db.drop_all()
+        db.create_all()
+        # ბაზა თავიდან შეიქმნა - წინა ტესტის snapshot-ები და ქეშები აღარ გამოდგება
+        for version in (catalog_cache, carousel_cache, users_version, liked_ids_version):
+            version.bump()
+        identity_cache.invalidate()
+        fragment_cache.invalidate()
+    yield flask_app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def make_user(app):
+    def make_user(username, is_admin=False):
+        with app.app_context():
+            user = User(username=username, email=f'{username}@example.com', password_hash='-', is_admin=is_admin)
+            db.session.add(user)
+            db.session.commit()
+            return user.id
+    return make_user
+
+
+@pytest.fixture
+def login(app):
+    """კლიენტის სესიაში მომხმარებლის ჩასმა (/api/login-ის, პაროლის ჰეშის და rate limit-ის გარეშე)"""
+    def login(client, user_id):
+        with client.session_transaction() as session:
+            session['_user_id'] = str(user_id)
+            session['_fresh'] = True
+        return client
+    return login
+
+
+@pytest.fixture
+def make_projects(app):
+    def make_projects(count):
+        with app.app_context():
+            projects = [Project(area=f'{index + 1}0') for index in range(count)]
+            db.session.add_all(projects)
+            db.session.commit()
+            catalog_cache.bump()
+            return [project.id for project in projects]
+    return make_projects
+
+
+def png_bytes(width=64, height=48, color='red'):
+    buffer = io.BytesIO()
+    Image.new('RGB', (width, height), color).save(buffer, 'PNG')
+    return buffer.getvalue()
@@ -0,0 +1,172 @@
+# ===== მოწონებები: toggle, იდემპოტენტური PUT/DELETE და write-behind ჟურნალი =====
+
+import atexit
+import os
+import threading
+
+import pytest
+from sqlalchemy import func, select
+
+import likes
+from extensions import db
+from likes import like_buffer
+from models import Project, project_likes
+
+
+def stored_likes(app, project_id):
+    """(likes_count სვეტი, project_likes-ის რეალური რაოდენობა)"""
+    with app.app_context():
+        likes_count = db.session.get(Project, project_id).likes_count
+        rows = db.session.execute(
+            select(func.count()).select_from(project_likes).where(project_likes.c.project_id == project_id)
+        ).scalar()
+        return likes_count, rows
+
+
+def test_toggle_like_and_unlike(app, client, make_user, login, make_projects):
+    [project_id] = make_projects(1)
+    login(client, make_user('bob'))
+
+    response = client.post(f'/api/projects/{project_id}/like')
+    assert response.json == {'success': True, 'liked': True, 'likes_count': 1}
+    assert stored_likes(app, project_id) == (1, 1)
+
+    response = client.post(f'/api/projects/{project_id}/like')
+    assert response.json == {'success': True, 'liked': False, 'likes_count': 0}
+    assert stored_likes(app, project_id) == (0, 0)
+
+
+def test_put_and_delete_are_idempotent(app, client, make_user, login, make_projects):
+    [project_id] = make_projects(1)
+    login(client, make_user('bob'))
+
+    for _ in range(2):
+        assert client.put(f'/api/projects/{project_id}/like').json['likes_count'] == 1
+    assert stored_likes(app, project_id) == (1, 1)
+
+    for _ in range(2):
+        assert client.delete(f'/api/projects/{project_id}/like').json['likes_count'] == 0
+    assert stored_likes(app, project_id) == (0, 0)
+
+
+def test_like_counts_every_user_once(app, make_user, login, make_projects):
+    [project_id] = make_projects(1)
+    for name in ('ann', 'bob', 'cat'):
+        client = login(app.test_client(), make_user(name))
+        client.put(f'/api/projects/{project_id}/like')
+    assert stored_likes(app, project_id) == (3, 3)
+
+
+def test_like_missing_project(client, make_user, login):
+    login(client, make_user('bob'))
+    response = client.post('/api/projects/999/like')
+    assert response.status_code == 404
+    assert response.json['success'] is False
+
+
+def test_like_requires_login(client, make_projects):
+    [project_id] = make_projects(1)
+    assert client.post(f'/api/projects/{project_id}/like').status_code == 401
+
+
+def test_like_shows_in_liked_projects(client, make_user, login, make_projects):
+    first, second = make_projects(2)
+    login(client, make_user('bob'))
+    assert client.get('/api/user/liked-projects').json['projects'] == []
+
+    client.post(f'/api/projects/{second}/like')
+    assert [project['id'] for project in client.get('/api/user/liked-projects').json['projects']] == [second]
+    liked = {project['id']: project['is_liked'] for project in client.get('/api/projects').json['projects']}
+    assert liked == {first: False, second: True}
+
+
+# ===== write-behind ჟურნალი =====
+@pytest.fixture
+def journal(app, tmp_path, monkeypatch):
+    """like_buffer ჩართული დროებითი ჟურნალით; ფონური flusher არ ეშვება - flush() ტესტი იძახებს"""
+    monkeypatch.setitem(app.config, 'LIKES_WRITE_BEHIND', True)
+    monkeypatch.setitem(app.config, 'LIKES_JOURNAL_PATH', str(tmp_path / 'likes_journal.db'))
+    like_buffer.init_app(app)
+    like_buffer._flusher_pid = os.getpid()
+    yield like_buffer
+    atexit.unregister(like_buffer._flush_at_exit)
+    like_buffer.enabled = False
+    like_buffer._flusher_pid = None
+    like_buffer._local = threading.local()
+
+
+def pending_rows(journal):
+    return journal.conn.execute('SELECT user_id, project_id, liked, base_liked FROM pending_like').fetchall()
+
+
+def test_journal_collapses_toggles(app, client, make_user, login, make_projects, journal):
+    [project_id] = make_projects(1)
+    user_id = make_user('bob')
+    login(client, user_id)
+
+    assert client.post(f'/api/projects/{project_id}/like').json == {'success': True, 'liked': True, 'likes_count': 1}
+    assert pending_rows(journal) == [(user_id, project_id, 1, 0)]
+    # ბაზაში ჯერ არაფერი ჩაწერილა
+    assert stored_likes(app, project_id) == (0, 0)
+
+    # ბაზის მდგომარეობაზე დაბრუნება ჩანაწერს შლის
+    assert client.post(f'/api/projects/{project_id}/like').json['liked'] is False
+    assert pending_rows(journal) == []
+    assert journal.flush() == 0
+
+
+def test_journal_flush_applies_likes(app, client, make_user, login, make_projects, journal):
+    first, second = make_projects(2)
+    login(client, make_user('bob'))
+    client.put(f'/api/projects/{first}/like')
+    client.put(f'/api/projects/{second}/like')
+    revision = journal.revision()
+
+    assert journal.flush() == 2
+    assert pending_rows(journal) == []
+    assert journal.revision() > revision
+    assert stored_likes(app, first) == (1, 1)
+    assert stored_likes(app, second) == (1, 1)
+
+    # გაერთიანებული ხედი flush-ის შემდეგაც იგივეა
+    projects = client.get('/api/projects').json['projects']
+    assert [(project['is_liked'], project['likes_count']) for project in projects] == [(True, 1), (True, 1)]
+
+    client.delete(f'/api/projects/{first}/like')
+    assert journal.flush() == 1
+    assert stored_likes(app, first) == (0, 0)
+
+
+def test_journal_keeps_like_changed_during_flush(app, client, make_user, login, make_projects, journal, monkeypatch):
+    [project_id] = make_projects(1)
+    user_id = make_user('bob')
+    login(client, user_id)
+    client.post(f'/api/projects/{project_id}/like')
+
+    # flush-ის შუაში (ჟურნალის lock-ის გარეშე) მომხმარებელი მოწონებას ხსნის
+    write_project_like = likes.write_project_like
+    def write_and_unlike(*args):
+        monkeypatch.setattr(likes, 'write_project_like', write_project_like)
+        assert client.post(f'/api/projects/{project_id}/like').json['liked'] is False
+        return write_project_like(*args)
+    monkeypatch.setattr(likes, 'write_project_like', write_and_unlike)
+
+    assert journal.flush() == 1
+    assert stored_likes(app, project_id) == (1, 1)
+    # შეცვლილი ჩანაწერი რჩება ახალი base-ით და შემდეგ flush-ზე გადადის
+    assert pending_rows(journal) == [(user_id, project_id, 0, 1)]
+    assert journal.flush() == 1
+    assert stored_likes(app, project_id) == (0, 0)
+    assert pending_rows(journal) == []
+
+
+def test_journal_skips_deleted_projects(app, client, make_user, login, make_projects, journal):
+    [project_id] = make_projects(1)
+    login(client, make_user('bob'))
+    client.put(f'/api/projects/{project_id}/like')
+    with app.app_context():
+        db.session.delete(db.session.get(Project, project_id))
+        db.session.commit()
+
+    assert journal.flush() == 1
+    assert pending_rows(journal) == []
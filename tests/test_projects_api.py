@@ -0,0 +1,91 @@
+# ===== /api/projects: ETag/304, Vary: Cookie და keyset პაგინაცია =====
+
+
+def test_projects_etag_and_not_modified(client, make_projects):
+    make_projects(2)
+    response = client.get('/api/projects')
+    assert response.status_code == 200
+    assert response.headers['Cache-Control'] == 'no-cache'
+    assert 'Cookie' in response.vary
+    etag = response.headers['ETag']
+
+    response = client.get('/api/projects', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
+    assert response.headers['ETag'] == etag
+    assert 'Cookie' in response.vary
+
+
+def test_projects_etag_changes_with_catalog(client, make_projects):
+    make_projects(1)
+    etag = client.get('/api/projects').headers['ETag']
+    make_projects(1)
+    response = client.get('/api/projects', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert response.json['count'] == 2
+
+
+def test_projects_etag_is_per_user(app, client, make_user, login, make_projects):
+    [project_id] = make_projects(1)
+    anonymous_etag = client.get('/api/projects').headers['ETag']
+
+    login(client, make_user('bob'))
+    response = client.get('/api/projects')
+    assert response.headers['Cache-Control'] == 'private, no-cache'
+    assert 'Cookie' in response.vary
+    user_etag = response.headers['ETag']
+    assert user_etag != anonymous_etag
+    assert client.get('/api/projects', headers={'If-None-Match': user_etag}).status_code == 304
+
+    # მოწონება is_liked-ს ცვლის - ძველი ETag აღარ ემთხვევა
+    client.post(f'/api/projects/{project_id}/like')
+    response = client.get('/api/projects', headers={'If-None-Match': user_etag})
+    assert response.status_code == 200
+    assert response.json['projects'][0]['is_liked'] is True
+
+
+def test_projects_keyset_pagination(client, make_projects):
+    ids = make_projects(5)
+
+    page = client.get('/api/projects?limit=2').json
+    assert [project['id'] for project in page['projects']] == ids[:2]
+    assert page['count'] == 2
+    assert page['next_cursor'] == ids[1]
+
+    page = client.get(f'/api/projects?limit=2&after_id={page["next_cursor"]}').json
+    assert [project['id'] for project in page['projects']] == ids[2:4]
+
+    page = client.get(f'/api/projects?limit=2&after_id={page["next_cursor"]}').json
+    assert [project['id'] for project in page['projects']] == ids[4:]
+    assert page['next_cursor'] is None
+
+
+def test_projects_pagination_after_deleted_cursor(app, client, make_user, login, make_projects):
+    ids = make_projects(4)
+    admin = login(app.test_client(), make_user('admin', is_admin=True))
+    assert admin.delete(f'/api/projects/{ids[1]}').status_code == 200
+
+    # კურსორი წაშლილ პროექტზე - გვერდი იწყება შემდეგი არსებული id-ით
+    page = client.get(f'/api/projects?limit=2&after_id={ids[1]}').json
+    assert [project['id'] for project in page['projects']] == ids[2:]
+
+
+def test_projects_pages_have_separate_etags(client, make_projects):
+    ids = make_projects(3)
+    first = client.get('/api/projects?limit=1').headers['ETag']
+    second = client.get(f'/api/projects?limit=1&after_id={ids[0]}').headers['ETag']
+    assert first != second
+
+
+def test_projects_fields_projection(client, make_projects):
+    make_projects(2)
+    projects = client.get('/api/projects?fields=area').json['projects']
+    assert [sorted(project) for project in projects] == [['area', 'id'], ['area', 'id']]
+
+
+def test_projects_rejects_bad_page_args(client):
+    for query in ('limit=0', 'limit=abc', 'after_id=-1', 'fields=password'):
+        response = client.get(f'/api/projects?{query}')
+        assert response.status_code == 400
+        assert response.json['success'] is False
@@ -0,0 +1,194 @@
+# ===== ატვირთვები: ნაწილებად ატვირთვა და მიმართვების მიხედვით წაშლა =====
+
+import hashlib
+import io
+import os
+
+import pytest
+
+from conftest import png_bytes
+from extensions import db
+from jobs import image_jobs
+from models import CarouselImage, Project
+
+
+@pytest.fixture
+def admin(app, make_user, login):
+    return login(app.test_client(), make_user('admin', is_admin=True))
+
+
+def upload_path(app, url):
+    return os.path.join(app.config['UPLOAD_FOLDER'], url[len('static/uploads/'):])
+
+
+def staging_files(app):
+    folder = os.path.join(app.config['UPLOAD_FOLDER'], '.staging')
+    return sorted(os.listdir(folder)) if os.path.isdir(folder) else []
+
+
+# ===== ნაწილებად ატვირთვა =====
+def start_upload(client, data, filename='photo.png'):
+    response = client.post('/api/uploads', json={'filename': filename, 'size': len(data)})
+    assert response.status_code == 201
+    return response.json['upload']['id']
+
+
+def put_chunk(client, upload_id, offset, chunk):
+    return client.put(f'/api/uploads/{upload_id}?offset={offset}', data=chunk)
+
+
+def test_chunked_upload_resume(admin):
+    data = png_bytes()
+    upload_id = start_upload(admin, data)
+    assert put_chunk(admin, upload_id, 0, data[:40]).json['upload']['offset'] == 40
+
+    # კავშირის გაწყვეტის შემდეგ კლიენტი offset-ს სტატუსიდან იგებს
+    status = admin.get(f'/api/uploads/{upload_id}').json['upload']
+    assert (status['offset'], status['complete']) == (40, False)
+
+    upload = put_chunk(admin, upload_id, status['offset'], data[40:]).json['upload']
+    assert (upload['offset'], upload['complete']) == (len(data), True)
+
+
+def test_chunked_upload_rejects_wrong_offset(admin):
+    data = png_bytes()
+    upload_id = start_upload(admin, data)
+    put_chunk(admin, upload_id, 0, data[:40])
+
+    response = put_chunk(admin, upload_id, 0, data[:40])
+    assert response.status_code == 409
+    assert response.json['offset'] == 40
+
+
+def test_chunked_upload_rejects_oversized_chunk(admin):
+    data = png_bytes()
+    upload_id = start_upload(admin, data)
+    response = put_chunk(admin, upload_id, 0, data + b'extra')
+    assert response.status_code == 413
+    assert admin.get(f'/api/uploads/{upload_id}').json['upload']['offset'] == 0
+
+
+def test_finalize_incomplete_upload(admin):
+    data = png_bytes()
+    upload_id = start_upload(admin, data)
+    put_chunk(admin, upload_id, 0, data[:40])
+
+    response = admin.post(f'/api/uploads/{upload_id}/finalize', json={'target': 'carousel'})
+    assert response.status_code == 409
+    assert response.json['offset'] == 40
+
+
+def test_finalize_checksum_mismatch_keeps_upload(app, admin):
+    data = png_bytes()
+    upload_id = start_upload(admin, data)
+    put_chunk(admin, upload_id, 0, data)
+
+    response = admin.post(f'/api/uploads/{upload_id}/finalize', json={'target': 'carousel', 'sha256': '0' * 64})
+    assert response.status_code == 400
+    assert response.json['sha256'] == hashlib.sha256(data).hexdigest()
+    # სესია რჩება - სწორი checksum-ით შეიძლება გამეორდეს
+    assert admin.get(f'/api/uploads/{upload_id}').json['upload']['complete'] is True
+
+
+def test_finalize_creates_carousel_image(app, admin):
+    data = png_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    upload_id = start_upload(admin, data)
+    put_chunk(admin, upload_id, 0, data[:50])
+    put_chunk(admin, upload_id, 50, data[50:])
+
+    response = admin.post(f'/api/uploads/{upload_id}/finalize', json={'target': 'carousel', 'sha256': digest})
+    assert response.status_code == 202
+    job = response.json['job']
+    assert job['status'] == 'done'
+    url = job['result']['image']['url']
+    assert url == f'static/uploads/content/{digest[:2]}/{digest}.png'
+    assert os.path.exists(upload_path(app, url))
+    assert staging_files(app) == []
+
+    with app.app_context():
+        assert [image.url for image in CarouselImage.query.all()] == [url]
+    # დასრულებული სესია აღარ არსებობს
+    assert admin.post(f'/api/uploads/{upload_id}/finalize', json={'target': 'carousel'}).status_code == 404
+
+
+def test_finalize_keeps_upload_when_submit_fails(app, admin, monkeypatch):
+    data = png_bytes()
+    upload_id = start_upload(admin, data)
+    put_chunk(admin, upload_id, 0, data)
+
+    def fail(*args, **kwargs):
+        raise RuntimeError('database unavailable')
+    with monkeypatch.context() as patch:
+        patch.setattr(image_jobs, 'submit', fail)
+        assert admin.post(f'/api/uploads/{upload_id}/finalize', json={'target': 'carousel'}).status_code == 500
+    assert staging_files(app) == [f'{upload_id}.json', f'{upload_id}.part']
+
+    assert admin.post(f'/api/uploads/{upload_id}/finalize', json={'target': 'carousel'}).status_code == 202
+    assert staging_files(app) == []
+
+
+def test_cancel_upload_removes_files(app, admin):
+    data = png_bytes()
+    upload_id = start_upload(admin, data)
+    put_chunk(admin, upload_id, 0, data[:40])
+
+    assert admin.delete(f'/api/uploads/{upload_id}').status_code == 200
+    assert staging_files(app) == []
+    assert admin.get(f'/api/uploads/{upload_id}').status_code == 404
+
+
+# ===== მიმართვების მიხედვით წაშლა =====
+def create_project(client, data):
+    response = client.post(
+        '/api/projects',
+        data={'area': '100', 'main_image': (io.BytesIO(data), 'main.png')},
+        content_type='multipart/form-data'
+    )
+    assert response.status_code == 202
+    return response.json['job']['result']['project']
+
+
+def test_identical_uploads_share_one_file(app, admin):
+    data = png_bytes()
+    first = create_project(admin, data)
+    second = create_project(admin, data)
+    assert first['main_image_url'] == second['main_image_url']
+    assert os.path.exists(upload_path(app, first['main_image_url']))
+
+
+def test_shared_file_deleted_with_last_reference(app, admin):
+    data = png_bytes()
+    first = create_project(admin, data)
+    second = create_project(admin, data)
+    path = upload_path(app, first['main_image_url'])
+
+    response = admin.delete(f'/api/projects/{first["id"]}')
+    assert response.status_code == 200
+    # მეორე პროექტი ჯერ კიდევ მიმართავს ფაილს
+    assert os.path.exists(path)
+
+    assert admin.delete(f'/api/projects/{second["id"]}').status_code == 200
+    assert not os.path.exists(path)
+
+
+def test_variants_restored_on_reupload(app, admin, monkeypatch):
+    monkeypatch.setitem(app.config, 'IMAGE_VARIANT_WIDTHS', (16, 32))
+    data = png_bytes()
+    project = create_project(admin, data)
+    url = project['main_image_url']
+    variants = os.path.join(os.path.dirname(upload_path(app, url)), '16')
+    assert len(os.listdir(variants)) == 2
+
+    for name in os.listdir(variants):
+        os.remove(os.path.join(variants, name))
+    create_project(admin, data)
+    assert len(os.listdir(variants)) == 2
+
+
+def test_non_admin_cannot_delete_project(app, admin, client, make_user, login):
+    project = create_project(admin, png_bytes())
+    login(client, make_user('bob'))
+    assert client.delete(f'/api/projects/{project["id"]}').status_code == 403
+    with app.app_context():
+        assert db.session.get(Project, project['id']) is not None
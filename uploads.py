@@ -0,0 +1,271 @@
+# ===== ARCHUB - ნაწილებად ატვირთვა =====
+# ეს ფაილი შეიცავს დიდი ფაილების ნაწილებად (chunk) და განახლებად ატვირთვას
+# init -> PUT chunk (offset-ით) -> finalize; ნაწილები პირდაპირ იწერება დროებით
+# ფაილში UPLOAD_FOLDER/.staging-ში, SHA-256 კი ითვლება ჩაწერასთან ერთად
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import uuid
+import weakref
+
+try:
+    import fcntl
+except ImportError:  # Windows - პროცესებს შორის lock არ გვჭირდება (ერთი პროცესი)
+    fcntl = None
+
+UPLOAD_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+READ_BLOCK_SIZE = 64 * 1024
+
+
+class UploadError(Exception):
+    """ატვირთვის შეცდომა - status HTTP კოდია, extra კი პასუხს ემატება"""
+
+    def __init__(self, message, status=400, **extra):
+        super().__init__(message)
+        self.status = status
+        self.extra = extra
+
+
+class ChunkedUploads:
+    """ნაწილებად ატვირთვის სესიები - მდგომარეობა ფაილებშია, ამიტომ ყველა worker-ს ესმის
+
+    თითო სესიაზე ორი ფაილი: <id>.part (მიღებული ბაიტები) და <id>.json
+    (სახელი, ზომა, მომხმარებელი). მიმდინარე offset ყოველთვის .part ფაილის
+    ზომაა, ამიტომ გაწყვეტილი ატვირთვა გრძელდება იქიდან, სადაც შეჩერდა.
+    SHA-256-ის მდგომარეობა worker-ის მეხსიერებაშია; თუ შემდეგი ნაწილი სხვა
+    worker-ში მოხვდა, ის ერთხელ გადათვლის უკვე მიღებულ ნაწილს.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.max_size = 0
+        self.expiry = 0
+        self._hashers = {}  # upload_id -> (offset, sha256)
+        self._lock = threading.Lock()
+        # ნაწილის ჩაწერა thread-ებს შორის (fcntl-ის გარეშეც); flock მის თავზე ემატება
+        self._chunk_locks = weakref.WeakValueDictionary()  # upload_id -> RLock
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.max_size = app.config['CHUNKED_UPLOAD_MAX_SIZE']
+        self.expiry = app.config['CHUNKED_UPLOAD_EXPIRY_SECONDS']
+        app.extensions['chunked_uploads'] = self
+
+    @property
+    def folder(self):
+        return os.path.join(self.app.config['UPLOAD_FOLDER'], '.staging')
+
+    def _paths(self, upload_id):
+        if not UPLOAD_ID_PATTERN.match(upload_id or ''):
+            raise UploadError('Upload not found', 404)
+        base = os.path.join(self.folder, upload_id)
+        return f'{base}.part', f'{base}.json'
+
+    def _claim_path(self, upload_id):
+        """finalize-ის მიერ დაკავებული სესიის meta (დავალების შექმნამდე)"""
+        return os.path.join(self.folder, f'{upload_id}.finalizing')
+
+    # ----- სესიის შექმნა და მდგომარეობა -----
+    def create(self, filename, size, user_id):
+        """ახალი სესია - აბრუნებს მის მდგომარეობას"""
+        if size <= 0 or size > self.max_size:
+            raise UploadError(f'File size must be between 1 and {self.max_size} bytes')
+
+        os.makedirs(self.folder, exist_ok=True)
+        self.cleanup()
+        upload_id = uuid.uuid4().hex
+        part_path, meta_path = self._paths(upload_id)
+        meta = {
+            'id': upload_id,
+            'filename': filename,
+            'size': size,
+            'user_id': user_id,
+            'created_at': time.time()
+        }
+        open(part_path, 'wb').close()
+        with open(meta_path, 'w') as f:
+            json.dump(meta, f)
+        return self._status(meta, 0)
+
+    def _meta(self, upload_id, user_id):
+        _, meta_path = self._paths(upload_id)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            raise UploadError('Upload not found', 404)
+        if meta['user_id'] != user_id:
+            raise UploadError('Upload not found', 404)
+        return meta
+
+    @staticmethod
+    def _status(meta, offset):
+        return {
+            'id': meta['id'],
+            'filename': meta['filename'],
+            'size': meta['size'],
+            'offset': offset,
+            'complete': offset == meta['size']
+        }
+
+    def status(self, upload_id, user_id):
+        """სესიის მდგომარეობა - offset-იდან გრძელდება შეწყვეტილი ატვირთვა"""
+        meta = self._meta(upload_id, user_id)
+        part_path, _ = self._paths(upload_id)
+        try:
+            offset = os.path.getsize(part_path)
+        except OSError:
+            raise UploadError('Upload not found', 404)
+        return self._status(meta, offset)
+
+    # ----- ნაწილის ჩაწერა -----
+    def _hasher(self, upload_id, f, offset):
+        """SHA-256 offset-მდე - მეხსიერებიდან ან (სხვა worker-ის ნაწილების შემდეგ) ფაილიდან"""
+        with self._lock:
+            state = self._hashers.get(upload_id)
+        if state is not None and state[0] == offset:
+            return state[1]
+        hasher = hashlib.sha256()
+        f.seek(0)
+        remaining = offset
+        while remaining:
+            block = f.read(min(READ_BLOCK_SIZE, remaining))
+            if not block:
+                break
+            hasher.update(block)
+            remaining -= len(block)
+        return hasher
+
+    def write_chunk(self, upload_id, offset, stream, user_id):
+        """ნაწილის ჩაწერა stream-იდან - offset უნდა ემთხვეოდეს უკვე მიღებულ ზომას"""
+        meta = self._meta(upload_id, user_id)
+        part_path, meta_path = self._paths(upload_id)
+        try:
+            f = open(part_path, 'r+b')
+        except OSError:
+            raise UploadError('Upload not found', 404)
+
+        with self._lock:
+            chunk_lock = self._chunk_locks.setdefault(upload_id, threading.RLock())
+        with chunk_lock, f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            size = os.fstat(f.fileno()).st_size
+            if offset != size:
+                raise UploadError('Offset does not match the received size', 409, offset=size)
+
+            hasher = self._hasher(upload_id, f, size)
+            # ვადა ითვლება ბოლო აქტივობიდან
+            os.utime(self._paths(upload_id)[1])
+            f.seek(size)
+            written = size
+            try:
+                while True:
+                    block = stream.read(READ_BLOCK_SIZE)
+                    if not block:
+                        break
+                    if written + len(block) > meta['size']:
+                        # გამოცხადებულ ზომაზე მეტი - ნაწილი მთლიანად უქმდება
+                        f.truncate(size)
+                        written = size
+                        hasher = None
+                        raise UploadError('Chunk exceeds the declared file size', 413, offset=size)
+                    f.write(block)
+                    hasher.update(block)
+                    written += len(block)
+            finally:
+                # კავშირის გაწყვეტისას მიღებული ბაიტები რჩება - კლიენტი გააგრძელებს offset-იდან
+                f.flush()
+                with self._lock:
+                    # cleanup/cancel-მა სესია შუაში შეიძლება წაშალა - მაშინ hasher აღარ ინახება
+                    if hasher is not None and os.path.exists(meta_path):
+                        self._hashers[upload_id] = (written, hasher)
+                    else:
+                        self._hashers.pop(upload_id, None)
+        return self._status(meta, written)
+
+    # ----- დასრულება -----
+    def finalize(self, upload_id, user_id, sha256=None):
+        """სრული ატვირთვის დადასტურება - აბრუნებს (.part ფაილის გზა, meta, sha256)
+
+        ფაილი რჩება .staging-ში; გამომძახებელი მას ImageJob-ს გადასცემს და
+        შემდეგ იძახებს complete()-ს, შეცდომისას კი release()-ს. meta მანამდე
+        დაკავებულად რჩება, რომ .part ფაილი cleanup()-მა მაინც იპოვოს.
+        """
+        meta = self._meta(upload_id, user_id)
+        part_path, meta_path = self._paths(upload_id)
+        with open(part_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size != meta['size']:
+                raise UploadError('Upload is incomplete', 409, offset=size)
+            digest = self._hasher(upload_id, f, size).hexdigest()
+
+        if sha256 and sha256.lower() != digest:
+            raise UploadError('SHA-256 checksum mismatch', 400, sha256=digest)
+
+        with self._lock:
+            self._hashers.pop(upload_id, None)
+        try:
+            os.rename(meta_path, self._claim_path(upload_id))
+        except FileNotFoundError:
+            # იგივე სესია პარალელურ მოთხოვნაში უკვე დასრულდა
+            raise UploadError('Upload not found', 404)
+        return part_path, meta, digest
+
+    def complete(self, upload_id):
+        """დავალება შეიქმნა - .part ფაილი მას ეკუთვნის, სესიის meta აღარ გვჭირდება"""
+        try:
+            os.remove(self._claim_path(upload_id))
+        except FileNotFoundError:
+            pass
+
+    def release(self, upload_id):
+        """დავალება ვერ შეიქმნა - სესია ბრუნდება, finalize თავიდან შეიძლება"""
+        _, meta_path = self._paths(upload_id)
+        try:
+            os.rename(self._claim_path(upload_id), meta_path)
+        except FileNotFoundError:
+            pass
+
+    def cancel(self, upload_id, user_id):
+        self._meta(upload_id, user_id)
+        with self._lock:
+            self._hashers.pop(upload_id, None)
+        for path in self._paths(upload_id):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def cleanup(self):
+        """მიტოვებული სესიების წაშლა (CHUNKED_UPLOAD_EXPIRY_SECONDS ბოლო ნაწილიდან)"""
+        deadline = time.time() - self.expiry
+        try:
+            names = os.listdir(self.folder)
+        except OSError:
+            return
+        for name in names:
+            upload_id, extension = os.path.splitext(name)
+            # .finalizing - finalize-სა და complete()-ს შორის შეწყვეტილი სესია
+            if extension not in ('.json', '.finalizing') or not UPLOAD_ID_PATTERN.match(upload_id):
+                continue
+            meta_path = os.path.join(self.folder, name)
+            try:
+                if os.path.getmtime(meta_path) < deadline:
+                    # lock-ის ქვეშ, რომ პარალელურმა ნაწილმა ძველი hasher არ აღადგინოს
+                    with self._lock:
+                        self._hashers.pop(upload_id, None)
+                        for path in self._paths(upload_id) + (self._claim_path(upload_id),):
+                            if os.path.exists(path):
+                                os.remove(path)
+            except OSError:
+                pass
+
+
+chunked_uploads = ChunkedUploads()